@@ -4,6 +4,7 @@ import src.flows.bfs_node_flow as module
 importlib.reload(module)
 
 import os
+import argparse
 from pathlib import Path
 
 # Go up until we find pyproject.toml (project root)
@@ -18,13 +19,60 @@ from src.flows.bfs_node_flow import BFSNodeFlow
 from src.state.node_state import NodeState
 
 
-def run_flow():
-    print("Starting BFSNodeFlow...")
+def run_flow(resume_from: str = "", engine: str = "event"):
+    print(f"Starting BFSNodeFlow ({engine} engine)...")
     state = NodeState()
     flow = BFSNodeFlow(state=state)
-    flow.kickoff()
+    inputs = {}
+    if resume_from:
+        print(f"Resuming from checkpoint journal in: {resume_from}")
+        inputs["resume_from"] = resume_from
+    if engine == "iterative":
+        from src.flows.iterative_driver import IterativeDriver
+
+        IterativeDriver(flow).kickoff(inputs=inputs)
+    elif inputs:
+        flow.kickoff(inputs=inputs)
+    else:
+        flow.kickoff()
     print("Flow execution complete.")
 
 
 if __name__ == "__main__":
-    run_flow()
+    parser = argparse.ArgumentParser(description="Run the BFS planning flow.")
+    parser.add_argument(
+        "--resume",
+        metavar="OUTPUT_PATH",
+        default="",
+        help="Output folder of an interrupted run; continues from its checkpoint journal",
+    )
+    parser.add_argument(
+        "--trace-summary",
+        metavar="OUTPUT_PATH",
+        default="",
+        help="Print per-stage and per-level latency from a run's trace.jsonl and exit",
+    )
+    parser.add_argument(
+        "--export-sqlite",
+        metavar="OUTPUT_PATH",
+        default="",
+        help="Write a run's artifact shards to <OUTPUT_PATH>/plan.sqlite and exit",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["event", "iterative"],
+        default="event",
+        help="event: crewai listener cycle; iterative: stage helpers over an explicit queue",
+    )
+    args = parser.parse_args()
+    if args.trace_summary:
+        from src.generic.tracing import print_trace_summary
+
+        print_trace_summary(args.trace_summary)
+    elif args.export_sqlite:
+        from src.flows.plan_index import export_run
+
+        index = export_run(args.export_sqlite)
+        print(f"Plan index: {index.stats()}")
+    else:
+        run_flow(resume_from=args.resume, engine=args.engine)
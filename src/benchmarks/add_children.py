@@ -0,0 +1,64 @@
+"""
+Microbenchmark: per-child construction cost of Node.add_child vs Node.add_children.
+
+Usage:
+    python -m src.benchmarks.add_children --parents 200 --children 10
+"""
+
+import argparse
+import json
+import time
+
+from src.enums.work_status_enum import WorkStatus
+from src.generic.node import Node
+
+
+def _parents(count: int):
+    root = Node(
+        title="Root",
+        depth_limit=4,
+        level_titles=["Vision", "Zone", "Feature", "Micro-feature", "Atomic Task"],
+        level_statuses={i: WorkStatus.PENDING for i in range(5)},
+        status=WorkStatus.INITIALIZING,
+    )
+    return [root.add_child(title=f"Zone {i}") for i in range(count)]
+
+
+def run(parents: int, children: int) -> dict:
+    titles = [f"Feature {i}" for i in range(children)]
+    total = parents * children
+
+    one_by_one = _parents(parents)
+    started = time.perf_counter()
+    for parent in one_by_one:
+        for title in titles:
+            parent.add_child(title=title)
+    single_seconds = time.perf_counter() - started
+
+    bulk = _parents(parents)
+    started = time.perf_counter()
+    for parent in bulk:
+        parent.add_children(titles)
+    bulk_seconds = time.perf_counter() - started
+
+    assert [c.path for c in one_by_one[-1].children] == [
+        c.path for c in bulk[-1].children
+    ]
+    return {
+        "children": total,
+        "add_child_us_per_child": round(single_seconds / total * 1e6, 2),
+        "add_children_us_per_child": round(bulk_seconds / total * 1e6, 2),
+        "speedup": round(single_seconds / bulk_seconds, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="add_child vs add_children benchmark")
+    parser.add_argument("--parents", type=int, default=200)
+    parser.add_argument("--children", type=int, default=10)
+    args = parser.parse_args()
+    print(json.dumps(run(args.parents, args.children), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Per-node crew construction overhead, with and without the crew registry.
+
+Builds the crews BFSNodeFlow creates for one node (manager, three single-designer
+DesignerCrews, reviewer, writer) repeatedly and reports the mean/p95 build time
+per node. No LLM is called: Azure LLMs point at the fake-server URL, which is
+only contacted on a call.
+
+Usage:
+    python -m src.benchmarks.crew_build_benchmark --nodes 50 --llm gpt4
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import time
+from typing import Dict, List
+
+from src.crews.designer_crew.crew import DesignerCrew
+from src.crews.manager_crew.crew import ManagerCrew
+from src.crews.reviewer_crew.crew import ReviewerCrew
+from src.crews.writer_crew.crew import WriterCrew
+from src.enums.llm_name_enum import LLMName
+from src.generic.crew_registry import configure_crew_registry
+from src.generic.llm_utils import configure_fake_llm_server
+from src.generic.tracing import percentile
+
+
+def build_node_crews(llm_name: LLMName) -> List:
+    """The crews of one node, as BFSNodeFlow builds them."""
+    return [
+        ManagerCrew(llm_name=llm_name).crew(),
+        DesignerCrew(llm_name_creative=llm_name).crew(),
+        DesignerCrew(llm_name_balanced=llm_name).crew(),
+        DesignerCrew(llm_name_conservative=llm_name).crew(),
+        ReviewerCrew(llm_name=llm_name).crew(),
+        WriterCrew(llm_name=llm_name).crew(),
+    ]
+
+
+def time_nodes(nodes: int, llm_name: LLMName) -> List[float]:
+    samples = []
+    # The crews print their agents' LLMs while being built
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(nodes):
+            started = time.perf_counter()
+            build_node_crews(llm_name)
+            samples.append(time.perf_counter() - started)
+    return samples
+
+
+def run_benchmark(nodes: int, llm_name: LLMName) -> Dict:
+    configure_fake_llm_server({"enabled": True, "url": "http://127.0.0.1:8765"})
+    report = {"nodes": nodes, "llm": llm_name.value}
+    try:
+        for label, enabled in (("rebuild_per_node", False), ("registry", True)):
+            registry = configure_crew_registry({"enabled": enabled})
+            samples = time_nodes(nodes, llm_name)
+            report[label] = {
+                "mean_ms": round(1000 * sum(samples) / len(samples), 2),
+                "p95_ms": round(1000 * percentile(samples, 95), 2),
+                "first_node_ms": round(1000 * samples[0], 2),
+            }
+            if registry:
+                report[label]["stats"] = registry.stats()
+    finally:
+        configure_crew_registry({})
+        configure_fake_llm_server({})
+    saved = report["rebuild_per_node"]["mean_ms"] - report["registry"]["mean_ms"]
+    report["saved_per_node_ms"] = round(saved, 2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-node crew construction benchmark")
+    parser.add_argument("--nodes", type=int, default=50)
+    parser.add_argument("--llm", choices=[n.value for n in LLMName], default="gpt4")
+    args = parser.parse_args()
+    print(json.dumps(run_benchmark(args.nodes, LLMName(args.llm)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Per-node dispatch overhead of the event-driven flow vs the iterative driver.
+
+The four stage helpers of BFSNodeFlow are replaced by no-op stubs (the writer stub
+adds `--branching` children per node down to `--depth`), so no crew is built and
+no LLM is called: what remains per node is the engine's own cost. The event engine
+walks the tree through the @listen(or_("sequential", "writer_done")) cycle (four
+listener dispatches per node); the iterative engine runs the same helpers over the
+work queue (src/flows/iterative_driver.py). Finalization, the scheduler and the
+memory/budget bookkeeping run identically in both.
+
+Reports JSON with wall time and microseconds per node for each engine, and the
+event engine's overhead per node over the iterative one.
+
+Usage:
+    python -m src.benchmarks.dispatch_overhead --depth 4 --branching 4 --repeat 3
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import tempfile
+import time
+from typing import Dict
+
+import yaml
+
+from src.benchmarks.flow_benchmark import BASE_CONFIG, STAGE_METHODS
+from src.enums.work_status_enum import WorkStatus
+from src.flows.bfs_node_flow import BFSNodeFlow
+from src.flows.helpers import load_flow_config
+from src.flows.iterative_driver import IterativeDriver
+
+ENGINES = ["event", "iterative"]
+
+
+def stub_stages(branching: int) -> Dict[str, object]:
+    """No-op stage helpers; the writer expands each node into `branching` children."""
+
+    def status_stub(status):
+        async def stage(self, ctx):
+            ctx.item.status = status
+
+        return stage
+
+    async def write(self, ctx):
+        item = ctx.item
+        item.status = WorkStatus.WRITING
+        next_level = item.level + 1
+        if item.depth_limit is not None and next_level <= item.depth_limit:
+            item.add_children([f"Node {i}" for i in range(branching)])
+
+    return {
+        "manager": status_stub(WorkStatus.MANAGING),
+        "designers": status_stub(WorkStatus.DESIGNING),
+        "reviewer": status_stub(WorkStatus.REVIEWING),
+        "writer": write,
+    }
+
+
+@contextlib.contextmanager
+def stubbed_stages(branching: int):
+    """Patches the stubs onto BFSNodeFlow (crewai discovers flow methods per class)."""
+    originals = {name: getattr(BFSNodeFlow, name) for name in STAGE_METHODS.values()}
+    try:
+        for stage, method in stub_stages(branching).items():
+            setattr(BFSNodeFlow, STAGE_METHODS[stage], method)
+        yield
+    finally:
+        for name, method in originals.items():
+            setattr(BFSNodeFlow, name, method)
+
+
+def run_engine(engine: str, config_path: str) -> Dict[str, float]:
+    flow = BFSNodeFlow()
+    inputs = {"config_path": config_path}
+    # Both engines print per node; keep that off the terminal but in the measurement
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        if engine == "event":
+            flow.kickoff(inputs=inputs)
+        else:
+            IterativeDriver(flow).kickoff(inputs=inputs)
+        elapsed = time.perf_counter() - started
+    nodes = len(flow.state.visited_queue)
+    return {
+        "nodes": nodes,
+        "wall_seconds": round(elapsed, 4),
+        "us_per_node": round(elapsed / nodes * 1e6, 1) if nodes else 0.0,
+    }
+
+
+def run_benchmark(args) -> dict:
+    with tempfile.TemporaryDirectory(prefix="bfs_dispatch_") as tmp_dir:
+        config = load_flow_config(BASE_CONFIG)
+        config["save_folder"] = os.path.join(tmp_dir, "runs")
+        config["depth_limit"] = args.depth
+        config["llm_cache"] = {"enabled": False}
+        config["checkpoint"] = {"enabled": False}
+        config["tracing"] = {"enabled": False}
+        config["artifacts"] = {"enabled": False}
+        config["plan_index"] = {"enabled": False}
+        config["subtree_memo"] = {"enabled": False}
+        # Sequential on both sides: one node in flight at a time
+        config["parallel"] = {"max_concurrency": 1}
+        config["pipeline"] = {"enabled": False}
+        config_path = os.path.join(tmp_dir, "flow_config.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.safe_dump(config, f)
+
+        results: Dict[str, Dict[str, float]] = {}
+        with stubbed_stages(args.branching):
+            for engine in ENGINES:
+                # Best of `repeat` runs per engine
+                runs = [run_engine(engine, config_path) for _ in range(args.repeat)]
+                results[engine] = min(runs, key=lambda run: run["wall_seconds"])
+
+    return {
+        "config": {
+            "depth": args.depth,
+            "branching": args.branching,
+            "repeat": args.repeat,
+        },
+        "engines": results,
+        "event_overhead_us_per_node": round(
+            results["event"]["us_per_node"] - results["iterative"]["us_per_node"], 1
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Per-node dispatch overhead: event-driven flow vs iterative driver"
+    )
+    parser.add_argument("--depth", type=int, default=4, help="At most 4 (level titles)")
+    parser.add_argument("--branching", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(run_benchmark(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
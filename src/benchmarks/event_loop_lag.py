@@ -0,0 +1,105 @@
+"""
+Event loop responsiveness benchmark for crew kickoffs.
+
+Runs several single-agent crews backed by a latency-injecting MockLLM while a
+heartbeat coroutine ticks every few milliseconds. Three modes are compared:
+  - inline: the LLM round trip runs on the loop thread, as the old sync stages
+    did (recent crewai versions refuse a blocking kickoff inside a running loop,
+    so the MockLLM call is made directly)
+  - kickoff_async: crewai's own async kickoff
+  - pooled: the flow's bounded kickoff pool (BFSNodeFlow._kickoff)
+Reports wall time and heartbeat lag as JSON.
+
+Usage:
+    python -m src.benchmarks.event_loop_lag --crews 6 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from crewai import Agent, Crew, Process, Task
+
+from src.flows.helpers import get_kickoff_executor, run_blocking
+from src.tests.fake_crewai_llm import MockLLM
+
+HEARTBEAT_INTERVAL = 0.005
+
+
+def build_crew(llm: MockLLM) -> Crew:
+    agent = Agent(
+        role="Benchmark Writer",
+        goal="Answer quickly",
+        backstory="Stand-in agent for latency benchmarks.",
+        llm=llm,
+    )
+    task = Task(description="Say done.", expected_output="done", agent=agent)
+    return Crew(agents=[agent], tasks=[task], process=Process.sequential)
+
+
+async def heartbeat(stop: asyncio.Event, lags: list) -> None:
+    """Records how late each tick fires relative to its schedule."""
+    while not stop.is_set():
+        expected = time.perf_counter() + HEARTBEAT_INTERVAL
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def run_mode(mode: str, crews: int, latency: float, threads: int) -> dict:
+    llms = [
+        MockLLM(responses=["Final Answer: done"], latency=latency)
+        for _ in range(crews)
+    ]
+    # Crews are built up front so only the kickoffs are measured
+    crew_list = [build_crew(llm) for llm in llms]
+    executor = get_kickoff_executor(threads)
+
+    async def kickoff(llm: MockLLM, crew: Crew):
+        if mode == "inline":
+            return llm.call("Say done.")
+        if mode == "kickoff_async":
+            return await crew.kickoff_async(inputs={})
+        return await run_blocking(executor, crew.kickoff, inputs={})
+
+    stop = asyncio.Event()
+    lags: list = []
+    beat = asyncio.create_task(heartbeat(stop, lags))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(kickoff(llm, crew) for llm, crew in zip(llms, crew_list)))
+    wall = time.perf_counter() - started
+
+    stop.set()
+    await beat
+
+    lags.sort()
+    return {
+        "mode": mode,
+        "wall_seconds": round(wall, 4),
+        "heartbeats": len(lags),
+        "max_lag_ms": round(lags[-1] * 1000, 2) if lags else None,
+        "p95_lag_ms": round(lags[int(len(lags) * 0.95) - 1] * 1000, 2)
+        if len(lags) >= 20
+        else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--crews", type=int, default=6)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "fake-key-for-testing")
+    results = [
+        asyncio.run(run_mode(mode, args.crews, args.latency, args.threads))
+        for mode in ("inline", "kickoff_async", "pooled")
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
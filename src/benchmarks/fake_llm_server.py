@@ -0,0 +1,343 @@
+"""
+Local OpenAI/Azure-compatible chat-completions server for offline load testing.
+
+Serves the per-crew canned responses from llm_utils.DEFAULT_MOCK_RESPONSES over
+real HTTP, so the crewai.LLM client path used for gpt4/gpt5 (connection pooling,
+timeouts, 429 handling, rate limiting) can be exercised without Azure.
+
+Routes (POST; "stream": true answers with server-sent chat.completion.chunk events):
+    /crews/<crew_name>/chat/completions     (what get_llm uses with fake_llm_server.enabled)
+    /openai/deployments/<name>/chat/completions, /v1/chat/completions, /chat/completions
+GET /stats returns request counters; GET /health returns 200.
+
+Usage:
+    python -m src.benchmarks.fake_llm_server --port 8765 --latency-ms 400 --jitter-ms 150 \\
+        --throttle-rate 0.05 --error-rate 0.01 --max-concurrent 16
+then set `fake_llm_server.enabled: true` and llm_type gpt4/gpt5 in flow_config.yaml.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+from src.generic.llm_utils import DEFAULT_MOCK_RESPONSES, default_mock_response
+from src.tests.fake_crewai_llm import estimate_tokens
+
+
+class FakeServerProfile(BaseModel):
+    """Simulated behaviour of the fake deployment."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    # constant | uniform (latency +/- jitter) | normal (gauss(latency, jitter))
+    distribution: str = "uniform"
+    # Completion tokens reported per call (default: estimated from the response)
+    completion_tokens: Optional[int] = None
+    # Fraction of requests answered with a 500 / a 429
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after_seconds: float = 1.0
+    # Requests beyond this many in flight get a 429, like an exhausted quota (0 = unlimited)
+    max_concurrent: int = 0
+    # Characters per chunk of a streamed ("stream": true) response
+    stream_chunk_chars: int = 64
+    seed: Optional[int] = None
+
+
+def strip_code_fence(content: str) -> str:
+    """Drops a leading/trailing ``` fence, as a structured-output response carries bare JSON."""
+    text = content.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+    if text.endswith("```"):
+        text = text[:-3]
+    return text.strip()
+
+
+class FakeLLMServer:
+    """Threaded HTTP server; use as a context manager or start()/stop()."""
+
+    def __init__(
+        self,
+        profile: Optional[FakeServerProfile] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.profile = profile or FakeServerProfile()
+        self._rng = random.Random(self.profile.seed)
+        self._lock = threading.Lock()
+        self._calls_per_crew: Dict[str, int] = {}
+        self.counters = {
+            "requests": 0,
+            "ok": 0,
+            "throttled": 0,
+            "errors": 0,
+            "in_flight": 0,
+            "max_in_flight": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+        }
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeLLMServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="fake-llm-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.counters, per_crew=dict(self._calls_per_crew))
+
+    def sample_latency(self) -> float:
+        profile = self.profile
+        with self._lock:
+            if profile.distribution == "normal":
+                ms = self._rng.gauss(profile.latency_ms, profile.jitter_ms)
+            elif profile.distribution == "uniform" and profile.jitter_ms:
+                ms = self._rng.uniform(
+                    profile.latency_ms - profile.jitter_ms,
+                    profile.latency_ms + profile.jitter_ms,
+                )
+            else:
+                ms = profile.latency_ms
+        return max(0.0, ms) / 1000.0
+
+    def _admit(self) -> Optional[int]:
+        """Counts the request in; returns an error status to send instead, if any."""
+        with self._lock:
+            self.counters["requests"] += 1
+            roll = self._rng.random()
+            if self.profile.max_concurrent and (
+                self.counters["in_flight"] >= self.profile.max_concurrent
+            ):
+                status = 429
+            elif roll < self.profile.throttle_rate:
+                status = 429
+            elif roll < self.profile.throttle_rate + self.profile.error_rate:
+                status = 500
+            else:
+                status = None
+            if status == 429:
+                self.counters["throttled"] += 1
+            elif status == 500:
+                self.counters["errors"] += 1
+            else:
+                self.counters["in_flight"] += 1
+                self.counters["max_in_flight"] = max(
+                    self.counters["max_in_flight"], self.counters["in_flight"]
+                )
+            return status
+
+    def _complete(self, crew_name: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Builds the chat.completion body for one admitted request."""
+        responses = DEFAULT_MOCK_RESPONSES.get(crew_name, [default_mock_response])
+        with self._lock:
+            index = self._calls_per_crew.get(crew_name, 0)
+            self._calls_per_crew[crew_name] = index + 1
+        content = responses[index % len(responses)]
+        if request.get("response_format"):
+            content = strip_code_fence(content)
+
+        prompt_tokens = estimate_tokens(
+            "".join(str(m.get("content", "")) for m in request.get("messages", []))
+        )
+        completion_tokens = self.profile.completion_tokens or estimate_tokens(content)
+        with self._lock:
+            self.counters["prompt_tokens"] += prompt_tokens
+            self.counters["completion_tokens"] += completion_tokens
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model") or crew_name,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, so client connection pooling is exercised
+            protocol_version = "HTTP/1.1"
+
+            def _send_json(self, status: int, body: Dict[str, Any], headers=None):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_stream(self, body: Dict[str, Any], delay: float):
+                """Server-sent chat.completion.chunk events, spread over `delay`."""
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                content = body["choices"][0]["message"]["content"]
+                size = server.profile.stream_chunk_chars
+                pieces = [content[i : i + size] for i in range(0, len(content), size)]
+                pause = delay / max(1, len(pieces))
+                for piece in pieces:
+                    time.sleep(pause)
+                    self._send_event(body, {"content": piece}, None)
+                self._send_event(body, {}, "stop", usage=body["usage"])
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+            def _send_event(self, body, delta, finish_reason, usage=None):
+                event = {
+                    "id": body["id"],
+                    "object": "chat.completion.chunk",
+                    "created": body["created"],
+                    "model": body["model"],
+                    "choices": [
+                        {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                    ],
+                }
+                if usage:
+                    event["usage"] = usage
+                self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+
+            def do_GET(self):
+                if self.path.startswith("/stats"):
+                    self._send_json(200, server.stats())
+                elif self.path.startswith("/health"):
+                    self._send_json(200, {"status": "ok"})
+                else:
+                    self._send_json(404, {"error": {"message": "not found"}})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                raw = self.rfile.read(length) if length else b"{}"
+                path = self.path.split("?", 1)[0]
+                if not path.endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": "not found"}})
+                    return
+                parts = path.strip("/").split("/")
+                crew_name = parts[1] if parts[0] == "crews" and len(parts) > 2 else "default"
+
+                status = server._admit()
+                if status == 429:
+                    retry_after = server.profile.retry_after_seconds
+                    self._send_json(
+                        429,
+                        {
+                            "error": {
+                                "code": "429",
+                                "message": "Rate limit exceeded (fake server)",
+                            }
+                        },
+                        headers={"Retry-After": f"{retry_after:g}"},
+                    )
+                    return
+                if status == 500:
+                    self._send_json(
+                        500,
+                        {"error": {"code": "InternalServerError", "message": "fake failure"}},
+                    )
+                    return
+
+                try:
+                    request = json.loads(raw or b"{}")
+                    delay = server.sample_latency()
+                    body = server._complete(crew_name, request)
+                    if request.get("stream"):
+                        self._send_stream(body, delay)
+                    else:
+                        time.sleep(delay)
+                        self._send_json(200, body)
+                    with server._lock:
+                        server.counters["ok"] += 1
+                finally:
+                    with server._lock:
+                        server.counters["in_flight"] -= 1
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenAI/Azure chat-completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--distribution", choices=["constant", "uniform", "normal"], default="uniform"
+    )
+    parser.add_argument("--completion-tokens", type=int, default=None)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--max-concurrent", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    profile = FakeServerProfile(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        distribution=args.distribution,
+        completion_tokens=args.completion_tokens,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after_seconds=args.retry_after,
+        max_concurrent=args.max_concurrent,
+        seed=args.seed,
+    )
+    server = FakeLLMServer(profile, host=args.host, port=args.port)
+    print(f"Fake LLM server listening on {server.url} ({profile})")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Stats: {server.stats()}")
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""
+End-to-end BFS flow benchmark on mock LLMs.
+
+Runs BFSNodeFlow with every crew on MockLLM (with injected latency), reviewer-driven
+(or seeded random) branching and a configurable depth, then prints a JSON report:
+nodes processed, nodes/sec, LLM calls/sec, token totals, peak RSS,
+p50/p95/p99 latency per stage and time to first child per node.
+
+Usage:
+    python -m src.benchmarks.flow_benchmark --depth 3 --seed 7 --max-children 3 \\
+        --latency-ms 50 --jitter-ms 20 --concurrency 4
+    python -m src.benchmarks.flow_benchmark --pipeline --latency-ms 50
+    python -m src.benchmarks.flow_benchmark --fake-server --throttle-rate 0.05
+        (gpt4 crews over real HTTP against src/benchmarks/fake_llm_server.py)
+    python -m src.benchmarks.flow_benchmark --stream --latency-ms 400
+        (components parsed from the designers' streams; compare time_to_first_component)
+    python -m src.benchmarks.flow_benchmark --depth 4 --tracemalloc --bounded-memory
+        (peak traced memory per level; compare with and without --bounded-memory)
+    python -m src.benchmarks.flow_benchmark --engine iterative --concurrency 4
+        (stage helpers driven over the work queue, see src/flows/iterative_driver.py)
+"""
+
+import argparse
+import functools
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import yaml
+
+from src.benchmarks.fake_llm_server import FakeLLMServer, FakeServerProfile
+from src.flows.bfs_node_flow import BFSNodeFlow
+from src.flows.helpers import load_flow_config
+from src.flows.iterative_driver import IterativeDriver
+from src.generic.tracing import percentile
+from src.state.node_scheduler import POLICIES
+from src.tests.fake_crewai_llm import MockLLM
+
+BASE_CONFIG = "src/resources/flow_config.yaml"
+STAGES = ["manager", "designers", "reviewer", "writer"]
+
+
+def peak_rss_bytes() -> int:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+STAGE_METHODS = {
+    "manager": "_manage_node",
+    "designers": "_design_node",
+    "reviewer": "_review_node",
+    "writer": "_write_node",
+}
+
+
+@contextmanager
+def timed_stages(
+    stage_latencies: Dict[str, List[float]], first_component: Optional[List[float]] = None
+):
+    """
+    Wraps the BFSNodeFlow stage helpers to record the wall time of every call.
+    (Patched on the class: crewai discovers flow methods per class, so a timing
+    subclass would not run.)
+
+    `first_component` collects, per node, the seconds from the start of its manager
+    stage until its first designer component was parsed: the first streamed
+    component, or the end of the designers stage without streaming. Streamed
+    components are only collected; the reviewer and the children still wait for
+    the whole designers stage, so this does not measure when downstream work starts.
+    """
+    node_started: Dict[int, float] = {}
+
+    def wrap(stage, method):
+        @functools.wraps(method)
+        async def timed(self, ctx):
+            started = time.perf_counter()
+            node_started.setdefault(id(ctx), started)
+            try:
+                return await method(self, ctx)
+            finally:
+                finished = time.perf_counter()
+                stage_latencies[stage].append(finished - started)
+                if stage == "designers" and first_component is not None and ctx.designer_outputs:
+                    available = ctx.first_component_at or finished
+                    first_component.append(available - node_started[id(ctx)])
+
+        return timed
+
+    originals = {name: getattr(BFSNodeFlow, name) for name in STAGE_METHODS.values()}
+    try:
+        for stage, name in STAGE_METHODS.items():
+            setattr(BFSNodeFlow, name, wrap(stage, originals[name]))
+        yield stage_latencies
+    finally:
+        for name, method in originals.items():
+            setattr(BFSNodeFlow, name, method)
+
+
+def build_config(args, output_dir: str, fake_server_url: str = "") -> dict:
+    """
+    Base flow config with every crew on the mock LLM (or on gpt4 against the fake
+    server at `fake_server_url`) and the CLI overrides applied.
+    """
+    config = load_flow_config(BASE_CONFIG)
+    config["save_folder"] = output_dir
+    llm_type = "gpt4" if fake_server_url else "mock"
+    config["llm_type"] = {crew: llm_type for crew in config.get("llm_type", {})}
+    config["fake_llm_server"] = {"enabled": bool(fake_server_url), "url": fake_server_url}
+    config["llm_cache"] = {"enabled": False}
+    config["checkpoint"] = {"enabled": args.checkpoint}
+    config["tracing"] = {"enabled": args.trace}
+    config["artifacts"] = {"enabled": args.artifacts}
+    config["plan_index"] = {"enabled": False}
+    config["subtree_memo"] = {"enabled": False}
+    config["depth_limit"] = args.depth
+    config["branching"] = {
+        "mode": args.branching,
+        "seed": args.seed,
+        "min_children": args.min_children,
+        "max_children": args.max_children,
+    }
+    config["mock_llm"] = {
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "distribution": args.distribution,
+        "completion_tokens": args.completion_tokens,
+    }
+    config["parallel"] = {
+        "max_concurrency": args.concurrency,
+        "kickoff_threads": args.kickoff_threads,
+    }
+    config["pipeline"] = {"enabled": args.pipeline, "queue_size": args.queue_size}
+    config["scheduler"] = {"policy": args.scheduler}
+    config["budget"] = {
+        "max_llm_calls": args.max_llm_calls,
+        "max_tokens": args.max_tokens,
+        "deadline_seconds": args.deadline,
+    }
+    config["memory"] = {
+        "bounded": args.bounded_memory,
+        "tracemalloc": args.tracemalloc,
+    }
+    config["streaming"] = {
+        "enabled": args.stream,
+        "mock_chunk_chars": args.stream_chunk_chars,
+    }
+    return config
+
+
+def run_benchmark(args) -> dict:
+    fake_server = None
+    if getattr(args, "fake_server", False):
+        # The server injects the latency, so the config's mock_llm block goes unused
+        fake_server = FakeLLMServer(
+            FakeServerProfile(
+                latency_ms=args.latency_ms,
+                jitter_ms=args.jitter_ms,
+                distribution=args.distribution,
+                completion_tokens=args.completion_tokens,
+                error_rate=args.error_rate,
+                throttle_rate=args.throttle_rate,
+                stream_chunk_chars=args.stream_chunk_chars,
+                seed=args.seed,
+            )
+        ).start()
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="bfs_bench_") as tmp_dir:
+            config_path = os.path.join(tmp_dir, "flow_config.yaml")
+            config = build_config(
+                args,
+                os.path.join(tmp_dir, "runs"),
+                fake_server.url if fake_server else "",
+            )
+            with open(config_path, "w", encoding="utf-8") as f:
+                yaml.safe_dump(config, f)
+
+            MockLLM.reset_totals()
+            stage_latencies: Dict[str, List[float]] = defaultdict(list)
+            first_component: List[float] = []
+            flow = BFSNodeFlow()
+            with timed_stages(stage_latencies, first_component):
+                started = time.perf_counter()
+                if args.engine == "iterative":
+                    IterativeDriver(flow).kickoff(inputs={"config_path": config_path})
+                else:
+                    flow.kickoff(inputs={"config_path": config_path})
+                elapsed = time.perf_counter() - started
+    finally:
+        if fake_server:
+            fake_server.stop()
+
+    if fake_server:
+        server_stats = fake_server.stats()
+        llm_calls = server_stats["ok"]
+        prompt_tokens = server_stats["prompt_tokens"]
+        completion_tokens = server_stats["completion_tokens"]
+    else:
+        server_stats = None
+        llm_calls = MockLLM.total_calls
+        prompt_tokens = MockLLM.total_prompt_tokens
+        completion_tokens = MockLLM.total_completion_tokens
+
+    nodes = len(flow.state.visited_queue)
+    report = {
+        "config": {
+            "mode": "iterative"
+            if args.engine == "iterative"
+            else "pipelined"
+            if args.pipeline
+            else ("parallel" if args.concurrency > 1 else "sequential"),
+            "depth": args.depth,
+            "seed": args.seed,
+            "branching": args.branching,
+            "scheduler": args.scheduler,
+            "children": [args.min_children, args.max_children],
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "distribution": args.distribution,
+            "concurrency": args.concurrency,
+            "streaming": args.stream,
+        },
+        "nodes": nodes,
+        "wall_seconds": round(elapsed, 3),
+        "nodes_per_sec": round(nodes / elapsed, 2) if elapsed else 0.0,
+        "llm_calls": llm_calls,
+        "llm_calls_per_sec": round(llm_calls / elapsed, 2) if elapsed else 0.0,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "stages": {
+            stage: {
+                "count": len(stage_latencies[stage]),
+                "p50_ms": round(percentile(stage_latencies[stage], 50) * 1000, 2),
+                "p95_ms": round(percentile(stage_latencies[stage], 95) * 1000, 2),
+                "p99_ms": round(percentile(stage_latencies[stage], 99) * 1000, 2),
+            }
+            for stage in STAGES
+        },
+        "time_to_first_component": {
+            "count": len(first_component),
+            "p50_ms": round(percentile(first_component, 50) * 1000, 2),
+            "p95_ms": round(percentile(first_component, 95) * 1000, 2),
+            "mean_ms": round(1000 * sum(first_component) / len(first_component), 2)
+            if first_component
+            else 0.0,
+        },
+    }
+    if flow._expansions:
+        report["expansion"] = flow._expansions.report()["total"]
+    if flow._budget and flow._budget.budget.limited:
+        budget = flow._budget.report()
+        report["budget"] = {
+            key: budget[key]
+            for key in ("consumed", "phase", "transitions", "children_cut", "designers_skipped")
+        }
+        report["budget"]["nodes_unexpanded"] = len(budget["nodes_unexpanded"])
+    if args.bounded_memory or args.tracemalloc:
+        memory = flow._memory.report()
+        report["memory"] = {
+            key: memory[key] for key in ("nodes_stubbed", "peak_bytes", "by_level")
+        }
+    if server_stats is not None:
+        report["fake_server"] = server_stats
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BFS flow throughput benchmark (mock LLMs)")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--min-children", type=int, default=1)
+    parser.add_argument("--max-children", type=int, default=3)
+    parser.add_argument(
+        "--branching",
+        choices=["reviewer", "random"],
+        default="reviewer",
+        help="Children from the reviewer-approved components, or a random count",
+    )
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument(
+        "--distribution", choices=["constant", "uniform", "normal"], default="uniform"
+    )
+    parser.add_argument("--completion-tokens", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--kickoff-threads", type=int, default=8)
+    parser.add_argument(
+        "--scheduler",
+        choices=sorted(POLICIES),
+        default="bfs",
+        help="Order in which queued nodes are expanded",
+    )
+    parser.add_argument("--max-llm-calls", type=int, default=None, help="Run budget")
+    parser.add_argument("--max-tokens", type=int, default=None, help="Run budget")
+    parser.add_argument("--deadline", type=float, default=None, help="Run budget (seconds)")
+    parser.add_argument(
+        "--bounded-memory",
+        action="store_true",
+        help="Spill finished nodes to disk and keep stubs in memory",
+    )
+    parser.add_argument(
+        "--tracemalloc", action="store_true", help="Report peak traced memory per level"
+    )
+    parser.add_argument("--pipeline", action="store_true")
+    parser.add_argument(
+        "--engine",
+        choices=["event", "iterative"],
+        default="event",
+        help="Flow listeners, or the iterative driver over the work queue",
+    )
+    parser.add_argument("--queue-size", type=int, default=2)
+    parser.add_argument("--checkpoint", action="store_true")
+    parser.add_argument("--trace", action="store_true")
+    parser.add_argument(
+        "--artifacts", action="store_true", help="Stream node artifacts to disk"
+    )
+    parser.add_argument(
+        "--fake-server",
+        action="store_true",
+        help="Run the crews on gpt4 against an in-process fake chat-completions server",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream designer/reviewer completions and parse components as they close",
+    )
+    parser.add_argument("--stream-chunk-chars", type=int, default=64)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = run_benchmark(args)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
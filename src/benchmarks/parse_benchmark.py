@@ -0,0 +1,139 @@
+"""
+Microbenchmark of structured-output parsing on recorded LLM outputs.
+
+Compares the per-stage parsing the flow used to do (fence stripping,
+yaml.safe_load / json.loads, Model(**data)) with src/llm_completion/output_parser.py.
+Outputs come from the llm_utils fixtures, or from a recorded cassette
+(see llm_cassette.py) with --cassette; --brief-scale repeats the manager brief
+to show how parsing scales with long briefs.
+
+Usage:
+    python -m src.benchmarks.parse_benchmark --repeat 200
+    python -m src.benchmarks.parse_benchmark --cassette output/<run>/llm_cassette.jsonl.gz
+"""
+
+import argparse
+import json
+import time
+from typing import Callable, Dict, List, Tuple
+
+import yaml
+
+from src.generic import llm_utils
+from src.generic.llm_cassette import Cassette
+from src.llm_completion.designer_completion import DesignerCompletionJson
+from src.llm_completion.manager_completion import ManagerCompletion
+from src.llm_completion.output_parser import (
+    parse_designer_output,
+    parse_manager_output,
+    parse_reviewer_output,
+)
+
+
+def _strip_fence(raw: str, lang: str) -> str:
+    text = raw.strip()
+    if text.startswith(f"```{lang}"):
+        text = text[3 + len(lang) :]
+    elif text.startswith("```"):
+        text = text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    return text.strip()
+
+
+def legacy_manager(raw: str) -> ManagerCompletion:
+    return ManagerCompletion(**yaml.safe_load(_strip_fence(raw, "yaml")))
+
+
+def legacy_designer(raw: str) -> DesignerCompletionJson:
+    return DesignerCompletionJson(**json.loads(_strip_fence(raw, "json")))
+
+
+def legacy_reviewer(raw: str) -> List[DesignerCompletionJson]:
+    # The flow never parsed the reviewer output; this is the equivalent hand-rolled version
+    return [DesignerCompletionJson(**d) for d in json.loads(_strip_fence(raw, "json"))]
+
+
+PARSERS: Dict[str, Tuple[Callable, Callable]] = {
+    "manager": (legacy_manager, parse_manager_output),
+    "designer": (legacy_designer, parse_designer_output),
+    "reviewer": (legacy_reviewer, parse_reviewer_output),
+}
+
+
+def fixture_outputs(brief_scale: int) -> Dict[str, List[str]]:
+    manager = llm_utils.manager_crew_response
+    if brief_scale > 1:
+        brief_start = manager.index("project_brief: >") + len("project_brief: >\n")
+        brief_end = manager.index("designer_instructions:")
+        brief = manager[brief_start:brief_end]
+        manager = manager[:brief_start] + brief * brief_scale + manager[brief_end:]
+    return {
+        "manager": [manager],
+        "designer": [
+            llm_utils.designer_crew_creative_pydantic,
+            llm_utils.designer_crew_balanced_pydantic,
+            llm_utils.designer_crew_conservative_pydantic,
+        ],
+        "reviewer": [llm_utils.reviewer_crew_response],
+    }
+
+
+def cassette_outputs(path: str) -> Dict[str, List[str]]:
+    outputs: Dict[str, List[str]] = {"manager": [], "designer": [], "reviewer": []}
+    for entry in Cassette.load_entries(path):
+        kind = entry["crew"].split("_", 1)[0]
+        if kind in outputs:
+            outputs[kind].append(entry["response"])
+    return outputs
+
+
+def _time_per_call(parse: Callable, samples: List[str], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for raw in samples:
+            parse(raw)
+    return (time.perf_counter() - started) / (repeat * len(samples))
+
+
+def run_benchmark(outputs: Dict[str, List[str]], repeat: int) -> Dict:
+    report = {}
+    for kind, samples in outputs.items():
+        legacy, shared = PARSERS[kind]
+        usable = []
+        for raw in samples:
+            try:
+                legacy(raw)
+                usable.append(raw)
+            except Exception:
+                # Compare like with like: outputs only the shared parser copes with are skipped
+                continue
+        if not usable:
+            continue
+        legacy_us = 1e6 * _time_per_call(legacy, usable, repeat)
+        shared_us = 1e6 * _time_per_call(shared, usable, repeat)
+        report[kind] = {
+            "outputs": len(usable),
+            "mean_chars": round(sum(len(r) for r in usable) / len(usable)),
+            "legacy_us": round(legacy_us, 1),
+            "shared_us": round(shared_us, 1),
+            "speedup": round(legacy_us / shared_us, 2) if shared_us else None,
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Structured-output parsing microbenchmark")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--cassette", help="Parse the outputs recorded in this cassette")
+    parser.add_argument("--brief-scale", type=int, default=1)
+    args = parser.parse_args()
+
+    outputs = (
+        cassette_outputs(args.cassette) if args.cassette else fixture_outputs(args.brief_scale)
+    )
+    print(json.dumps(run_benchmark(outputs, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Memory benchmark: Node children built with per-node level-config copies vs
+Node.add_child, which shares the root's LevelConfig and one fields-set.
+
+Builds the same breadth-first tree (fixed branching factor) both ways and reports
+traced bytes per node and build time. The `copied` builder validates every child
+with Node(...), as add_child did before, so each node holds its own normalized
+level maps and fields-set.
+
+Usage:
+    python -m src.benchmarks.tree_memory --sizes 10000 100000 --branching 4
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from collections import deque
+
+from src.enums.work_status_enum import WorkStatus
+from src.generic.node import Node
+
+LEVEL_TITLES = ["Vision", "Zone", "Feature", "Micro-feature", "Atomic Task"]
+
+
+def _depth_for(size: int, branching: int) -> int:
+    depth, total, width = 0, 1, 1
+    while total < size:
+        width *= branching
+        total += width
+        depth += 1
+    return depth
+
+
+def _root(size: int, branching: int) -> Node:
+    depth = _depth_for(size, branching)
+    return Node(
+        title="Root",
+        depth_limit=depth,
+        level_titles=LEVEL_TITLES + [f"Level {i}" for i in range(5, depth + 1)],
+        level_statuses={i: WorkStatus.PENDING for i in range(depth + 1)},
+        status=WorkStatus.INITIALIZING,
+    )
+
+
+def _copied_child(parent: Node, title: str) -> Node:
+    level = parent.level + 1
+    child = Node(
+        title=title,
+        status=parent.get_status_for_level(level) or parent.status,
+        parent=parent,
+        level=level,
+        path=f"{parent.path}{parent.sep}{len(parent.children)}",
+        sep=parent.sep,
+        depth_limit=parent.depth_limit,
+        level_titles=parent.level_titles,
+        level_statuses=parent.level_statuses,
+    )
+    parent.children.append(child)
+    return child
+
+
+def _shared_child(parent: Node, title: str) -> Node:
+    return parent.add_child(title=title)
+
+
+def build(add, size: int, branching: int) -> Node:
+    root = _root(size, branching)
+    queue, count = deque([root]), 1
+    while count < size:
+        parent = queue.popleft()
+        for _ in range(min(branching, size - count)):
+            queue.append(add(parent, f"Node {count}"))
+            count += 1
+    return root
+
+
+def measure(add, size: int, branching: int) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    tree = build(add, size, branching)
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tree
+    return {
+        "bytes": current,
+        "bytes_per_node": round(current / size, 1),
+        "peak_bytes": peak,
+        "build_seconds": round(elapsed, 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Node tree level-config memory benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--branching", type=int, default=4)
+    args = parser.parse_args()
+
+    report = []
+    for size in args.sizes:
+        copied = measure(_copied_child, size, args.branching)
+        shared = measure(_shared_child, size, args.branching)
+        report.append(
+            {
+                "nodes": size,
+                "copied": copied,
+                "shared": shared,
+                "memory_reduction": round(copied["bytes"] / shared["bytes"], 1),
+            }
+        )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ from typing import Optional
 from crewai import Agent, Crew, Process, Task, LLM
 from crewai.project import CrewBase, agent, crew, task
 from src.generic.llm_utils import get_llm
+from src.generic.crew_registry import cached_crew_configs
 from src.enums.llm_name_enum import LLMName
 from src.llm_completion.designer_completion import DesignerCompletionJson
 from dotenv import load_dotenv
@@ -10,6 +11,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+@cached_crew_configs
 @CrewBase
 class DesignerCrew:
     """Designer Crew"""
@@ -1,15 +1,21 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from src.generic.llm_utils import get_llm
+from src.generic.crew_registry import cached_crew_configs
 from src.enums.llm_name_enum import LLMName
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
+@cached_crew_configs
 @CrewBase
 class ManagerCrew:
-    """Manager Crew"""
+    """
+    Manager Crew. Every node runs the vision task: the root with the project
+    vision, a sub-node with its own title/description as the `vision` input
+    (see BFSNodeFlow._manager_vision).
+    """
 
     agents_config = "config/agents.yaml"
     tasks_config = "config/tasks.yaml"
@@ -17,9 +23,8 @@ class ManagerCrew:
     # agents_config = "src/manager_crew/config/agents.yaml"
     # tasks_config = "src/manager_crew/config/tasks.yaml"
 
-    def __init__(self, llm_name: LLMName = LLMName.MOCK, is_initializing: bool = True):
+    def __init__(self, llm_name: LLMName = LLMName.MOCK):
         self.llm = get_llm(llm_name, "manager_crew")
-        self.is_initializing = is_initializing
 
     @agent
     def architect(self) -> Agent:
@@ -35,14 +40,6 @@ class ManagerCrew:
 
     @crew
     def crew(self) -> Crew:
-        # Determine which task to run
-        if self.is_initializing:
-            tasks = [self.vision_init_task()]
-        else:
-            raise ValueError(
-                "Empty Crew: No tasks assigned. Set is_initializing=True to run the vision_init_task."
-            )
-
         return Crew(
             agents=self.agents,
             tasks=self.tasks,
@@ -2,11 +2,13 @@ import os
 from crewai import Agent, Crew, Process, Task, LLM
 from crewai.project import CrewBase, agent, crew, task
 from src.generic.llm_utils import get_llm
+from src.generic.crew_registry import cached_crew_configs
 from src.enums.llm_name_enum import LLMName
 from dotenv import load_dotenv
 
 load_dotenv()
 
+@cached_crew_configs
 @CrewBase
 class WriterCrew:
     """Writer Crew"""
@@ -0,0 +1,183 @@
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, IO, List, Optional
+
+from pydantic import BaseModel
+
+from src.generic.node import Node
+from src.state.node_context import NodeContext
+from src.state.payload_store import node_payload
+
+ARTIFACTS_DIR = "artifacts"
+
+# Queue messages other than records
+_CHECKPOINT = object()
+_CLOSE = object()
+
+
+class ArtifactPolicy(BaseModel):
+    """
+    Streaming of finished nodes' artifacts to <output_path>/artifacts (the
+    `artifacts` config block).
+
+      - flush_interval_seconds: buffered records are written at most this long
+        after they were submitted
+      - max_buffer_bytes: buffered records are written early once they reach this
+      - fsync_every_nodes: the shards are fsync'ed every this many nodes (a
+        checkpoint) and when the run completes, never per record
+    """
+
+    enabled: bool = True
+    flush_interval_seconds: float = 1.0
+    max_buffer_bytes: int = 1 << 20
+    fsync_every_nodes: int = 50
+
+
+def artifact_record(item: Node, ctx: Optional[NodeContext] = None) -> Dict[str, Any]:
+    """
+    A finished node's artifacts: its text, children and stage outputs (manager
+    brief, designer components, reviewer and writer output, per-design reviewer
+    verdicts), plus parent, timings, tokens and score.
+    """
+    record = node_payload(item, ctx)
+    if ctx is not None:
+        record["reviewer_decisions"] = [
+            {"agent_name": d.agent_name, "is_approved": d.is_approved}
+            for d in ctx.reviewer_decisions
+        ]
+    record["parent_id"] = str(item.parent.id) if item.parent else None
+    record["created_at"] = item.created_at.isoformat() if item.created_at else None
+    record["finished_at"] = item.finished_at.isoformat() if item.finished_at else None
+    record["prompt_tokens"] = item.prompt_tokens
+    record["completion_tokens"] = item.completion_tokens
+    record["llm_cost"] = item.llm_cost
+    record["score"] = item.score
+    return record
+
+
+class ArtifactWriter:
+    """
+    Background writer of per-level JSONL shards,
+    <output_path>/artifacts/level_<n>.jsonl, one line per finished node.
+
+    submit() only snapshots the node into a dict and hands it to an unbounded
+    queue, so the stage methods never wait on disk I/O. A daemon thread serializes
+    the records, buffers them per level and writes each batch with a single
+    write + flush; fsync happens only at checkpoints and on close. On a resumed
+    run the shards are appended to, and a later line for a node replaces an
+    earlier one.
+    """
+
+    def __init__(self, policy: ArtifactPolicy, output_path: str):
+        self.policy = policy
+        self.directory = os.path.join(output_path, ARTIFACTS_DIR)
+        os.makedirs(self.directory, exist_ok=True)
+        self.records = 0
+        self.bytes_written = 0
+        self.flushes = 0
+        self.fsyncs = 0
+        self._submitted = 0
+        self._files: Dict[int, IO[bytes]] = {}
+        self._buffers: Dict[int, List[bytes]] = {}
+        self._buffered_bytes = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name="artifact-writer", daemon=True
+        )
+        self._thread.start()
+
+    def shard_path(self, level: int) -> str:
+        return os.path.join(self.directory, f"level_{level}.jsonl")
+
+    def submit(self, item: Node, ctx: Optional[NodeContext] = None) -> None:
+        """Queues a finished node's artifacts; a checkpoint follows every fsync_every_nodes nodes."""
+        self._queue.put((item.level, artifact_record(item, ctx)))
+        self._submitted += 1
+        every = self.policy.fsync_every_nodes
+        if every > 0 and self._submitted % every == 0:
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """Asks the writer thread to write out its buffers and fsync every shard."""
+        self._queue.put(_CHECKPOINT)
+
+    def close(self) -> None:
+        """Writes out and fsyncs everything submitted so far, then stops the thread."""
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_CLOSE)
+        self._thread.join()
+
+    def _run(self) -> None:
+        deadline: Optional[float] = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                message = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                message = None
+
+            if message is _CLOSE:
+                self._flush(fsync=True)
+                for f in self._files.values():
+                    f.close()
+                return
+            if message is _CHECKPOINT:
+                self._flush(fsync=True)
+                deadline = None
+                continue
+            if message is not None:
+                level, record = message
+                line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+                self._buffers.setdefault(level, []).append(line)
+                self._buffered_bytes += len(line)
+                if deadline is None:
+                    deadline = time.monotonic() + self.policy.flush_interval_seconds
+                if self._buffered_bytes < self.policy.max_buffer_bytes:
+                    if time.monotonic() < deadline:
+                        continue
+            # Flush interval elapsed or buffer full
+            self._flush(fsync=False)
+            deadline = None
+
+    def _flush(self, fsync: bool) -> None:
+        records = 0
+        written = 0
+        for level, lines in self._buffers.items():
+            if not lines:
+                continue
+            f = self._files.get(level)
+            if f is None:
+                f = self._files[level] = open(self.shard_path(level), "ab")
+            data = b"".join(lines)
+            f.write(data)
+            f.flush()
+            records += len(lines)
+            written += len(data)
+        self._buffers.clear()
+        self._buffered_bytes = 0
+        if fsync:
+            for f in self._files.values():
+                os.fsync(f.fileno())
+        with self._lock:
+            self.records += records
+            self.bytes_written += written
+            if records:
+                self.flushes += 1
+            if fsync:
+                self.fsyncs += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "directory": self.directory,
+                "records": self.records,
+                "bytes_written": self.bytes_written,
+                "flushes": self.flushes,
+                "fsyncs": self.fsyncs,
+                "shards": len(self._files),
+            }
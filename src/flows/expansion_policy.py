@@ -0,0 +1,218 @@
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from pydantic import BaseModel, Field
+
+EXPANSION_FILE = "expansion_report.json"
+
+# Words that say little about what a component is ("Activity Tracking System" and
+# "Activity Tracker" are the same component)
+_FILLER_WORDS = {
+    "a", "an", "and", "the", "of", "for", "to", "with", "in", "on",
+    "system", "module", "framework", "engine", "platform", "interface",
+    "management", "service", "component",
+}
+_SUFFIXES = ("ing", "ers", "er", "s")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def name_tokens(name: str) -> Set[str]:
+    """Normalized tokens of a component name: lowercased, filler words dropped, crudely stemmed."""
+    tokens = set()
+    for word in _WORD.findall(name.lower()):
+        if word in _FILLER_WORDS:
+            continue
+        for suffix in _SUFFIXES if not word.endswith("ss") else ():
+            if len(word) > len(suffix) + 2 and word.endswith(suffix):
+                word = word[: -len(suffix)]
+                break
+        tokens.add(word)
+    return tokens
+
+
+def similarity(a: Set[str], b: Set[str]) -> float:
+    """Jaccard similarity of two token sets (1.0 for two empty sets)."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class ChildSpec(BaseModel):
+    """One child to create: a component of an approved design."""
+
+    title: str
+    description: Optional[str] = None
+    # Approved designs proposing this component (near-duplicates collapsed into it)
+    support: int = 1
+    # support / number of approved designs: the node's reviewer score
+    score: float = 0.0
+
+
+class ExpansionPlan(BaseModel):
+    """Children chosen for one node, with what was pruned on the way."""
+
+    children: List[ChildSpec] = Field(default_factory=list)
+    proposed: int = 0
+    disapproved: int = 0
+    # Components of designs without a reviewer decision, dropped by when_unreviewed "none"
+    unreviewed: int = 0
+    duplicates: int = 0
+    capped: int = 0
+
+    @property
+    def pruned(self) -> int:
+        return self.disapproved + self.unreviewed + self.duplicates + self.capped
+
+
+class ExpansionPolicy(BaseModel):
+    """
+    How a node's children are chosen (the `branching` config block).
+
+      - mode "reviewer": one child per component of the designs the reviewer
+        approved; disapproved designs are dropped, near-duplicate components
+        (name token similarity >= similarity_threshold) across the approved
+        designs are collapsed, and at most max_children are kept, preferring
+        components proposed by more designs
+      - mode "random": randint(min_children, max_children) placeholder children
+      - max_children_per_level overrides max_children by the children's level
+      - designs without a reviewer decision (none could be parsed, or the
+        reviewer left the design out): when_unreviewed "approve_all" treats them
+        as approved, "none" drops them
+    """
+
+    mode: str = "reviewer"
+    min_children: int = 0
+    max_children: int = 2
+    max_children_per_level: Dict[int, int] = Field(default_factory=dict)
+    similarity_threshold: float = 0.5
+    when_unreviewed: str = "approve_all"
+
+    def cap_for(self, level: int) -> int:
+        return int(self.max_children_per_level.get(level, self.max_children))
+
+    def plan(
+        self,
+        designer_outputs: Sequence[Any],
+        reviewer_decisions: Sequence[Any],
+        child_level: int,
+    ) -> ExpansionPlan:
+        """Children for a node from its designs and the reviewer's decisions on them."""
+        plan = ExpansionPlan()
+        designs = {d.agent_name: d for d in designer_outputs}
+        approved: List[Any] = []
+        for decision in reviewer_decisions:
+            # Prefer the designer's own output; the reviewer may echo it abridged
+            design = designs.pop(decision.agent_name, decision)
+            plan.proposed += len(design.components)
+            if decision.is_approved:
+                approved.append(design)
+            else:
+                plan.disapproved += len(design.components)
+        # Designs the reviewer did not decide on
+        for design in designs.values():
+            plan.proposed += len(design.components)
+            if self.when_unreviewed == "approve_all":
+                approved.append(design)
+            else:
+                plan.unreviewed += len(design.components)
+        if not approved:
+            return plan
+
+        kept: List[Tuple[Set[str], ChildSpec]] = []
+        for design in approved:
+            for component in design.components:
+                tokens = name_tokens(component.name)
+                match = next(
+                    (
+                        spec
+                        for seen, spec in kept
+                        if similarity(tokens, seen) >= self.similarity_threshold
+                    ),
+                    None,
+                )
+                if match is not None:
+                    match.support += 1
+                    plan.duplicates += 1
+                    continue
+                description = component.description
+                if component.relevant_details:
+                    description += "\n" + "\n".join(
+                        f"- {detail}" for detail in component.relevant_details
+                    )
+                kept.append(
+                    (tokens, ChildSpec(title=component.name, description=description))
+                )
+
+        # Stable: among equally supported components the designers' order is kept
+        ranked = sorted((spec for _, spec in kept), key=lambda spec: -spec.support)
+        for spec in ranked:
+            spec.score = spec.support / len(approved)
+        cap = self.cap_for(child_level)
+        plan.children = ranked[:cap]
+        plan.capped = len(ranked) - len(plan.children)
+        return plan
+
+
+class ExpansionLedger:
+    """Pruned vs created expansions of a run, in total and by the children's level."""
+
+    def __init__(self):
+        self.by_level: Dict[int, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, child_level: int, plan: ExpansionPlan, created: int) -> None:
+        with self._lock:
+            entry = self.by_level.setdefault(
+                child_level,
+                {
+                    "nodes": 0,
+                    "proposed": 0,
+                    "disapproved": 0,
+                    "unreviewed": 0,
+                    "duplicates": 0,
+                    "capped": 0,
+                    "created": 0,
+                },
+            )
+            entry["nodes"] += 1
+            entry["proposed"] += plan.proposed
+            entry["disapproved"] += plan.disapproved
+            entry["unreviewed"] += plan.unreviewed
+            entry["duplicates"] += plan.duplicates
+            entry["capped"] += plan.capped
+            entry["created"] += created
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            total: Dict[str, int] = {}
+            for entry in self.by_level.values():
+                for key, value in entry.items():
+                    total[key] = total.get(key, 0) + value
+            total["pruned"] = sum(
+                total.get(key, 0) for key in ("disapproved", "unreviewed", "duplicates", "capped")
+            )
+            return {
+                "total": total,
+                "by_level": {str(k): dict(v) for k, v in sorted(self.by_level.items())},
+            }
+
+    def summary(self) -> str:
+        total = self.report()["total"]
+        return (
+            f"{total.get('created', 0)} children created, {total['pruned']} expansions pruned "
+            f"({total.get('disapproved', 0)} disapproved, {total.get('unreviewed', 0)} unreviewed, "
+            f"{total.get('duplicates', 0)} duplicates, "
+            f"{total.get('capped', 0)} over the cap)"
+        )
+
+    def write(self, output_path: str) -> str:
+        """Writes the report to <output_path>/expansion_report.json (atomically replaced)."""
+        path = os.path.join(output_path, EXPANSION_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        os.replace(tmp_path, path)
+        return path
@@ -1,6 +1,13 @@
 import os
 import yaml
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Optional
+
+_kickoff_executor: Optional[ThreadPoolExecutor] = None
 
 
 def load_flow_config(config_path: str) -> dict:
@@ -60,3 +67,26 @@ def initialize_workspace(config_path: str, idea_path: str) -> dict:
     output_path = setup_output_directory(config)
 
     return {"config": config, "output_path": output_path}
+
+
+def get_kickoff_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Returns the shared thread pool for blocking crew kickoffs, resizing it if needed."""
+    global _kickoff_executor
+    if _kickoff_executor is None or _kickoff_executor._max_workers != max_workers:
+        if _kickoff_executor is not None:
+            _kickoff_executor.shutdown(wait=False)
+        _kickoff_executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="crew-kickoff"
+        )
+    return _kickoff_executor
+
+
+async def run_blocking(executor: ThreadPoolExecutor, func, *args, **kwargs):
+    """
+    Awaits a blocking call on the given executor without stalling the event loop.
+    The caller's context variables are carried over, as asyncio.to_thread does.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+    return await loop.run_in_executor(executor, call)
@@ -0,0 +1,85 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from src.state.node_context import NodeContext
+
+
+class IterativeDriver:
+    """
+    Alternative engine entry point for BFSNodeFlow: runs the same stage helpers
+    (_manage_node -> _design_node -> _review_node -> _write_node, then
+    _finalize_node) as plain coroutines over the flow's work queue, instead of
+    walking the tree through the @listen(or_("sequential", "writer_done")) cycle.
+
+    Each node gets its own NodeContext, so nothing goes through
+    NodeState.current_item / current_context and there are no listener dispatches
+    or method-output bookkeeping per node. `concurrency` workers (default
+    state.max_concurrency) pull nodes as they become available; a node's children
+    are enqueued as soon as it is finalized, so with several workers the visit
+    order follows completion order rather than the level-synchronous batches of
+    run_frontier. The pipeline config block does not apply here.
+
+    Usage:
+        IterativeDriver(BFSNodeFlow()).kickoff(inputs={"config_path": ...})
+    """
+
+    def __init__(self, flow: Any, concurrency: Optional[int] = None):
+        self.flow = flow
+        self.concurrency = concurrency
+        self.nodes_processed = 0
+        self.wall_seconds = 0.0
+        self._in_flight = 0
+        self._progress: Optional[asyncio.Event] = None
+
+    def kickoff(self, inputs: Optional[Dict[str, Any]] = None) -> str:
+        """Synchronous entry point, mirroring Flow.kickoff."""
+        return asyncio.run(self.run(inputs))
+
+    async def run(self, inputs: Optional[Dict[str, Any]] = None) -> str:
+        """Applies `inputs` to the flow state, initializes the flow and drives it to completion."""
+        for key, value in (inputs or {}).items():
+            setattr(self.flow.state, key, value)
+        self.flow.initialize_flow()
+        await self.drive()
+        return self.flow._complete_flow()
+
+    async def drive(self) -> None:
+        """Processes the (already initialized) work queue until it is empty and nothing is in flight."""
+        workers = max(1, self.concurrency or self.flow.state.max_concurrency)
+        self._progress = asyncio.Event()
+        self._in_flight = 0
+
+        started = time.perf_counter()
+        async with asyncio.TaskGroup() as group:
+            for _ in range(workers):
+                group.create_task(self._work())
+        self.wall_seconds = time.perf_counter() - started
+
+        print(
+            f"Iterative driver: {self.nodes_processed} node(s) in {self.wall_seconds:.2f}s "
+            f"({workers} worker(s))"
+        )
+
+    async def _work(self) -> None:
+        flow = self.flow
+        queue = flow.state.work_queue
+        while True:
+            if queue:
+                item = queue.popleft()
+                self._in_flight += 1
+                try:
+                    ctx: NodeContext = flow._context_for(item)
+                    await flow._process_node(ctx)
+                    flow._finalize_node(item, ctx)
+                    self.nodes_processed += 1
+                finally:
+                    self._in_flight -= 1
+                    # Wake idle workers: the queue may have new children, or the run is over
+                    self._progress.set()
+            elif self._in_flight == 0:
+                return
+            else:
+                # Another worker's node may still expand into children
+                self._progress.clear()
+                await self._progress.wait()
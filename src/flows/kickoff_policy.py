@@ -0,0 +1,191 @@
+import asyncio
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from pydantic import BaseModel
+
+from src.generic.rate_limiter import is_throttle_error
+from src.generic.tracing import percentile
+
+# Exception class names of the openai / litellm / httpx clients worth retrying
+_TRANSIENT_NAMES = (
+    "Timeout",
+    "APIConnectionError",
+    "ConnectError",
+    "ServiceUnavailable",
+    "InternalServerError",
+    "BadGateway",
+    "RemoteProtocolError",
+)
+
+
+class KickoffFailed(Exception):
+    """A crew kickoff that still failed after the policy's retries."""
+
+    def __init__(self, crew_name: str, attempts: int, last_error: BaseException):
+        super().__init__(
+            f"{crew_name} failed after {attempts} attempt(s): "
+            f"{type(last_error).__name__}: {last_error}"
+        )
+        self.crew_name = crew_name
+        self.attempts = attempts
+        self.last_error = last_error
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    for source in (error, getattr(error, "response", None)):
+        for attr in ("status_code", "status"):
+            value = getattr(source, attr, None)
+            if isinstance(value, int) or (isinstance(value, str) and value.isdigit()):
+                return int(value)
+    return None
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    True for errors a retry can fix: timeouts, connection errors, throttling (429)
+    and 5xx responses. Validation/parse errors, bad configuration and other 4xx
+    responses fail the same way every time and are not retried.
+    """
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    if is_throttle_error(error):
+        return True
+    status = _status_code(error)
+    if status is not None:
+        return 500 <= status < 600
+    return any(name in type(error).__name__ for name in _TRANSIENT_NAMES)
+
+
+class KickoffPolicy(BaseModel):
+    """
+    Execution policy applied to every crew kickoff (the `kickoff_policy` config block).
+
+      - max_attempts: total tries, including the first one; only transient
+        errors (see is_transient_error) are retried, others fail at once
+      - backoff: base_delay * 2^(retry - 1), capped at max_delay, with the upper
+        half jittered so concurrent nodes don't retry in lockstep
+      - timeout_seconds: per-attempt limit (None = wait forever). It only stops
+        waiting: the blocking kickoff cannot be interrupted and keeps its
+        kickoff-pool thread (and rate-limiter slot) until it returns, while the
+        retry takes another thread. Keep it well above the crews' normal latency.
+      - hedging: when an attempt runs past the crew's hedge_percentile latency
+        (once hedge_min_samples successes are known), a duplicate is started and
+        whichever finishes first wins
+      - on_failure: "fail_node" marks the node FAILED and the run continues;
+        "abort" stops the run
+    """
+
+    max_attempts: int = 3
+    base_delay_seconds: float = 1.0
+    max_delay_seconds: float = 20.0
+    timeout_seconds: Optional[float] = None
+    hedge_enabled: bool = False
+    hedge_percentile: float = 95.0
+    hedge_min_samples: int = 20
+    hedge_min_delay_seconds: float = 1.0
+    on_failure: str = "fail_node"
+
+    def backoff_delay(self, retry: int, rng: random.Random = random) -> float:
+        delay = min(self.max_delay_seconds, self.base_delay_seconds * 2 ** (retry - 1))
+        return delay / 2 + rng.uniform(0, delay / 2)
+
+
+class LatencyTracker:
+    """Recent successful kickoff latencies per crew, used for the hedging threshold."""
+
+    def __init__(self, window: int = 200):
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            self._samples[key].append(seconds)
+
+    def threshold(self, key: str, policy: KickoffPolicy) -> Optional[float]:
+        """Seconds after which to hedge `key`, or None while there are too few samples."""
+        with self._lock:
+            samples = list(self._samples[key])
+        if len(samples) < policy.hedge_min_samples:
+            return None
+        return max(policy.hedge_min_delay_seconds, percentile(samples, policy.hedge_percentile))
+
+
+async def _first_success(attempt: Callable[[bool], Awaitable[Any]], hedge_after: Optional[float]):
+    """
+    Runs attempt(False); if it is still running after `hedge_after` seconds, also runs
+    attempt(True) and returns whichever succeeds first. The loser is cancelled (a
+    kickoff already running on a worker thread finishes there; its result is
+    discarded, its token usage is still charged by the caller's attempt).
+    """
+    primary = asyncio.ensure_future(attempt(False))
+    if hedge_after is None:
+        return await primary
+
+    done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+    if done:
+        return primary.result()
+
+    print(f"Hedging kickoff still running after {hedge_after:.1f}s")
+    pending = {primary, asyncio.ensure_future(attempt(True))}
+    error: Optional[BaseException] = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def run_with_policy(
+    attempt: Callable[[int, bool], Awaitable[Any]],
+    policy: KickoffPolicy,
+    tracker: LatencyTracker,
+    crew_name: str,
+) -> Any:
+    """
+    Calls attempt(attempt_number, is_hedge) under `policy`: per-attempt timeout,
+    optional hedging and jittered exponential backoff between attempts.
+    Raises KickoffFailed once max_attempts are used up, or at the first error
+    that is not transient.
+    """
+    last_error: Optional[BaseException] = None
+    for attempt_number in range(1, policy.max_attempts + 1):
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(
+                _first_success(
+                    lambda hedge: attempt(attempt_number, hedge),
+                    tracker.threshold(crew_name, policy) if policy.hedge_enabled else None,
+                ),
+                timeout=policy.timeout_seconds,
+            )
+            tracker.record(crew_name, time.perf_counter() - started)
+            return result
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            last_error = (
+                TimeoutError(f"timed out after {policy.timeout_seconds}s")
+                if isinstance(e, asyncio.TimeoutError)
+                else e
+            )
+            if not is_transient_error(last_error):
+                raise KickoffFailed(crew_name, attempt_number, last_error) from e
+            if attempt_number == policy.max_attempts:
+                break
+            delay = policy.backoff_delay(attempt_number)
+            print(
+                f"{crew_name} attempt {attempt_number}/{policy.max_attempts} failed "
+                f"({type(last_error).__name__}: {last_error}); retrying in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+    raise KickoffFailed(crew_name, policy.max_attempts, last_error)
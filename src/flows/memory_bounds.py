@@ -0,0 +1,243 @@
+import json
+import os
+import re
+import threading
+import tracemalloc
+from collections import deque
+from itertools import islice
+from typing import Any, Dict, List, Optional
+
+from crewai.events import crewai_event_bus
+from crewai.project import utils as crew_project_utils
+from pydantic import BaseModel
+
+from src.generic.node import Node
+from src.state.node_context import NodeContext
+from src.state.payload_store import PayloadStore, node_payload, node_stub
+
+MEMORY_FILE = "memory_report.json"
+
+# crewai.project.utils.memoize keys name the CrewBase instance they were built for
+_MEMO_INSTANCE = re.compile(r"\('__instance__', (\d+)\)")
+
+
+def missing_runtime_internals(flow: Any = None) -> List[str]:
+    """
+    The crewai internals that bounded mode trims are private, not a stable API.
+    Returns those this crewai version lacks; trimming skips each one that is missing.
+    (The event bus's runtime state only exists during a kickoff, so its record is
+    checked when it is trimmed.)
+    """
+    missing = []
+    if flow is not None and not isinstance(getattr(flow, "_method_outputs", None), (list, deque)):
+        missing.append("Flow._method_outputs")
+    memo = getattr(crew_project_utils, "cache", None)
+    if not (
+        isinstance(getattr(memo, "_cache", None), dict)
+        and hasattr(getattr(memo, "_lock", None), "w_locked")
+    ):
+        missing.append("crewai.project.utils.cache._cache/_lock")
+    if not hasattr(crewai_event_bus, "runtime_state"):
+        missing.append("crewai_event_bus.runtime_state")
+    return missing
+
+
+class MemoryPolicy(BaseModel):
+    """
+    Memory footprint of a run (the `memory` config block).
+
+      - bounded: finished nodes are spilled to <output_path>/node_payloads.jsonl and
+        replaced in visited_queue by a compact stub (see payload_store.node_stub);
+        the live node drops its text, stage outputs and children list, so only
+        queued/in-flight nodes and their ancestors stay whole in memory. The flow
+        runtime's history is capped as well:
+          - method_history: entries of the per-method output history kept (the
+            runtime only reads the last one, the flow's result)
+          - event_history: events kept in crewai's runtime event record; crews,
+            agents and agent executors registered in its runtime state are
+            dropped as nodes are finalized, and the @agent/@task/@crew results
+            crewai.project memoizes for a crew as its kickoff returns
+      - tracemalloc: trace allocations and report peak memory per tree level
+    """
+
+    bounded: bool = False
+    method_history: int = 64
+    event_history: int = 256
+    tracemalloc: bool = False
+    tracemalloc_frames: int = 1
+
+
+class MemoryBounds:
+    """
+    Applies a MemoryPolicy to a flow: spills and stubs finished nodes and samples
+    tracemalloc as each node is finalized. The peak since the previous sample is
+    charged to the level of the node being finalized (with concurrent modes, nodes
+    of neighbouring levels may overlap in it).
+    """
+
+    def __init__(self, policy: MemoryPolicy, output_path: str):
+        self.policy = policy
+        self.payloads = PayloadStore(output_path) if policy.bounded else None
+        self.nodes_stubbed = 0
+        self.entities_dropped = 0
+        self.events_dropped = 0
+        self.memoized_dropped = 0
+        self.by_level: Dict[int, Dict[str, int]] = {}
+        self.peak_bytes = 0
+        self._started_tracing = False
+        self._flow: Any = None
+        self._missing: List[str] = missing_runtime_internals() if policy.bounded else []
+        self._lock = threading.Lock()
+
+    def start(self, flow: Any) -> None:
+        """Caps the flow runtime's method history and starts tracing allocations."""
+        self._flow = flow
+        if self.policy.bounded:
+            self._missing = missing_runtime_internals(flow)
+            if self._missing:
+                print(
+                    "Memory bounds: this crewai version lacks "
+                    f"{', '.join(self._missing)}; not trimming them"
+                )
+            if "Flow._method_outputs" not in self._missing:
+                flow._method_outputs = deque(
+                    flow._method_outputs, maxlen=max(1, self.policy.method_history)
+                )
+        if self.policy.tracemalloc:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.policy.tracemalloc_frames)
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+
+    def release(self, item: Node, ctx: Optional[NodeContext] = None) -> Node:
+        """
+        Spills a finished node (and its stage outputs) to disk and strips them from
+        memory; returns the stub to keep in visited_queue. Call after its children
+        were enqueued: their parent link still points at `item`, which keeps only
+        what the scheduler's cost estimate reads.
+        """
+        if self.payloads is None:
+            return item
+        self.payloads.put(node_payload(item, ctx))
+        item.description = None
+        item.children = []
+        if ctx is not None:
+            ctx.manager_output = None
+            ctx.designer_outputs = []
+            ctx.streamed_components = {}
+            ctx.reviewer_output = None
+            ctx.reviewer_decisions = []
+            ctx.writer_output = None
+        with self._lock:
+            self.nodes_stubbed += 1
+        self._trim_runtime_history()
+        return node_stub(item)
+
+    def _trim_runtime_history(self) -> None:
+        """
+        Drops what crewai's event bus accumulates over the flow's kickoff and never
+        releases: every crew, agent and agent executor registered in its runtime
+        state (the flow itself is kept) and all but the last event_history events.
+        Skipped when this crewai version lacks them (see missing_runtime_internals).
+        """
+        state = getattr(crewai_event_bus, "runtime_state", None)
+        record = getattr(state, "event_record", None)
+        if not (
+            isinstance(getattr(state, "root", None), list)
+            and hasattr(getattr(record, "_lock", None), "w_locked")
+            and hasattr(record, "nodes")
+        ):
+            return
+        entities = state.root
+        # Entities registered concurrently (in-flight kickoffs) land after `count`
+        count = len(entities)
+        kept = [e for e in entities[:count] if e is self._flow]
+        dropped = count - len(kept)
+        if dropped:
+            entities[:count] = kept
+        # EventRecord.add() takes the record's write lock from the kickoff threads
+        with record._lock.w_locked():
+            excess = len(record.nodes) - self.policy.event_history
+            for event_id in list(islice(record.nodes, max(0, excess))):
+                del record.nodes[event_id]
+        with self._lock:
+            self.entities_dropped += dropped
+            self.events_dropped += max(0, excess)
+
+    def release_crew(self, crew: Any) -> None:
+        """
+        Evicts the @agent/@task/@crew results crewai.project memoized for the
+        CrewBase instance that built `crew`. Call on the kickoff thread once the
+        crew's kickoff returned: other kickoff threads may be building crews at
+        the same time, so the shared cache is never cleared wholesale, and a
+        crew's own entries are only read while it is being built.
+        """
+        if not self.policy.bounded or "crewai.project.utils.cache._cache/_lock" in self._missing:
+            return
+        memo = crew_project_utils.cache
+        with memo._lock.w_locked():
+            instance = next(
+                (
+                    _MEMO_INSTANCE.search(key)
+                    for key, value in memo._cache.items()
+                    if value is crew
+                ),
+                None,
+            )
+            if instance is None:
+                return
+            token = instance.group(0)
+            evicted = [key for key in memo._cache if token in key]
+            for key in evicted:
+                del memo._cache[key]
+        with self._lock:
+            self.memoized_dropped += len(evicted)
+
+    def sample(self, level: int) -> None:
+        if not (self.policy.tracemalloc and tracemalloc.is_tracing()):
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        with self._lock:
+            entry = self.by_level.setdefault(
+                level, {"nodes": 0, "peak_bytes": 0, "current_bytes": 0}
+            )
+            entry["nodes"] += 1
+            entry["peak_bytes"] = max(entry["peak_bytes"], peak)
+            entry["current_bytes"] = current
+            self.peak_bytes = max(self.peak_bytes, peak)
+
+    def stop(self) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        if self.payloads is not None:
+            self.payloads.close()
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "policy": self.policy.model_dump(),
+                "nodes_stubbed": self.nodes_stubbed,
+                "entities_dropped": self.entities_dropped,
+                "events_dropped": self.events_dropped,
+                "memoized_dropped": self.memoized_dropped,
+                "payloads": self.payloads.stats() if self.payloads is not None else None,
+                "peak_bytes": self.peak_bytes,
+                "by_level": {str(k): dict(v) for k, v in sorted(self.by_level.items())},
+            }
+
+    def summary(self) -> str:
+        return (
+            f"{self.nodes_stubbed} nodes stubbed, "
+            f"peak {self.peak_bytes / 2**20:.1f} MiB traced"
+        )
+
+    def write(self, output_path: str) -> str:
+        """Writes the report to <output_path>/memory_report.json (atomically replaced)."""
+        path = os.path.join(output_path, MEMORY_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        os.replace(tmp_path, path)
+        return path
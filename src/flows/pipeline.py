@@ -0,0 +1,131 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+from pydantic import BaseModel
+
+StageFn = Callable[[Any], Awaitable[Any]]
+
+# Marks the end of the stream as it travels through the stage queues
+_END = object()
+
+
+class StageMetrics(BaseModel):
+    """Occupancy counters for one pipeline stage."""
+
+    name: str
+    processed: int = 0
+    busy_seconds: float = 0.0  # inside the stage function
+    idle_seconds: float = 0.0  # waiting for input from the previous stage
+    blocked_seconds: float = 0.0  # waiting for room in the next stage's queue
+    max_queue_depth: int = 0
+
+    def occupancy(self, wall_seconds: float) -> float:
+        return self.busy_seconds / wall_seconds if wall_seconds > 0 else 0.0
+
+
+class StagePipeline:
+    """
+    Runs items through a fixed sequence of async stages with one worker per stage
+    and bounded queues in between, so different items can occupy different stages
+    at the same time (item k+1 in stage 1 while item k is in stage 3).
+
+    Items are pulled from `source` (which may grow while the pipeline runs, e.g.
+    when completing an item enqueues its children). The pipeline stops once the
+    source is empty and nothing is in flight.
+    """
+
+    def __init__(self, stages: List[Tuple[str, StageFn]], queue_size: int = 2):
+        if not stages:
+            raise ValueError("StagePipeline requires at least one stage")
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.metrics: Dict[str, StageMetrics] = {
+            name: StageMetrics(name=name) for name, _ in stages
+        }
+        self.wall_seconds = 0.0
+        self._in_flight = 0
+        self._progress: Optional[asyncio.Event] = None
+
+    async def run(
+        self,
+        source: Deque[Any],
+        make_item: Callable[[Any], Any],
+        on_complete: Callable[[Any], None],
+    ) -> Dict[str, StageMetrics]:
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        done_queue: asyncio.Queue = asyncio.Queue()
+        self._progress = asyncio.Event()
+        self._in_flight = 0
+
+        started = time.perf_counter()
+        async with asyncio.TaskGroup() as group:
+            group.create_task(self._feed(source, make_item, queues[0]))
+            for idx, (name, fn) in enumerate(self.stages):
+                out_queue = queues[idx + 1] if idx + 1 < len(queues) else done_queue
+                group.create_task(self._work(name, fn, queues[idx], out_queue))
+            group.create_task(self._drain(done_queue, on_complete))
+        self.wall_seconds = time.perf_counter() - started
+
+        return self.metrics
+
+    async def _feed(self, source, make_item, first_queue: asyncio.Queue) -> None:
+        while True:
+            if source:
+                self._in_flight += 1
+                await first_queue.put(make_item(source.popleft()))
+            elif self._in_flight == 0:
+                await first_queue.put(_END)
+                return
+            else:
+                # Wait for an in-flight item to complete (and maybe refill the source)
+                self._progress.clear()
+                await self._progress.wait()
+
+    async def _work(
+        self, name: str, fn: StageFn, in_queue: asyncio.Queue, out_queue: asyncio.Queue
+    ) -> None:
+        metrics = self.metrics[name]
+        while True:
+            waited = time.perf_counter()
+            item = await in_queue.get()
+            metrics.idle_seconds += time.perf_counter() - waited
+            metrics.max_queue_depth = max(metrics.max_queue_depth, in_queue.qsize() + 1)
+
+            if item is _END:
+                await out_queue.put(_END)
+                return
+
+            began = time.perf_counter()
+            await fn(item)
+            metrics.busy_seconds += time.perf_counter() - began
+            metrics.processed += 1
+
+            blocked = time.perf_counter()
+            await out_queue.put(item)
+            metrics.blocked_seconds += time.perf_counter() - blocked
+
+    async def _drain(self, done_queue: asyncio.Queue, on_complete) -> None:
+        while True:
+            item = await done_queue.get()
+            if item is _END:
+                return
+            on_complete(item)
+            self._in_flight -= 1
+            self._progress.set()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-stage metrics plus occupancy (busy time / pipeline wall time)."""
+        report = {}
+        for name, metrics in self.metrics.items():
+            entry = metrics.model_dump(exclude={"name"})
+            entry["occupancy"] = round(metrics.occupancy(self.wall_seconds), 4)
+            report[name] = entry
+        return report
+
+    def bottleneck(self) -> Optional[str]:
+        """Name of the stage with the highest occupancy."""
+        if not self.wall_seconds:
+            return None
+        return max(
+            self.metrics.values(), key=lambda m: m.occupancy(self.wall_seconds)
+        ).name
@@ -0,0 +1,349 @@
+import glob
+import json
+import os
+import queue
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from src.enums.work_status_enum import WorkStatus
+from src.generic.node import Node
+from src.state.node_context import NodeContext
+from src.flows.artifact_writer import ARTIFACTS_DIR, artifact_record
+
+INDEX_FILE = "plan.sqlite"
+
+# Commits at least this often while records keep arriving
+_MAX_BATCH = 256
+_CLOSE = object()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    id TEXT PRIMARY KEY,
+    parent_id TEXT,
+    path TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    title TEXT,
+    description TEXT,
+    created_at TEXT,
+    finished_at TEXT,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    llm_cost REAL NOT NULL DEFAULT 0,
+    score REAL,
+    -- Designs reviewed and approved (NULL until the reviewer's decisions are known)
+    designs_reviewed INTEGER,
+    designs_approved INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS nodes_parent ON nodes (parent_id);
+CREATE INDEX IF NOT EXISTS nodes_path ON nodes (path);
+CREATE INDEX IF NOT EXISTS nodes_level_path ON nodes (level, path);
+CREATE INDEX IF NOT EXISTS nodes_status_level ON nodes (status, level);
+CREATE INDEX IF NOT EXISTS nodes_review ON nodes (designs_approved)
+    WHERE designs_reviewed > 0;
+
+CREATE TABLE IF NOT EXISTS components (
+    node_id TEXT NOT NULL,
+    -- Index of the design among the node's designer outputs
+    design INTEGER NOT NULL,
+    designer TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT,
+    relevant_details TEXT,
+    -- The reviewer's verdict on the design the component belongs to
+    approved INTEGER,
+    PRIMARY KEY (node_id, design, position)
+);
+CREATE INDEX IF NOT EXISTS components_name ON components (name);
+"""
+
+_NODE_COLUMNS = (
+    "id",
+    "parent_id",
+    "path",
+    "level",
+    "status",
+    "title",
+    "description",
+    "created_at",
+    "finished_at",
+    "prompt_tokens",
+    "completion_tokens",
+    "llm_cost",
+    "score",
+    "designs_reviewed",
+    "designs_approved",
+    "error",
+)
+
+# Columns a record may leave out (pending children have no usage yet)
+_ROW_DEFAULTS = {"prompt_tokens": 0, "completion_tokens": 0, "llm_cost": 0.0}
+
+_UPSERT_NODE = (
+    f"INSERT INTO nodes ({', '.join(_NODE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _NODE_COLUMNS)}) "
+    "ON CONFLICT (id) DO UPDATE SET "
+    + ", ".join(f"{c} = excluded.{c}" for c in _NODE_COLUMNS if c != "id")
+)
+
+
+class PlanIndexPolicy(BaseModel):
+    """
+    SQLite index of the plan tree (the `plan_index` config block).
+
+      - path: database file; empty for <output_path>/plan.sqlite
+    """
+
+    enabled: bool = True
+    path: str = ""
+
+
+def pending_record(child: Node) -> Dict[str, Any]:
+    """Index record for a queued child: position and text only, no stage outputs yet."""
+    return {
+        "node_id": str(child.id),
+        "parent_id": str(child.parent.id) if child.parent else None,
+        "path": child.path,
+        "level": child.level,
+        "status": child.status.value,
+        "title": child.title,
+        "description": child.description,
+        "created_at": child.created_at.isoformat() if child.created_at else None,
+        "score": child.score,
+    }
+
+
+def prefix_range(path: str, sep: str = "->") -> Tuple[str, str]:
+    """
+    [low, high) bounds of the paths strictly below `path`, so a subtree query is
+    an index range scan rather than a LIKE over the whole table.
+    """
+    low = f"{path}{sep}"
+    return low, low[:-1] + chr(ord(low[-1]) + 1)
+
+
+def read_artifacts(output_path: str) -> Iterator[Dict[str, Any]]:
+    """Records of a run's artifact shards (see artifact_writer.py), level by level."""
+    shards = glob.glob(os.path.join(output_path, ARTIFACTS_DIR, "level_*.jsonl"))
+    for shard in sorted(shards, key=lambda p: int(p.rsplit("_", 1)[1].split(".")[0])):
+        with open(shard, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-write
+                    break
+
+
+class PlanIndex:
+    """
+    SQLite database of the plan tree: one `nodes` row per node (ids, path, level,
+    status, text, timings, tokens, review counts) and one `components` row per
+    designer component, with indexes for subtree, level, status and review queries.
+
+    Rows are upserted incrementally: submit() is called as each node is finalized
+    (and its children are queued as pending), and a daemon thread applies the
+    records, committing once per batch of whatever has queued up. Stage methods
+    never wait on the database. Queries run on their own connection.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.nodes_upserted = 0
+        self.components_upserted = 0
+        self.commits = 0
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        conn = sqlite3.connect(self.path)
+        conn.executescript(SCHEMA)
+        conn.close()
+        self._thread = threading.Thread(
+            target=self._run, name="plan-index", daemon=True
+        )
+        self._thread.start()
+
+    @classmethod
+    def for_run(cls, policy: PlanIndexPolicy, output_path: str) -> "PlanIndex":
+        return cls(policy.path or os.path.join(output_path, INDEX_FILE))
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def submit(self, item: Node, ctx: Optional[NodeContext] = None) -> None:
+        """Queues a finalized node and its (pending) children for upsert."""
+        self._queue.put(artifact_record(item, ctx))
+        for child in item.children:
+            self._queue.put(pending_record(child))
+
+    def submit_record(self, record: Dict[str, Any]) -> None:
+        self._queue.put(record)
+
+    def close(self) -> None:
+        """Applies everything submitted so far and stops the thread."""
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_CLOSE)
+        self._thread.join()
+
+    def _run(self) -> None:
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < _MAX_BATCH:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                closing = batch[-1] is _CLOSE
+                records = [r for r in batch if r is not _CLOSE]
+                if records:
+                    with conn:
+                        nodes, components = self._apply(conn, records)
+                    with self._lock:
+                        self.nodes_upserted += nodes
+                        self.components_upserted += components
+                        self.commits += 1
+                if closing:
+                    return
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _apply(conn: sqlite3.Connection, records: Iterable[Dict[str, Any]]) -> Tuple[int, int]:
+        nodes = components = 0
+        for record in records:
+            decisions = record.get("reviewer_decisions")
+            verdicts = {d["agent_name"]: d["is_approved"] for d in decisions or []}
+            row = dict(_ROW_DEFAULTS, **{k: v for k, v in record.items() if v is not None})
+            row["id"] = record["node_id"]
+            if decisions:
+                row["designs_reviewed"] = len(verdicts)
+                row["designs_approved"] = sum(1 for v in verdicts.values() if v)
+            conn.execute(_UPSERT_NODE, [row.get(c) for c in _NODE_COLUMNS])
+            nodes += 1
+
+            designs = record.get("designer_outputs")
+            if designs is None:
+                continue
+            conn.execute("DELETE FROM components WHERE node_id = ?", (row["id"],))
+            for design_index, design in enumerate(designs):
+                if not isinstance(design, dict):
+                    continue
+                designer = design.get("agent_name") or "unknown"
+                approved = verdicts.get(designer)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO components VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            row["id"],
+                            design_index,
+                            designer,
+                            position,
+                            component.get("name"),
+                            component.get("description"),
+                            json.dumps(component.get("relevant_details")),
+                            None if approved is None else int(approved),
+                        )
+                        for position, component in enumerate(design.get("components") or [])
+                    ],
+                )
+                components += len(design.get("components") or [])
+        return nodes, components
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "path": self.path,
+                "nodes_upserted": self.nodes_upserted,
+                "components_upserted": self.components_upserted,
+                "commits": self.commits,
+            }
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _query(self, sql: str, params: Iterable[Any] = ()) -> List[Dict[str, Any]]:
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        try:
+            return [dict(row) for row in conn.execute(sql, tuple(params))]
+        finally:
+            conn.close()
+
+    def node(self, node_id: Any) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT * FROM nodes WHERE id = ?", (str(node_id),))
+        return rows[0] if rows else None
+
+    def descendants(
+        self, path: str, level: Optional[int] = None, sep: str = "->"
+    ) -> List[Dict[str, Any]]:
+        """Nodes below `path` (optionally only those at `level`), e.g. all atomic tasks under a zone."""
+        low, high = prefix_range(path, sep)
+        if level is None:
+            return self._query(
+                "SELECT * FROM nodes WHERE path >= ? AND path < ? ORDER BY path",
+                (low, high),
+            )
+        return self._query(
+            "SELECT * FROM nodes WHERE level = ? AND path >= ? AND path < ? ORDER BY path",
+            (level, low, high),
+        )
+
+    def by_status(self, status: WorkStatus, level: Optional[int] = None) -> List[Dict[str, Any]]:
+        if level is None:
+            return self._query(
+                "SELECT * FROM nodes WHERE status = ? ORDER BY path", (status.value,)
+            )
+        return self._query(
+            "SELECT * FROM nodes WHERE status = ? AND level = ? ORDER BY path",
+            (status.value, level),
+        )
+
+    def failed_review(self) -> List[Dict[str, Any]]:
+        """Nodes whose reviewer stage failed, or whose reviewed designs were all disapproved."""
+        return self._query(
+            "SELECT * FROM nodes WHERE designs_reviewed > 0 AND designs_approved = 0 "
+            "UNION SELECT * FROM nodes WHERE status = ? AND error LIKE 'Reviewer:%' "
+            "ORDER BY path",
+            (WorkStatus.FAILED.value,),
+        )
+
+    def components(self, node_id: Any) -> List[Dict[str, Any]]:
+        return self._query(
+            "SELECT * FROM components WHERE node_id = ? ORDER BY design, position",
+            (str(node_id),),
+        )
+
+
+def export_run(output_path: str, path: str = "") -> PlanIndex:
+    """
+    Builds (or refreshes) the index of a finished run from its artifact shards:
+        python main.py --export-sqlite <output_path>
+    """
+    index = PlanIndex(path or os.path.join(output_path, INDEX_FILE))
+    for record in read_artifacts(output_path):
+        index.submit_record(record)
+        for child in record.get("children") or []:
+            # Children that never ran (budget, interrupted run) stay pending
+            index.submit_record(
+                {
+                    "node_id": child["id"],
+                    "parent_id": record["node_id"],
+                    "path": child["path"],
+                    "level": record["level"] + 1,
+                    "status": WorkStatus.PENDING.value,
+                    "title": child["title"],
+                }
+            )
+    index.close()
+    return index
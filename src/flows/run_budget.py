@@ -0,0 +1,185 @@
+import json
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from src.generic.token_usage import TokenUsage
+
+BUDGET_FILE = "budget_report.json"
+
+# Consumption phases, from a fresh budget to a spent one
+NORMAL, REDUCED, MINIMAL, EXHAUSTED = "normal", "reduced", "minimal", "exhausted"
+
+DESIGNER_VARIANTS = ["creative", "balanced", "conservative"]
+
+
+class RunBudget(BaseModel):
+    """
+    Limits of one run (the `budget` config block); None means unlimited.
+
+    The remaining share of the tightest budget (calls, tokens, deadline) sets the phase:
+      - normal:    full branching and all designer variants
+      - reduced:   <= reduce_at left: half the children per node, reduced_designers only
+      - minimal:   <= minimal_at left: one child per node, minimal_designers only
+      - exhausted: nothing left: no more children, queued nodes are not expanded
+    max_nodes_per_level caps the nodes created per tree level ({level: count}).
+    """
+
+    max_llm_calls: Optional[int] = None
+    max_tokens: Optional[int] = None
+    deadline_seconds: Optional[float] = None
+    max_nodes_per_level: Dict[int, int] = Field(default_factory=dict)
+    reduce_at: float = 0.5
+    minimal_at: float = 0.2
+    reduced_designers: List[str] = Field(default_factory=lambda: ["balanced", "conservative"])
+    minimal_designers: List[str] = Field(default_factory=lambda: ["balanced"])
+
+    @property
+    def limited(self) -> bool:
+        return any(
+            limit is not None
+            for limit in (self.max_llm_calls, self.max_tokens, self.deadline_seconds)
+        ) or bool(self.max_nodes_per_level)
+
+
+class BudgetController:
+    """
+    Tracks a run's consumption against its RunBudget and tells the flow how much
+    to expand: children per node, designer variants, and whether to go on at all.
+    """
+
+    def __init__(self, budget: RunBudget, clock=time.monotonic):
+        self.budget = budget
+        self._clock = clock
+        self.started = clock()
+        self.llm_calls = 0
+        self.tokens = 0
+        self.nodes_per_level: Dict[int, int] = {}
+        self.children_cut = 0
+        self.designers_skipped = 0
+        self.nodes_unexpanded: List[Dict[str, Any]] = []
+        # (elapsed seconds, phase) each time the phase changed
+        self.transitions: List[List[Any]] = []
+        self._phase = NORMAL
+        self._lock = threading.Lock()
+
+    def elapsed(self) -> float:
+        return self._clock() - self.started
+
+    def charge(self, usage: TokenUsage) -> None:
+        """Adds one kickoff's usage (requests, or the kickoff itself on fakes without usage)."""
+        with self._lock:
+            self.llm_calls += usage.requests or usage.kickoffs
+            self.tokens += usage.total_tokens
+
+    def remaining(self) -> float:
+        """Share (0..1) left of the tightest of the call, token and deadline budgets."""
+        shares = [1.0]
+        budget = self.budget
+        if budget.max_llm_calls is not None:
+            shares.append(1 - self.llm_calls / max(1, budget.max_llm_calls))
+        if budget.max_tokens is not None:
+            shares.append(1 - self.tokens / max(1, budget.max_tokens))
+        if budget.deadline_seconds is not None:
+            shares.append(1 - self.elapsed() / max(1e-9, budget.deadline_seconds))
+        return max(0.0, min(shares))
+
+    def phase(self) -> str:
+        left = self.remaining()
+        if left <= 0:
+            phase = EXHAUSTED
+        elif left <= self.budget.minimal_at:
+            phase = MINIMAL
+        elif left <= self.budget.reduce_at:
+            phase = REDUCED
+        else:
+            phase = NORMAL
+        with self._lock:
+            if phase != self._phase:
+                self._phase = phase
+                self.transitions.append([round(self.elapsed(), 3), phase])
+                print(f"Budget phase: {phase} ({left:.0%} left, {self.summary()})")
+        return phase
+
+    def exhausted(self) -> bool:
+        return self.phase() == EXHAUSTED
+
+    def designer_variants(self) -> List[str]:
+        """Designer variants to run for the next node, in DESIGNER_VARIANTS order."""
+        phase = self.phase()
+        if phase == REDUCED:
+            wanted = set(self.budget.reduced_designers)
+        elif phase in (MINIMAL, EXHAUSTED):
+            wanted = set(self.budget.minimal_designers)
+        else:
+            return list(DESIGNER_VARIANTS)
+        variants = [v for v in DESIGNER_VARIANTS if v in wanted] or ["balanced"]
+        with self._lock:
+            self.designers_skipped += len(DESIGNER_VARIANTS) - len(variants)
+        return variants
+
+    def count_node(self, level: int) -> None:
+        with self._lock:
+            self.nodes_per_level[level] = self.nodes_per_level.get(level, 0) + 1
+
+    def children_allowed(self, child_level: int, wanted: int) -> int:
+        """How many of `wanted` children may be created at `child_level`; reserves them."""
+        phase = self.phase()
+        allowed = wanted
+        if phase == REDUCED:
+            allowed = math.ceil(wanted / 2)
+        elif phase == MINIMAL:
+            allowed = min(wanted, 1)
+        elif phase == EXHAUSTED:
+            allowed = 0
+        with self._lock:
+            cap = self.budget.max_nodes_per_level.get(child_level)
+            if cap is not None:
+                allowed = min(allowed, max(0, cap - self.nodes_per_level.get(child_level, 0)))
+            self.nodes_per_level[child_level] = self.nodes_per_level.get(child_level, 0) + allowed
+            self.children_cut += wanted - allowed
+        return allowed
+
+    def record_unexpanded(self, node) -> None:
+        with self._lock:
+            self.nodes_unexpanded.append(
+                {"id": str(node.id), "path": node.path, "level": node.level, "title": node.title}
+            )
+
+    def summary(self) -> str:
+        budget = self.budget
+        return (
+            f"{self.llm_calls}/{budget.max_llm_calls or '-'} calls, "
+            f"{self.tokens}/{budget.max_tokens or '-'} tokens, "
+            f"{self.elapsed():.1f}/{budget.deadline_seconds or '-'}s"
+        )
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "budget": self.budget.model_dump(),
+                "consumed": {
+                    "llm_calls": self.llm_calls,
+                    "tokens": self.tokens,
+                    "elapsed_seconds": round(self.elapsed(), 3),
+                },
+                "phase": self._phase,
+                "transitions": list(self.transitions),
+                "nodes_per_level": {str(k): v for k, v in sorted(self.nodes_per_level.items())},
+                "children_cut": self.children_cut,
+                "designers_skipped": self.designers_skipped,
+                "nodes_unexpanded": list(self.nodes_unexpanded),
+            }
+
+    def write(self, output_path: str) -> str:
+        """Writes the report to <output_path>/budget_report.json (atomically replaced)."""
+        path = os.path.join(output_path, BUDGET_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        os.replace(tmp_path, path)
+        return path
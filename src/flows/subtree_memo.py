@@ -0,0 +1,324 @@
+import glob
+import hashlib
+import json
+import os
+import queue
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from src.enums.work_status_enum import WorkStatus
+from src.flows.expansion_policy import ChildSpec
+from src.generic.node import Node
+from src.llm_completion.designer_completion import DesignerCompletionJson
+from src.llm_completion.manager_completion import ManagerCompletion
+from src.llm_completion.output_parser import StructuredOutputError, parse_reviewer_output
+from src.state.checkpoint_journal import _dump, _raw_text
+from src.state.node_context import NodeContext
+
+MEMO_FILE = "subtree_memo.jsonl"
+CREWS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "crews")
+
+_CLOSE = object()
+
+
+class SubtreeMemoPolicy(BaseModel):
+    """
+    Reuse of subtrees expanded by earlier runs (the `subtree_memo` config block).
+    Opt-in: a graft reuses the recorded LLM outputs.
+
+      - path: memo file shared by the runs; empty for <save_folder>/subtree_memo.jsonl
+    """
+
+    enabled: bool = False
+    path: str = ""
+
+
+def _digest(*parts: Any) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(json.dumps(part, sort_keys=True, default=str).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def prompts_digest(crews_dir: str = CREWS_DIR) -> str:
+    """Hash of every crew's config/tasks.yaml and config/agents.yaml (the prompts the crews are built from)."""
+    h = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(crews_dir, "*", "config", "*.yaml"))):
+        h.update(os.path.relpath(path, crews_dir).encode("utf-8") + b"\0")
+        with open(path, "rb") as f:
+            h.update(f.read())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class SubtreeMemo:
+    """
+    Content-addressed store of expanded nodes, shared by the runs in save_folder,
+    so a new run grafts the parts of the tree whose inputs did not change instead
+    of re-expanding them with fresh LLM calls.
+
+    Each node's key hashes its inputs, Merkle-style:
+      - lineage: hash of the parent's lineage, the node's level, type, title and
+        description (so a node's key covers its whole ancestor context)
+      - the project vision, for the root only: sub-nodes are decomposed from their
+        own title/description, so a new vision re-expands the root, and each zone
+        it proposes again with the same title/description grafts its subtree
+      - settings: the crew prompts (config/tasks.yaml, agents.yaml), the crews'
+        llm_type, the branching policy and the depth limit
+
+    A record holds the node's stage outputs and the children it was expanded
+    into. A graft restores them into a resumed NodeContext (every stage is then
+    skipped, as with --resume) and re-creates the children, which are looked up
+    by their own keys when they are dequeued: an unchanged subtree is grafted
+    node by node without a single LLM call, and only nodes whose inputs changed
+    (and their descendants) are expanded again.
+
+    Records are appended to the memo file by a daemon writer thread; close()
+    writes out the rest. Keys and lineages are cached per node only while they
+    are needed: a node's key until it is finished, its lineage until each of its
+    children has been keyed.
+    """
+
+    def __init__(self, path: str, settings: Dict[str, Any]):
+        self.path = path
+        self.settings_digest = _digest(prompts_digest(), settings)
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._lineage: Dict[str, str] = {}
+        self._keys: Dict[str, str] = {}
+        # Children not yet keyed, per finished node whose lineage is still cached
+        self._pending_children: Dict[str, int] = {}
+        self._grafted: set = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.tokens_saved = 0
+        if os.path.exists(path):
+            self._load()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="subtree-memo-writer", daemon=True
+        )
+        self._thread.start()
+
+    @classmethod
+    def for_run(
+        cls, policy: SubtreeMemoPolicy, save_folder: str, settings: Dict[str, Any]
+    ) -> "SubtreeMemo":
+        return cls(policy.path or os.path.join(save_folder, MEMO_FILE), settings)
+
+    def _load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-write
+                    break
+                # Later runs replace earlier records for the same inputs
+                self._records[record["key"]] = record
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    def _lineage_of(self, item: Node) -> str:
+        """
+        Hash of the node's ancestor context. Cached per node when it is first keyed
+        (as it is dequeued), before bounded memory mode strips finished nodes' text.
+        """
+        node_id = str(item.id)
+        lineage = self._lineage.get(node_id)
+        if lineage is None:
+            lineage = _digest(
+                self._lineage_of(item.parent) if item.parent else "",
+                item.level,
+                item.get_title_for_level(item.level),
+                item.title,
+                item.description,
+            )
+            with self._lock:
+                self._lineage[node_id] = lineage
+                if item.parent is not None:
+                    self._child_keyed(str(item.parent.id))
+        return lineage
+
+    def _child_keyed(self, parent_id: str) -> None:
+        """Evicts a finished parent's lineage once its last child is keyed (lock held)."""
+        pending = self._pending_children.get(parent_id)
+        if pending is None:
+            return
+        if pending > 1:
+            self._pending_children[parent_id] = pending - 1
+        else:
+            del self._pending_children[parent_id]
+            self._lineage.pop(parent_id, None)
+
+    def key_for(self, item: Node, vision: str) -> str:
+        """Input hash of `item`."""
+        node_id = str(item.id)
+        key = self._keys.get(node_id)
+        if key is None:
+            key = _digest(
+                self.settings_digest,
+                self._lineage_of(item),
+                vision if item.parent is None else None,
+            )
+            with self._lock:
+                self._keys[node_id] = key
+        return key
+
+    def resumed(self, visited: Iterable[Node]) -> None:
+        """
+        Keys the nodes a resumed run had already finished (CheckpointJournal.load's
+        visited_queue, in the order they finished) as if they had been finalized
+        in this run: call before bounded memory mode releases them, so queued
+        children are keyed from their parents' full text.
+        """
+        for item in visited:
+            self._lineage_of(item)
+            self.finished(item)
+
+    # ------------------------------------------------------------------
+    # Lookup / graft
+    # ------------------------------------------------------------------
+
+    def graft(
+        self, item: Node, vision: str
+    ) -> Optional[Tuple[NodeContext, List[ChildSpec]]]:
+        """
+        Restores `item` from a matching record: its stage outputs in a resumed
+        context (status WRITING) and the children it was expanded into, for the
+        caller to create. None when nothing matches.
+        """
+        record = self._records.get(self.key_for(item, vision))
+        if record is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        children = record.get("children") or []
+        if children and item.depth_limit is not None and item.level >= item.depth_limit:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        ctx = NodeContext(item=item, resumed=True)
+        ctx.manager_output = ManagerCompletion(**record["manager_output"])
+        ctx.designer_outputs = [DesignerCompletionJson(**o) for o in record["designer_outputs"]]
+        ctx.reviewer_output = record.get("reviewer_output")
+        try:
+            ctx.reviewer_decisions = parse_reviewer_output(ctx.reviewer_output or "")
+        except StructuredOutputError:
+            ctx.reviewer_decisions = []
+        ctx.writer_output = record.get("writer_output")
+        item.status = WorkStatus.WRITING
+
+        with self._lock:
+            self.hits += 1
+            self.tokens_saved += record.get("prompt_tokens", 0) + record.get(
+                "completion_tokens", 0
+            )
+            self._grafted.add(str(item.id))
+        return ctx, [ChildSpec(**child) for child in children]
+
+    # ------------------------------------------------------------------
+    # Storing
+    # ------------------------------------------------------------------
+
+    def store(self, ctx: NodeContext, vision: str) -> bool:
+        """
+        Records a finished node (call before its children are released). Nodes that
+        were grafted, or lack stage outputs (resumed past them), are not recorded.
+        """
+        item = ctx.item
+        if str(item.id) in self._grafted:
+            with self._lock:
+                self._grafted.discard(str(item.id))
+            return False
+        if ctx.manager_output is None or not ctx.designer_outputs:
+            return False
+
+        key = self.key_for(item, vision)
+        record = {
+            "key": key,
+            "level": item.level,
+            "title": item.title,
+            "manager_output": _dump(ctx.manager_output),
+            "designer_outputs": [_dump(o) for o in ctx.designer_outputs],
+            "reviewer_output": _raw_text(ctx.reviewer_output),
+            "writer_output": _raw_text(ctx.writer_output),
+            "children": [
+                {"title": c.title, "description": c.description, "score": c.score or 0.0}
+                for c in item.children
+            ],
+            "prompt_tokens": item.prompt_tokens,
+            "completion_tokens": item.completion_tokens,
+        }
+        with self._lock:
+            self._records[key] = record
+            self.stored += 1
+        self._queue.put(record)
+        return True
+
+    def finished(self, item: Node) -> None:
+        """
+        Drops the cached key of a finalized node (call before its children are
+        enqueued); its lineage stays cached until each of its children is keyed.
+        """
+        node_id = str(item.id)
+        with self._lock:
+            self._keys.pop(node_id, None)
+            self._grafted.discard(node_id)
+            if item.children:
+                self._pending_children[node_id] = len(item.children)
+            else:
+                self._lineage.pop(node_id, None)
+
+    def _run(self) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                batch = [self._queue.get()]
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                lines = [
+                    json.dumps(record, ensure_ascii=False) + "\n"
+                    for record in batch
+                    if record is not _CLOSE
+                ]
+                if lines:
+                    f.write("".join(lines))
+                    # Flushed, not fsync'ed: a lost record only means a node is expanded again
+                    f.flush()
+                if _CLOSE in batch:
+                    return
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "path": self.path,
+                "records": len(self._records),
+                "hits": self.hits,
+                "misses": self.misses,
+                "stored": self.stored,
+                "tokens_saved": self.tokens_saved,
+                "cached_keys": len(self._keys),
+                "cached_lineages": len(self._lineage),
+            }
+
+    def close(self) -> None:
+        """Writes out every stored record, then stops the writer thread."""
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_CLOSE)
+        self._thread.join()
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, timezone
-from typing import Optional, List, Dict, Union
+from typing import Optional, List, Dict, NamedTuple, Union
 from pydantic import BaseModel, Field, model_validator, PrivateAttr
 from ..enums.work_status_enum import WorkStatus
 
@@ -10,6 +10,21 @@ def utcnow():
 LevelTitleInput = Union[List[str], Dict[int, str]]
 LevelStatusInput = Union[List[WorkStatus], Dict[int, WorkStatus]]
 
+
+class LevelConfig(NamedTuple):
+    """
+    A tree's depth limit and per-level defaults, as validated and normalized on its
+    root. Node.add_child/add_children hand these same objects to every child, so a
+    tree holds one copy of its level configuration rather than one per node.
+    """
+
+    depth_limit: Optional[int]
+    level_titles: Optional[LevelTitleInput]
+    level_statuses: Optional[LevelStatusInput]
+    level_titles_map: Dict[int, str]
+    level_statuses_map: Dict[int, WorkStatus]
+
+
 class BaseSchema(BaseModel):
     #model_config = {"frozen": True}
     
@@ -86,6 +101,16 @@ class BaseSchema(BaseModel):
 
         return self
 
+    @property
+    def level_config(self) -> LevelConfig:
+        return LevelConfig(
+            self.depth_limit,
+            self.level_titles,
+            self.level_statuses,
+            self.level_titles_map,
+            self.level_statuses_map,
+        )
+
     # Helper getters for children to use
     def get_title_for_level(self, level: int) -> Optional[str]:
         return self.level_titles_map.get(level)
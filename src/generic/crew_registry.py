@@ -0,0 +1,146 @@
+import copy
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import yaml
+from crewai import BaseLLM
+
+# Process-wide registry configured from flow_config.yaml (see configure_crew_registry)
+_active_registry: Optional["CrewRegistry"] = None
+
+# Registry entry for providers that can't be copied (see can_copy_llm)
+_NOT_SHARED = object()
+
+
+class CrewRegistry:
+    """
+    Per-run cache of what every node's crews would otherwise rebuild.
+
+      - provider LLMs: one crewai LLM per configuration (deployment, endpoint,
+        temperature, ...). Nodes get a shallow copy that shares the template's
+        HTTP clients (and so their connection pools) but has its own token
+        counters, since crews report usage from their agents' LLM instances.
+        Only the provider LLM and the parsed YAML are shared: agents, tasks and
+        crews are still built per node.
+      - crew configs: agents.yaml/tasks.yaml parsed once per file version;
+        CrewBase gets a deep copy, as it resolves agents/LLMs into the dicts.
+    """
+
+    def __init__(self):
+        self._providers: Dict[Hashable, Any] = {}
+        self._yaml: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.provider_builds = 0
+        self.provider_reuses = 0
+        self.yaml_parses = 0
+        self.yaml_reuses = 0
+
+    def provider_llm(self, key: Hashable, build: Callable[[], BaseLLM]) -> BaseLLM:
+        """
+        Per-node LLM for `key`, copied from the template built by `build` on first
+        use; built anew each time when the template's usage counters can't be reset.
+        """
+        with self._lock:
+            template = self._providers.get(key)
+            if template is None:
+                built = build()
+                self.provider_builds += 1
+                if can_copy_llm(built):
+                    self._providers[key] = built
+                    return fresh_llm_copy(built)
+                print(
+                    f"Crew registry: {type(built).__name__} has no per-instance "
+                    "usage counters to reset; building it per node"
+                )
+                self._providers[key] = _NOT_SHARED
+                return built
+            if template is not _NOT_SHARED:
+                self.provider_reuses += 1
+                return fresh_llm_copy(template)
+            self.provider_builds += 1
+        return build()
+
+    def load_yaml(self, path) -> Dict[str, Any]:
+        path = str(path)
+        key = (path, os.stat(path).st_mtime_ns)
+        with self._lock:
+            parsed = self._yaml.get(key)
+            if parsed is None:
+                parsed = _parse_yaml(path)
+                self._yaml[key] = parsed
+                self.yaml_parses += 1
+            else:
+                self.yaml_reuses += 1
+        return copy.deepcopy(parsed)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "provider_llms": len(self._providers),
+            "provider_builds": self.provider_builds,
+            "provider_reuses": self.provider_reuses,
+            "yaml_parses": self.yaml_parses,
+            "yaml_reuses": self.yaml_reuses,
+        }
+
+
+def _parse_yaml(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        content = yaml.safe_load(f)
+    return content if isinstance(content, dict) else {}
+
+
+def can_copy_llm(template: BaseLLM) -> bool:
+    """
+    Whether fresh_llm_copy can give `template` a copy with its own usage: crewai
+    keeps the counters in the private `_token_usage` dict, which a shallow copy
+    would otherwise share.
+    """
+    return isinstance(getattr(template, "_token_usage", None), dict)
+
+
+def fresh_llm_copy(template: BaseLLM) -> BaseLLM:
+    """
+    Shallow copy of `template` (pydantic's model_copy: validators don't run, so
+    no new clients) with zeroed usage. Check can_copy_llm first.
+    """
+    llm = template.model_copy()
+    llm.stop = list(template.stop or [])
+    llm._token_usage = {key: 0 for key in template._token_usage}
+    return llm
+
+
+def configure_crew_registry(config: Dict[str, Any]) -> Optional[CrewRegistry]:
+    """Sets up (or disables) the process-wide registry from the `crew_registry` config block."""
+    global _active_registry
+    _active_registry = CrewRegistry() if config.get("enabled", False) else None
+    if _active_registry is not None:
+        print("Crew registry enabled (shared provider LLMs and crew configs)")
+    return _active_registry
+
+
+def get_crew_registry() -> Optional[CrewRegistry]:
+    return _active_registry
+
+
+def registry_llm(key: Hashable, build: Callable[[], BaseLLM]) -> BaseLLM:
+    """`build()` when the registry is off, otherwise a per-node copy of the shared LLM."""
+    if _active_registry is None:
+        return build()
+    return _active_registry.provider_llm(key, build)
+
+
+def load_crew_yaml(path) -> Dict[str, Any]:
+    if _active_registry is None:
+        return _parse_yaml(str(path))
+    return _active_registry.load_yaml(path)
+
+
+def cached_crew_configs(cls):
+    """
+    Class decorator (applied outside @CrewBase) routing the crew's agents.yaml/
+    tasks.yaml loading through the registry. CrewBase injects its own load_yaml
+    when the class is created, so it can only be replaced afterwards.
+    """
+    cls.load_yaml = staticmethod(load_crew_yaml)
+    return cls
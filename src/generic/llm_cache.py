@@ -0,0 +1,259 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from crewai import BaseLLM
+
+# Process-wide cache configured from flow_config.yaml (see configure_llm_cache)
+_active_cache: Optional["LLMResponseCache"] = None
+_disabled_crews: set = set()
+
+
+def normalize_messages(messages: Union[str, List[Dict[str, Any]]]) -> List[Dict[str, str]]:
+    """Reduces messages to role/content pairs with trimmed content, so cosmetic differences hash equally."""
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+    normalized = []
+    for message in messages:
+        content = message.get("content", "")
+        if not isinstance(content, str):
+            content = json.dumps(content, sort_keys=True, default=str)
+        normalized.append({"role": message.get("role", "user"), "content": content.strip()})
+    return normalized
+
+
+class LLMResponseCache:
+    """
+    Content-addressed on-disk store of LLM responses.
+
+      - one JSON file per response under <cache_dir>/<key[:2]>/<key>.json
+      - size-based LRU eviction (least recently read/written files go first)
+      - hit/miss/eviction counters
+      - safe to share between the kickoff worker threads
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # key -> [size_bytes, last_used]
+        self._index: Dict[str, List[float]] = {}
+        self._total_bytes = 0
+        self._last_tick = 0.0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(
+        model: str,
+        deployment: Optional[str],
+        temperature: Optional[float],
+        messages: Union[str, List[Dict[str, Any]]],
+    ) -> str:
+        payload = json.dumps(
+            {
+                "model": model,
+                "deployment": deployment or "",
+                "temperature": temperature,
+                "messages": normalize_messages(messages),
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        # The lock only guards the index: the file is read outside it, so lookups on
+        # other kickoff threads don't queue behind this disk read
+        with self._lock:
+            indexed = self._index.get(key)
+            if indexed is None:
+                self.misses += 1
+                return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            # Removed or corrupted behind our back (or evicted meanwhile); a miss
+            with self._lock:
+                if self._index.get(key) is indexed:
+                    self._forget(key)
+                self.misses += 1
+            return None
+        with self._lock:
+            now = self._tick()
+            if self._index.get(key) is indexed:
+                indexed[1] = now
+            self.hits += 1
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        return entry["response"]
+
+    def put(self, key: str, response: str, meta: Optional[Dict[str, Any]] = None) -> None:
+        data = json.dumps({"response": response, "meta": meta or {}}, ensure_ascii=False)
+        size = len(data.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+            self._forget(key, remove_file=False)
+            self._index[key] = [size, self._tick()]
+            self._total_bytes += size
+            self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._index),
+            "size_bytes": self._total_bytes,
+        }
+
+    def _tick(self) -> float:
+        # Strictly increasing timestamps keep LRU order exact on coarse clocks
+        self._last_tick = max(time.time(), self._last_tick + 1e-6)
+        return self._last_tick
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _load_index(self) -> None:
+        for shard in os.listdir(self.cache_dir):
+            shard_dir = os.path.join(self.cache_dir, shard)
+            if not os.path.isdir(shard_dir):
+                continue
+            for name in os.listdir(shard_dir):
+                if not name.endswith(".json"):
+                    continue
+                stat = os.stat(os.path.join(shard_dir, name))
+                self._index[name[:-5]] = [stat.st_size, stat.st_mtime]
+                self._total_bytes += stat.st_size
+        self._evict()
+
+    def _forget(self, key: str, remove_file: bool = True) -> None:
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[0]
+        if remove_file:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def _evict(self) -> None:
+        if self._total_bytes <= self.max_bytes:
+            return
+        for key, _ in sorted(self._index.items(), key=lambda kv: kv[1][1]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._forget(key)
+            self.evictions += 1
+
+
+class CachingLLM(BaseLLM):
+    """
+    Wraps an LLM and serves repeated prompts from an LLMResponseCache.
+    Only plain text completions are cached; tool-calling requests always go through.
+    """
+
+    def __init__(self, inner: BaseLLM, cache: LLMResponseCache, deployment: str = ""):
+        super().__init__(model=inner.model, temperature=inner.temperature)
+        self.inner = inner
+        self.cache = cache
+        self.deployment = deployment
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Any:
+        if self.stop:
+            self.inner.stop = list(self.stop)
+
+        key = None
+        if not tools:
+            key = LLMResponseCache.make_key(
+                self.model, self.deployment, self.temperature, messages
+            )
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        response = self.inner.call(
+            messages,
+            tools=tools,
+            callbacks=callbacks,
+            available_functions=available_functions,
+            **kwargs,
+        )
+        if key is not None and isinstance(response, str):
+            self.cache.put(
+                key,
+                response,
+                meta={"model": self.model, "deployment": self.deployment},
+            )
+        return response
+
+    def supports_function_calling(self) -> bool:
+        return self.inner.supports_function_calling()
+
+    def supports_stop_words(self) -> bool:
+        return self.inner.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.inner.get_context_window_size()
+
+    def get_token_usage_summary(self):
+        # Crews read usage from the agent's LLM; the provider counts it on the inner one
+        return self.inner.get_token_usage_summary()
+
+
+def configure_llm_cache(config: Dict[str, Any]) -> Optional[LLMResponseCache]:
+    """Sets up (or disables) the process-wide cache from the `llm_cache` config block."""
+    global _active_cache, _disabled_crews
+    if not config.get("enabled", False):
+        _active_cache = None
+        _disabled_crews = set()
+        return None
+
+    max_bytes = int(float(config.get("max_size_mb", 256)) * 1024 * 1024)
+    _active_cache = LLMResponseCache(config.get("path", "output/llm_cache"), max_bytes)
+    _disabled_crews = set(config.get("disabled_crews") or [])
+    print(
+        f"LLM cache enabled at {_active_cache.cache_dir} "
+        f"({len(_active_cache._index)} entries, opted-out crews: {sorted(_disabled_crews)})"
+    )
+    return _active_cache
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    return _active_cache
+
+
+def with_cache(llm: BaseLLM, crew_name: Optional[str], deployment: str = "") -> BaseLLM:
+    """Wraps `llm` in a CachingLLM unless caching is off or the crew opted out."""
+    if _active_cache is None or crew_name in _disabled_crews:
+        return llm
+    return CachingLLM(llm, _active_cache, deployment=deployment)
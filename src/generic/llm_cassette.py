@@ -0,0 +1,285 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import zlib
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+
+from crewai import BaseLLM
+from pydantic import BaseModel
+
+from .llm_cache import normalize_messages
+
+CASSETTE_FILE = "llm_cassette.jsonl.gz"
+ON_MISS_MODES = ("error", "crew", "live")
+
+# Process-wide cassette configured from flow_config.yaml (see configure_cassette)
+_active_cassette: Optional["Cassette"] = None
+
+
+class CassetteMiss(LookupError):
+    """A replayed LLM call with no recorded response (on_miss: error)."""
+
+
+def prompt_hash(messages: Union[str, List[Dict[str, Any]]]) -> str:
+    payload = json.dumps(normalize_messages(messages), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class Cassette:
+    """
+    Recorded LLM traffic of a run: one gzipped JSON line per call with the crew,
+    prompt hash, response and token usage (prompts themselves are not stored).
+
+      - record: appends every call; each line is sync-flushed, so an interrupted
+        run still leaves a readable cassette
+      - replay: serves responses matched by (crew, prompt hash), in recorded order
+        when the same prompt was sent more than once. A prompt that was never
+        recorded is handled per `on_miss`: "error" raises CassetteMiss, "crew"
+        serves that crew's recorded responses in order, "live" calls the real LLM.
+    """
+
+    def __init__(self, path: str, mode: str, on_miss: str = "crew"):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode!r}")
+        if on_miss not in ON_MISS_MODES:
+            raise ValueError(f"llm_cassette.on_miss must be one of {ON_MISS_MODES}")
+        self.path = path
+        self.mode = mode
+        self.on_miss = on_miss
+        self.recorded = 0
+        self.hits = 0
+        self.crew_fallbacks = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._by_prompt: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._by_crew: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._crew_cursor: Dict[str, int] = defaultdict(int)
+
+        if mode == "record":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._file = gzip.open(path, "at", encoding="utf-8")
+        else:
+            for entry in self.load_entries(path):
+                self._by_prompt[(entry["crew"], entry["prompt_hash"])].append(entry)
+                self._by_crew[entry["crew"]].append(entry)
+
+    @staticmethod
+    def load_entries(path: str) -> List[Dict[str, Any]]:
+        """Reads a cassette, keeping everything before a torn or truncated tail."""
+        entries = []
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        break
+        except (EOFError, zlib.error, gzip.BadGzipFile):
+            pass
+        return entries
+
+    def record(
+        self,
+        crew_name: str,
+        messages: Union[str, List[Dict[str, Any]]],
+        response: str,
+        model: str,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+    ) -> None:
+        line = json.dumps(
+            {
+                "crew": crew_name,
+                "prompt_hash": prompt_hash(messages),
+                "model": model,
+                "response": response,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+            },
+            ensure_ascii=False,
+        )
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.recorded += 1
+
+    def lookup(
+        self, crew_name: str, messages: Union[str, List[Dict[str, Any]]]
+    ) -> Optional[Dict[str, Any]]:
+        """Recorded entry for this call, or None when it should go to the live LLM."""
+        with self._lock:
+            recorded = self._by_prompt.get((crew_name, prompt_hash(messages)))
+            if recorded:
+                self.hits += 1
+                # Keep serving the last response once repeats are used up
+                return recorded.popleft() if len(recorded) > 1 else recorded[0]
+
+            self.misses += 1
+            if self.on_miss == "crew" and self._by_crew.get(crew_name):
+                entries = self._by_crew[crew_name]
+                entry = entries[self._crew_cursor[crew_name] % len(entries)]
+                self._crew_cursor[crew_name] += 1
+                self.crew_fallbacks += 1
+                return entry
+            if self.on_miss == "live":
+                return None
+        raise CassetteMiss(
+            f"No recorded response for {crew_name} (prompt {prompt_hash(messages)}) "
+            f"in {self.path}"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "path": self.path,
+            "recorded": self.recorded,
+            "hits": self.hits,
+            "misses": self.misses,
+            "crew_fallbacks": self.crew_fallbacks,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class CassetteLLM(BaseLLM):
+    """
+    Records calls of the wrapped LLM to a Cassette, or replays them from one.
+    On replay `inner` may be None, so no provider client (or credential) is needed.
+    """
+
+    def __init__(
+        self,
+        inner: Optional[BaseLLM],
+        cassette: Cassette,
+        crew_name: Optional[str],
+        model: str = "cassette",
+    ):
+        super().__init__(
+            model=inner.model if inner else model,
+            temperature=inner.temperature if inner else 0,
+        )
+        self.inner = inner
+        self.cassette = cassette
+        self.crew_name = crew_name or "default"
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Any:
+        if self.cassette.mode == "replay":
+            entry = self.cassette.lookup(self.crew_name, messages)
+            if entry is not None:
+                self._track_token_usage_internal(
+                    {
+                        "prompt_tokens": entry["prompt_tokens"],
+                        "completion_tokens": entry["completion_tokens"],
+                        "total_tokens": entry["prompt_tokens"] + entry["completion_tokens"],
+                    }
+                )
+                return entry["response"]
+            if self.inner is None:
+                raise CassetteMiss(f"No recorded response for {self.crew_name}")
+
+        if self.stop:
+            self.inner.stop = list(self.stop)
+        before = self.inner.get_token_usage_summary()
+        response = self.inner.call(
+            messages,
+            tools=tools,
+            callbacks=callbacks,
+            available_functions=available_functions,
+            **kwargs,
+        )
+        if self.cassette.mode == "record":
+            # Structured-output calls may return the parsed model; replay serves its JSON
+            text = response.model_dump_json() if isinstance(response, BaseModel) else response
+            if isinstance(text, str):
+                after = self.inner.get_token_usage_summary()
+                self.cassette.record(
+                    self.crew_name,
+                    messages,
+                    text,
+                    model=self.model,
+                    prompt_tokens=after.prompt_tokens - before.prompt_tokens,
+                    completion_tokens=after.completion_tokens - before.completion_tokens,
+                )
+        return response
+
+    def supports_function_calling(self) -> bool:
+        return self.inner.supports_function_calling() if self.inner else False
+
+    def supports_stop_words(self) -> bool:
+        return self.inner.supports_stop_words() if self.inner else True
+
+    def get_context_window_size(self) -> int:
+        return self.inner.get_context_window_size() if self.inner else 128_000
+
+    def get_token_usage_summary(self):
+        if self.inner is None:
+            return super().get_token_usage_summary()
+        return self.inner.get_token_usage_summary()
+
+
+def configure_cassette(output_path: str, config: Dict[str, Any]) -> Optional[Cassette]:
+    """
+    Sets up (or disables) record/replay from the `llm_cassette` config block.
+    Recording writes <output_path>/llm_cassette.jsonl.gz; replay reads `path`.
+    """
+    global _active_cassette
+    if _active_cassette is not None:
+        _active_cassette.close()
+        _active_cassette = None
+    mode = config.get("mode") or "off"
+    if mode == "off":
+        return None
+
+    if mode == "record":
+        path = os.path.join(output_path, CASSETTE_FILE)
+    else:
+        path = config.get("path") or ""
+        if os.path.isdir(path):
+            path = os.path.join(path, CASSETTE_FILE)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"llm_cassette.path not found: {path!r}")
+    _active_cassette = Cassette(path, mode, on_miss=config.get("on_miss", "crew"))
+    if mode == "record":
+        print(f"Recording LLM calls to {path}")
+    else:
+        print(
+            f"Replaying LLM calls from {path} "
+            f"({sum(len(v) for v in _active_cassette._by_crew.values())} recorded, "
+            f"on_miss={_active_cassette.on_miss})"
+        )
+    return _active_cassette
+
+
+def get_cassette() -> Optional[Cassette]:
+    return _active_cassette
+
+
+def replaying_offline() -> bool:
+    """True when replay answers every call itself, so no provider LLM needs to be built."""
+    return (
+        _active_cassette is not None
+        and _active_cassette.mode == "replay"
+        and _active_cassette.on_miss != "live"
+    )
+
+
+def with_cassette(llm: Optional[BaseLLM], crew_name: Optional[str], model: str = "") -> BaseLLM:
+    """Wraps `llm` in a CassetteLLM when recording or replaying."""
+    if _active_cassette is None:
+        return llm
+    return CassetteLLM(llm, _active_cassette, crew_name, model=model or "cassette")
@@ -2,10 +2,22 @@ import os
 from crewai import LLM
 from src.tests.fake_crewai_llm import MockLLM
 from src.enums.llm_name_enum import LLMName
+from src.generic.llm_cache import with_cache
+from src.generic.llm_cassette import replaying_offline, with_cassette
+from src.generic.crew_registry import registry_llm
+from src.generic.tracing import with_tracing
+from src.generic.rate_limiter import with_rate_limit
+from src.generic.streaming import mock_chunk_chars, streaming_enabled
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Latency/token profile applied to every MockLLM built by get_llm (see configure_mock_llm)
+_mock_profile: dict = {}
+# Base URL of a local fake chat-completions server replacing the Azure endpoints
+# (see configure_fake_llm_server); empty = use the AZURE_* environment settings
+_fake_server_url: str = ""
+
 
 # Mock response variables - easy to modify for testing
 manager_crew_response = """
@@ -696,6 +708,72 @@ writer_crew_response = "Writer's Final Output"
 default_mock_response = "Default Mock Response"
 
 
+# Default mock responses per crew (also served by src/benchmarks/fake_llm_server.py)
+DEFAULT_MOCK_RESPONSES = {
+    "manager_crew": [manager_crew_response],
+    "designer_crew_creative": [designer_crew_creative_response],
+    "designer_crew_creative_pydantic": [designer_crew_creative_pydantic],
+    "designer_crew_balanced": [balanced_product_designer_response],
+    "designer_crew_balanced_pydantic": [designer_crew_balanced_pydantic],
+    "designer_crew_conservative": [designer_crew_conservative_response],
+    "designer_crew_conservative_json": [designer_crew_conservative_json],
+    "designer_crew_conservative_pydantic": [
+        designer_crew_conservative_pydantic
+    ],
+    "planners_crew_creative": [planners_crew_creative_response],
+    "planners_crew_balanced": [planners_crew_balanced_response],
+    "planners_crew_conservative": [planners_crew_conservative_response],
+    "reviewer_crew": [reviewer_crew_response],
+    "writer_crew": [writer_crew_response],
+}
+
+
+def configure_mock_llm(config: dict) -> None:
+    """Applies the `mock_llm` config block (simulated latency and token usage)."""
+    global _mock_profile
+    _mock_profile = {
+        "latency": float(config.get("latency_ms", 0) or 0) / 1000.0,
+        "latency_jitter": float(config.get("jitter_ms", 0) or 0) / 1000.0,
+        "distribution": config.get("distribution", "uniform"),
+        "completion_tokens": config.get("completion_tokens"),
+    }
+
+
+def configure_fake_llm_server(config: dict) -> None:
+    """
+    Applies the `fake_llm_server` config block: when enabled, the GPT4/GPT5 LLMs talk
+    to the local fake server (src/benchmarks/fake_llm_server.py) over the real
+    HTTP client instead of Azure. Each crew gets its own path so the server can
+    answer with that crew's canned response.
+    """
+    global _fake_server_url
+    _fake_server_url = (
+        config.get("url", "http://127.0.0.1:8765").rstrip("/")
+        if config.get("enabled", False)
+        else ""
+    )
+    if _fake_server_url:
+        print(f"Azure deployments redirected to fake LLM server at {_fake_server_url}")
+
+
+def _endpoint_for(crew_name: str, env_var: str) -> str:
+    if _fake_server_url:
+        return f"{_fake_server_url}/crews/{crew_name or 'default'}"
+    return os.getenv(env_var)
+
+
+def _api_key_for(env_var: str) -> str:
+    return "fake-server-key" if _fake_server_url else os.getenv(env_var)
+
+
+def _env_setting(env_var: str, fake_default: str) -> str:
+    """Environment setting, with a stand-in value when talking to the fake server."""
+    value = os.getenv(env_var)
+    if not value and _fake_server_url:
+        return fake_default
+    return value
+
+
 def get_llm(
     llm_name: LLMName,
     crew_name: str = None,
@@ -711,50 +789,57 @@ def get_llm(
         responses: Custom responses for MockLLM
         temperature: Temperature setting for the LLM
     """
+    # 0. Replaying a recorded cassette: no provider client is built (see llm_cassette.py)
+    if replaying_offline():
+        model = (llm_name or LLMName.GPT4).value
+        return with_tracing(with_cassette(None, crew_name, model=model), crew_name)
+
     # 1. Handle Mock LLM
+    #    (streamed in chunks when streaming is on, see streaming.py)
     if llm_name == LLMName.MOCK:
+        profile = dict(_mock_profile, stream_chunk_chars=mock_chunk_chars())
         if responses:
-            return MockLLM(responses=responses)
-
-        # Default mock responses per crew
-        default_responses = {
-            "manager_crew": [manager_crew_response],
-            "designer_crew_creative": [designer_crew_creative_response],
-            "designer_crew_creative_pydantic": [designer_crew_creative_pydantic],
-            "designer_crew_balanced": [balanced_product_designer_response],
-            "designer_crew_balanced_pydantic": [designer_crew_balanced_pydantic],
-            "designer_crew_conservative": [designer_crew_conservative_response],
-            "designer_crew_conservative_json": [designer_crew_conservative_json],
-            "designer_crew_conservative_pydantic": [
-                designer_crew_conservative_pydantic
-            ],
-            "planners_crew_creative": [planners_crew_creative_response],
-            "planners_crew_balanced": [planners_crew_balanced_response],
-            "planners_crew_conservative": [planners_crew_conservative_response],
-            "reviewer_crew": [reviewer_crew_response],
-            "writer_crew": [writer_crew_response],
-        }
-
-        crew_config = default_responses.get(crew_name, [default_mock_response])
-        return MockLLM(responses=crew_config)
-
-    # 2. Handle Azure LLM
+            llm = MockLLM(responses=responses, **profile)
+        else:
+            crew_config = DEFAULT_MOCK_RESPONSES.get(crew_name, [default_mock_response])
+            llm = MockLLM(responses=crew_config, **profile)
+        return with_tracing(with_cassette(llm, crew_name), crew_name)
+
+    # 2. Handle Azure LLM (wrapped by the response cache when enabled, see llm_cache.py)
+    #    Every LLM gets an `llm` span per call when tracing is on (see tracing.py)
+    #    Provider calls (cache misses) are admitted per deployment (see rate_limiter.py)
+    #    Recording/replaying sits outside the cache, so cache hits are recorded too
+    #    With the crew registry on, provider LLMs (and their HTTP clients) are built
+    #    once per configuration and copied per node (see crew_registry.py)
+    #    With streaming on, completions are streamed to the chunk listeners (see streaming.py)
     if llm_name == LLMName.GPT5:
-        return LLM(
+        deployment = _env_setting("AZURE_GPT_5_DEPLOYMENT", "gpt-5")
+        settings = dict(
             provider="azure",
-            model=os.getenv("AZURE_GPT_5_DEPLOYMENT"),
-            api_key=os.getenv("AZURE_GPT_5_API_KEY"),
-            endpoint=os.getenv("AZURE_GPT_5_API_BASE"),
-            api_version=os.getenv("AZURE_GPT_5_API_VERSION"),
+            model=deployment,
+            api_key=_api_key_for("AZURE_GPT_5_API_KEY"),
+            endpoint=_endpoint_for(crew_name, "AZURE_GPT_5_API_BASE"),
+            api_version=_env_setting("AZURE_GPT_5_API_VERSION", "2024-10-21"),
             temperature=temperature,
             max_completion_tokens=1000,
+            stream=streaming_enabled(),
         )
+        llm = registry_llm(tuple(sorted(settings.items())), lambda: LLM(**settings))
+        llm = with_rate_limit(llm, deployment or "")
+        llm = with_cache(llm, crew_name, deployment=deployment or "")
+        return with_tracing(with_cassette(llm, crew_name), crew_name)
 
     # Default to GPT-4 if GPT4 or anything else (falling back to GPT4 behavior)
-    return LLM(
-        model=f"azure/{os.getenv('AZURE_GPT_4_DEPLOYMENT', 'gpt-4o-mini')}",
-        api_key=os.getenv("AZURE_GPT_4_API_KEY"),
-        endpoint=os.getenv("AZURE_GPT_4_API_BASE"),
-        api_version=os.getenv("AZURE_GPT_4_API_VERSION"),
+    deployment = os.getenv("AZURE_GPT_4_DEPLOYMENT", "gpt-4o-mini")
+    settings = dict(
+        model=f"azure/{deployment}",
+        api_key=_api_key_for("AZURE_GPT_4_API_KEY"),
+        endpoint=_endpoint_for(crew_name, "AZURE_GPT_4_API_BASE"),
+        api_version=_env_setting("AZURE_GPT_4_API_VERSION", "2024-10-21"),
         temperature=temperature,
+        stream=streaming_enabled(),
     )
+    llm = registry_llm(tuple(sorted(settings.items())), lambda: LLM(**settings))
+    llm = with_rate_limit(llm, deployment)
+    llm = with_cache(llm, crew_name, deployment=deployment)
+    return with_tracing(with_cassette(llm, crew_name), crew_name)
@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import List, Optional
+import uuid
+from typing import List, Optional, Sequence
 from pydantic import Field
 from .base_schema import BaseSchema, utcnow
 from ..enums.work_status_enum import WorkStatus
@@ -14,11 +15,21 @@ class Node(BaseSchema):
       - add_child enforces depth_limit and applies per-level defaults when available
     """
 
-    parent: Optional["Node"] = Field(default=None, description="None for root")
+    # Back-reference only: excluded from dumps/repr so serializing a tree doesn't walk cycles
+    parent: Optional["Node"] = Field(
+        default=None, description="None for root", exclude=True, repr=False
+    )
     children: List["Node"] = Field(default_factory=list)
     level: int = 0
     path: str = "0"
     sep: str = "->"
+    # Token usage and cost of this node's crew kickoffs (see token_usage.UsageLedger)
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    llm_cost: float = 0.0
+    # Reviewer score of the component this node expands (share of approved designs
+    # proposing it, see expansion_policy.py); orders best-first scheduling
+    score: Optional[float] = None
 
     def add_child(
         self,
@@ -30,45 +41,64 @@ class Node(BaseSchema):
           - Checks depth_limit (if set)
           - Computes child level/path
           - Applies title/status from per-level maps if provided and not overridden
+        Built like add_children's children, sharing self's level configuration.
         """
-        next_level = self.level + 1
+        return self.add_children([title], [description])[0]
 
-        # Enforce depth limit if present
+    def add_children(
+        self,
+        titles: Sequence[Optional[str]],
+        descriptions: Optional[Sequence[Optional[str]]] = None,
+    ) -> List["Node"]:
+        """
+        Bulk variant of add_child for many children at once:
+          - Checks depth_limit and resolves per-level title/status defaults once
+          - Builds children with model_construct, skipping the per-child validator
+            (the level configuration was already validated on self)
+          - Children reference self's LevelConfig objects instead of copies, and
+            share one fields-set
+        Paths follow the `parent->idx` scheme.
+        """
+        if descriptions is None:
+            descriptions = [None] * len(titles)
+        elif len(descriptions) != len(titles):
+            raise ValueError(
+                f"add_children got {len(titles)} titles but {len(descriptions)} descriptions"
+            )
+
+        next_level = self.level + 1
         if self.depth_limit is not None and next_level > self.depth_limit:
             raise ValueError(
                 f"Cannot add child at level {next_level}: exceeds depth_limit={self.depth_limit}"
             )
 
-        idx = len(self.children)
-        child_path = f"{self.path}{self.sep}{idx}"
-
-        # If caller didn't provide a title, try per-level default
-        resolved_title = (
-            title if title is not None else self.get_title_for_level(next_level)
-        )
-        # Prepare status (inherit current unless overridden by level map)
+        levels = self.level_config
+        default_title = self.get_title_for_level(next_level)
         resolved_status = self.get_status_for_level(next_level) or self.status
+        start = len(self.children)
+        path_prefix = f"{self.path}{self.sep}"
 
-        child = Node(
-            # BaseSchema fields
-            title=resolved_title
-            or "",  # title is required by BaseSchema; fallback to empty string
-            description=description,
-            status=resolved_status,
-            finished_at=None,  # new child starts unfinished
-            # Tree structure
-            parent=self,
-            children=[],
-            level=next_level,
-            path=child_path,
-            sep=self.sep,
-            # Inherit these global “settings” from parent so the child can create its own children consistently
-            depth_limit=self.depth_limit,
-            level_titles=self.level_titles,
-            level_statuses=self.level_statuses,
-        )
-        self.children.append(child)
-        return child
+        children = [
+            Node.model_construct(
+                _CHILD_FIELDS_SET,
+                # Passed explicitly: model_construct's default_factory path is slow
+                id=uuid.uuid4(),
+                created_at=utcnow(),
+                title=(title if title is not None else default_title) or "",
+                description=description,
+                status=resolved_status,
+                finished_at=None,
+                parent=self,
+                children=[],
+                level=next_level,
+                path=f"{path_prefix}{start + offset}",
+                sep=self.sep,
+                **levels._asdict(),
+            )
+            for offset, (title, description) in enumerate(zip(titles, descriptions))
+        ]
+        self.children.extend(children)
+        return children
 
     def mark_done(self) -> None:
         """Convenience helper to mark node as DONE and set finished_at."""
@@ -78,3 +108,7 @@ class Node(BaseSchema):
 
 # Important for self-referencing models in Pydantic v2
 Node.model_rebuild()
+
+# Every field of a constructed child counts as set, so assigning one later leaves
+# this set unchanged and all children can share it instead of holding their own
+_CHILD_FIELDS_SET = set(Node.model_fields)
@@ -0,0 +1,323 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from crewai import BaseLLM
+
+from .llm_cache import normalize_messages
+
+# Per-deployment controllers configured from flow_config.yaml (see configure_rate_limits)
+_controllers: Dict[str, "DeploymentController"] = {}
+_rate_limit_config: Dict[str, Any] = {}
+_controllers_lock = threading.Lock()
+
+
+def estimate_prompt_tokens(messages: Union[str, List[Dict[str, Any]]]) -> int:
+    """Rough prompt size (~4 characters per token) used to reserve tokens/min budget."""
+    return max(1, sum(len(m["content"]) for m in normalize_messages(messages)) // 4)
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    """
+    True for HTTP 429 / rate-limit errors from the openai, litellm, azure or urllib
+    clients, judged by status code or exception type only (message text may quote
+    a 429 from elsewhere). Follows the chain of errors a wrapper raised `from`.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        for attr in ("status_code", "status", "code"):
+            if getattr(error, attr, None) in (429, "429"):
+                return True
+        response = getattr(error, "response", None)
+        if getattr(response, "status_code", None) == 429:
+            return True
+        if "RateLimit" in type(error).__name__:
+            return True
+        error = error.__cause__
+    return False
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Reads a Retry-After header (seconds) from a throttling error, if present."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or getattr(error, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Refills `per_minute` units per minute up to `capacity`.
+    A reservation may drive the level negative; later callers wait until it refills.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` can be taken (0 when available now)."""
+        self._refill(now)
+        # A single request larger than the bucket only needs a full bucket
+        needed = min(amount, self.capacity)
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) / self.rate
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level -= amount
+
+    def refund(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+
+class DeploymentController:
+    """
+    Admission control for one Azure deployment.
+
+      - token buckets for requests/min and tokens/min
+      - AIMD concurrency limit: +1 per `limit` successful calls, x`decrease_factor`
+        on a 429 (at most once per `cooldown_seconds`, so one burst of 429s only
+        halves the limit once)
+      - a Retry-After on a 429 pauses new admissions until it expires
+      - stats(): current limits, in-flight calls, throttles and queue waits
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float = 60,
+        tokens_per_minute: float = 60_000,
+        initial_concurrency: float = 4,
+        min_concurrency: float = 1,
+        max_concurrency: float = 16,
+        decrease_factor: float = 0.5,
+        cooldown_seconds: float = 2.0,
+        expected_completion_tokens: int = 500,
+    ):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.limit = float(initial_concurrency)
+        self.min_concurrency = float(min_concurrency)
+        self.max_concurrency = float(max_concurrency)
+        self.decrease_factor = decrease_factor
+        self.cooldown_seconds = cooldown_seconds
+        self.expected_completion_tokens = expected_completion_tokens
+
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+
+        self.successes = 0
+        self.throttles = 0
+        # Recent admission waits (seconds) for the queue-wait stats
+        self.waits: deque = deque(maxlen=10_000)
+
+    def _admission_delay(self, reserve_tokens: float, now: float) -> float:
+        if self.in_flight >= max(1, int(self.limit)):
+            return -1.0  # wait for a release
+        return max(
+            self.paused_until - now,
+            self.requests.wait_time(1, now),
+            self.tokens.wait_time(reserve_tokens, now),
+            0.0,
+        )
+
+    def acquire(self, reserve_tokens: float) -> float:
+        """Blocks until a slot and budget are free; returns the seconds waited."""
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                delay = self._admission_delay(reserve_tokens, now)
+                if delay == 0.0:
+                    break
+                self._cond.wait(timeout=None if delay < 0 else delay)
+            self.in_flight += 1
+            self.requests.take(1, now)
+            self.tokens.take(reserve_tokens, now)
+            waited = time.monotonic() - started
+            self.waits.append(waited)
+        return waited
+
+    def release(
+        self,
+        reserved_tokens: float,
+        used_tokens: Optional[float],
+        throttled: bool = False,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if throttled:
+                self.throttles += 1
+                # The provider did not serve the call: give back its token reservation
+                self.tokens.refund(reserved_tokens)
+                if now - self._last_decrease >= self.cooldown_seconds:
+                    self.limit = max(
+                        self.min_concurrency, self.limit * self.decrease_factor
+                    )
+                    self._last_decrease = now
+                if retry_after:
+                    self.paused_until = max(self.paused_until, now + retry_after)
+            else:
+                self.successes += 1
+                self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+                if used_tokens is not None:
+                    # Settle the reservation against the reported usage
+                    self.tokens.refund(reserved_tokens - used_tokens)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, reserve_tokens: float) -> Iterator[Dict[str, Any]]:
+        """
+        Holds an admission for one call. The body may set `outcome["used_tokens"]`;
+        exceptions that look like 429s count as throttles.
+        """
+        self.acquire(reserve_tokens)
+        outcome: Dict[str, Any] = {"used_tokens": None}
+        try:
+            yield outcome
+        except BaseException as e:
+            throttled = is_throttle_error(e)
+            self.release(
+                reserve_tokens,
+                None,
+                throttled=throttled,
+                retry_after=retry_after_seconds(e) if throttled else None,
+            )
+            raise
+        self.release(reserve_tokens, outcome["used_tokens"])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            waits = sorted(self.waits)
+            now = time.monotonic()
+            return {
+                "deployment": self.name,
+                "concurrency_limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "requests_available": round(self.requests.level, 1),
+                "tokens_available": round(self.tokens.level, 1),
+                "paused_for_seconds": round(max(0.0, self.paused_until - now), 2),
+                "successes": self.successes,
+                "throttles": self.throttles,
+                "queue_wait_avg_ms": round(1000 * sum(waits) / len(waits), 1)
+                if waits
+                else 0.0,
+                "queue_wait_p95_ms": round(1000 * waits[int(0.95 * (len(waits) - 1))], 1)
+                if waits
+                else 0.0,
+                "queue_wait_max_ms": round(1000 * waits[-1], 1) if waits else 0.0,
+            }
+
+
+class RateLimitedLLM(BaseLLM):
+    """
+    Wraps an LLM so every call is admitted by its deployment's DeploymentController.
+    crewai retries 429s around each BaseLLM.call, so every retry attempt goes back
+    through admission (and waits out a Retry-After pause) instead of piling on.
+    """
+
+    def __init__(self, inner: BaseLLM, controller: DeploymentController):
+        super().__init__(model=inner.model, temperature=inner.temperature)
+        self.inner = inner
+        self.controller = controller
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Any:
+        if self.stop:
+            self.inner.stop = list(self.stop)
+        reserve = (
+            estimate_prompt_tokens(messages)
+            + self.controller.expected_completion_tokens
+        )
+        before = self.inner.get_token_usage_summary().total_tokens
+        with self.controller.slot(reserve) as outcome:
+            response = self.inner.call(
+                messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                **kwargs,
+            )
+            used = self.inner.get_token_usage_summary().total_tokens - before
+            if used > 0:
+                outcome["used_tokens"] = used
+            return response
+
+    def supports_function_calling(self) -> bool:
+        return self.inner.supports_function_calling()
+
+    def supports_stop_words(self) -> bool:
+        return self.inner.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.inner.get_context_window_size()
+
+    def get_token_usage_summary(self):
+        return self.inner.get_token_usage_summary()
+
+
+def configure_rate_limits(config: Dict[str, Any]) -> None:
+    """Sets up (or disables) per-deployment admission control from the `rate_limits` config block."""
+    global _rate_limit_config
+    _controllers.clear()
+    _rate_limit_config = dict(config) if config.get("enabled", False) else {}
+    if _rate_limit_config:
+        print(
+            f"Rate limits enabled (default {_rate_limit_config.get('default', {})}, "
+            f"overrides for {sorted((_rate_limit_config.get('deployments') or {}).keys())})"
+        )
+
+
+def get_controller(deployment: str) -> Optional[DeploymentController]:
+    """Returns the (shared) controller for `deployment`, or None when rate limiting is off."""
+    if not _rate_limit_config:
+        return None
+    with _controllers_lock:
+        controller = _controllers.get(deployment)
+        if controller is None:
+            settings = dict(_rate_limit_config.get("default") or {})
+            settings.update(
+                (_rate_limit_config.get("deployments") or {}).get(deployment) or {}
+            )
+            controller = DeploymentController(deployment, **settings)
+            _controllers[deployment] = controller
+    return controller
+
+
+def rate_limit_stats() -> List[Dict[str, Any]]:
+    return [c.stats() for c in _controllers.values()]
+
+
+def with_rate_limit(llm: BaseLLM, deployment: str) -> BaseLLM:
+    """Wraps `llm` in a RateLimitedLLM when rate limiting is on."""
+    controller = get_controller(deployment)
+    if controller is None:
+        return llm
+    return RateLimitedLLM(llm, controller)
@@ -0,0 +1,102 @@
+"""
+Streaming consumption of designer / reviewer completions.
+
+With `streaming.enabled`, Azure LLMs are built with stream=True and MockLLM emits
+its response in chunks. Either way every chunk reaches crewai's event bus as an
+LLMStreamChunkEvent, delivered in the thread making the LLM call. `stream_into(sink)`
+routes the chunks of the LLM calls made inside it to `sink(call_id, chunk)`; kickoffs
+run on the thread pool with a copy of the caller's context (see run_blocking), so
+the sink set around a kickoff sees exactly that kickoff's chunks.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+from crewai.events import crewai_event_bus
+from crewai.events.types.llm_events import LLMCallType, LLMStreamChunkEvent
+
+StreamSink = Callable[[str, str], None]
+
+# Streaming settings from flow_config.yaml (see configure_streaming)
+_streaming_config: Dict[str, Any] = {}
+_stream_sink: contextvars.ContextVar[Optional[StreamSink]] = contextvars.ContextVar(
+    "stream_sink", default=None
+)
+_listener_installed = False
+_listener_lock = threading.Lock()
+
+
+def configure_streaming(config: Dict[str, Any]) -> bool:
+    """Applies the `streaming` config block; returns whether streaming is on."""
+    global _streaming_config
+    _streaming_config = dict(config) if config.get("enabled", False) else {}
+    if _streaming_config:
+        _install_listener()
+        print(f"Streaming designer/reviewer completions ({_streaming_config})")
+    return bool(_streaming_config)
+
+
+def streaming_enabled() -> bool:
+    return bool(_streaming_config)
+
+
+def mock_chunk_chars() -> int:
+    """Characters per chunk MockLLM streams (0 = MockLLM returns the response whole)."""
+    if not _streaming_config:
+        return 0
+    return int(_streaming_config.get("mock_chunk_chars", 64))
+
+
+def _on_stream_chunk(_source: Any, event: LLMStreamChunkEvent) -> None:
+    sink = _stream_sink.get()
+    if sink is None or not event.chunk or event.call_type == LLMCallType.TOOL_CALL:
+        return
+    sink(event.call_id, event.chunk)
+
+
+def _install_listener() -> None:
+    global _listener_installed
+    with _listener_lock:
+        if not _listener_installed:
+            crewai_event_bus.register_handler(LLMStreamChunkEvent, _on_stream_chunk)
+            _listener_installed = True
+
+
+@contextmanager
+def stream_into(sink: Optional[StreamSink]):
+    """Routes chunks of LLM calls made in this context to `sink` (no-op for None)."""
+    if sink is None:
+        yield
+        return
+    _install_listener()
+    token = _stream_sink.set(sink)
+    try:
+        yield
+    finally:
+        _stream_sink.reset(token)
+
+
+class StreamConsumer:
+    """
+    Sink feeding one kickoff's chunks into an IncrementalJsonExtractor. A new call_id
+    (the agent's next LLM call, e.g. after a format retry) restarts the extractor, so
+    only complete objects of the current completion are emitted.
+    """
+
+    def __init__(self, extractor):
+        self.extractor = extractor
+        self.call_id: Optional[str] = None
+        self.chunks = 0
+        self.first_chunk_at: Optional[float] = None
+
+    def __call__(self, call_id: str, chunk: str) -> None:
+        if self.first_chunk_at is None:
+            self.first_chunk_at = time.perf_counter()
+        self.chunks += 1
+        if call_id != self.call_id:
+            self.call_id = call_id
+            self.extractor.reset()
+        self.extractor.feed(chunk)
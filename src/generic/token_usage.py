@@ -0,0 +1,108 @@
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field
+
+USAGE_FILE = "token_usage.json"
+
+
+class TokenUsage(BaseModel):
+    """Token counts and cost of one or more crew kickoffs."""
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    requests: int = 0
+    kickoffs: int = 0
+    cost: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def add(self, other: "TokenUsage") -> None:
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.requests += other.requests
+        self.kickoffs += other.kickoffs
+        self.cost += other.cost
+
+    def report(self) -> Dict[str, Any]:
+        data = self.model_dump()
+        data["total_tokens"] = self.total_tokens
+        data["cost"] = round(self.cost, 6)
+        if self.kickoffs:
+            data["prompt_tokens_per_kickoff"] = round(self.prompt_tokens / self.kickoffs, 1)
+        return data
+
+
+def usage_from_result(result: Any) -> TokenUsage:
+    """Reads `token_usage` from a CrewOutput (missing on fakes, so it defaults to zero)."""
+    metrics = getattr(result, "token_usage", None)
+    if metrics is None:
+        return TokenUsage(kickoffs=1)
+    return TokenUsage(
+        prompt_tokens=getattr(metrics, "prompt_tokens", 0) or 0,
+        completion_tokens=getattr(metrics, "completion_tokens", 0) or 0,
+        requests=getattr(metrics, "successful_requests", 0) or 0,
+        kickoffs=1,
+    )
+
+
+class UsageLedger:
+    """
+    Running token/cost totals of a run, by crew and by tree level.
+
+    `prices` maps an LLM type (llm_type values in flow_config.yaml) to USD per
+    million prompt/completion tokens, e.g. {"gpt5": {"prompt": 1.25, "completion": 10.0}}.
+    """
+
+    def __init__(self, prices: Optional[Dict[str, Dict[str, float]]] = None):
+        self.prices = prices or {}
+        self.total = TokenUsage()
+        self.by_crew: Dict[str, TokenUsage] = {}
+        self.by_level: Dict[int, TokenUsage] = {}
+        self._lock = threading.Lock()
+
+    def price(self, llm_type: Optional[str], usage: TokenUsage) -> float:
+        rates = self.prices.get(llm_type or "", {})
+        return (
+            usage.prompt_tokens * float(rates.get("prompt", 0.0))
+            + usage.completion_tokens * float(rates.get("completion", 0.0))
+        ) / 1_000_000
+
+    def record(
+        self, crew_name: str, llm_type: Optional[str], level: int, usage: TokenUsage
+    ) -> TokenUsage:
+        """Adds one kickoff's usage (cost filled in from `prices`) and returns it."""
+        usage.cost = self.price(llm_type, usage)
+        with self._lock:
+            self.total.add(usage)
+            self.by_crew.setdefault(crew_name, TokenUsage()).add(usage)
+            self.by_level.setdefault(level, TokenUsage()).add(usage)
+        return usage
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "total": self.total.report(),
+                "by_crew": {k: v.report() for k, v in sorted(self.by_crew.items())},
+                "by_level": {str(k): v.report() for k, v in sorted(self.by_level.items())},
+            }
+
+    def running_total(self) -> str:
+        return (
+            f"{self.total.total_tokens} tokens "
+            f"({self.total.prompt_tokens} prompt / {self.total.completion_tokens} completion, "
+            f"{self.total.kickoffs} kickoffs, ${self.total.cost:.4f})"
+        )
+
+    def write(self, output_path: str) -> str:
+        """Writes the report to <output_path>/token_usage.json (atomically replaced)."""
+        path = os.path.join(output_path, USAGE_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        os.replace(tmp_path, path)
+        return path
@@ -0,0 +1,269 @@
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from crewai import BaseLLM
+from pydantic import BaseModel, Field
+
+TRACE_FILE = "trace.jsonl"
+
+# Attributes a child span inherits from its parent (node identity, crew, model)
+INHERITED_ATTRIBUTES = ("node_id", "path", "level", "crew", "model")
+
+# Process-wide tracer configured from flow_config.yaml (see configure_tracing)
+_active_tracer: Optional["Tracer"] = None
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+class Span(BaseModel):
+    """One timed operation: a stage, crew kickoff, LLM call, parse or child-creation step."""
+
+    span_id: str = Field(default_factory=lambda: uuid.uuid4().hex[:16])
+    parent_id: Optional[str] = None
+    name: str
+    kind: str
+    start: float = Field(default_factory=time.time)
+    duration_ms: float = 0.0
+    status: str = "ok"
+    error: Optional[str] = None
+    attributes: Dict[str, Any] = Field(default_factory=dict)
+
+
+class Tracer:
+    """
+    Records spans to <output_path>/trace.jsonl, one JSON object per finished span.
+
+    The current span lives in a context variable, so nesting follows the flow's
+    asyncio tasks and the kickoff threads (run_blocking copies the context).
+    """
+
+    def __init__(self, output_path: str):
+        self.path = os.path.join(output_path, TRACE_FILE)
+        os.makedirs(output_path, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    @contextmanager
+    def span(self, name: str, kind: str, **attributes) -> Iterator[Span]:
+        parent = _current_span.get()
+        inherited = {}
+        if parent is not None:
+            inherited = {
+                key: parent.attributes[key]
+                for key in INHERITED_ATTRIBUTES
+                if key in parent.attributes
+            }
+        inherited.update({k: v for k, v in attributes.items() if v is not None})
+        span = Span(
+            name=name,
+            kind=kind,
+            parent_id=parent.span_id if parent else None,
+            attributes=inherited,
+        )
+        token = _current_span.set(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+            _current_span.reset(token)
+            self._export(span)
+
+    def _export(self, span: Span) -> None:
+        line = span.model_dump_json() + "\n"
+        with self._lock:
+            # Spans ending after close (an abandoned kickoff's thread) are dropped
+            if self._file.closed:
+                return
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class TracingLLM(BaseLLM):
+    """Wraps an LLM so every call is recorded as an `llm` span under the current span."""
+
+    def __init__(self, inner: BaseLLM, crew_name: Optional[str] = None):
+        super().__init__(model=inner.model, temperature=inner.temperature)
+        self.inner = inner
+        self.crew_name = crew_name
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Any:
+        if self.stop:
+            self.inner.stop = list(self.stop)
+        with trace_span(
+            "llm_call", kind="llm", crew=self.crew_name, model=self.model
+        ):
+            return self.inner.call(
+                messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                **kwargs,
+            )
+
+    def supports_function_calling(self) -> bool:
+        return self.inner.supports_function_calling()
+
+    def supports_stop_words(self) -> bool:
+        return self.inner.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.inner.get_context_window_size()
+
+    def get_token_usage_summary(self):
+        # Crews read usage from the agent's LLM; the provider counts it on the inner one
+        return self.inner.get_token_usage_summary()
+
+
+def configure_tracing(output_path: str, config: Dict[str, Any]) -> Optional[Tracer]:
+    """Sets up (or disables) the process-wide tracer from the `tracing` config block."""
+    global _active_tracer
+    if _active_tracer is not None:
+        _active_tracer.close()
+        _active_tracer = None
+    if not config.get("enabled", False):
+        return None
+    _active_tracer = Tracer(output_path)
+    print(f"Tracing spans to {_active_tracer.path}")
+    return _active_tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _active_tracer
+
+
+def trace_span(name: str, kind: str, **attributes):
+    """Span context manager on the active tracer; a no-op when tracing is off."""
+    if _active_tracer is None:
+        return nullcontext()
+    return _active_tracer.span(name, kind, **attributes)
+
+
+def node_attributes(node) -> Dict[str, Any]:
+    return {"node_id": str(node.id), "path": node.path, "level": node.level}
+
+
+def traced_stage(name: str):
+    """Decorates an async `(self, ctx: NodeContext)` stage helper with a `stage` span for ctx.item."""
+
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, ctx, *args, **kwargs):
+            with trace_span(name, kind="stage", **node_attributes(ctx.item)):
+                return await method(self, ctx, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def with_tracing(llm: BaseLLM, crew_name: Optional[str]) -> BaseLLM:
+    """Wraps `llm` in a TracingLLM when tracing is on."""
+    if _active_tracer is None:
+        return llm
+    return TracingLLM(llm, crew_name=crew_name)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of `samples` (0 when empty)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def load_spans(output_path: str) -> List[Span]:
+    """Reads the spans of a run, skipping a torn last line."""
+    spans = []
+    with open(os.path.join(output_path, TRACE_FILE), "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                spans.append(Span.model_validate_json(line))
+            except ValueError:
+                continue
+    return spans
+
+
+def summarize_spans(spans: List[Span]) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Latency breakdown of stage spans per stage and per level, plus per kind/name
+    for the other spans (kickoffs, LLM calls, parse and child-creation steps).
+    """
+    groups: Dict[str, Dict[str, List[float]]] = {
+        "by_stage": defaultdict(list),
+        "by_level": defaultdict(list),
+        "by_operation": defaultdict(list),
+    }
+    for span in spans:
+        if span.kind == "stage":
+            groups["by_stage"][span.name].append(span.duration_ms)
+            level = span.attributes.get("level")
+            groups["by_level"][f"level {level}"].append(span.duration_ms)
+        elif span.kind in ("kickoff", "llm"):
+            crew = span.attributes.get("crew", span.name)
+            groups["by_operation"][f"{span.kind}:{crew}"].append(span.duration_ms)
+        else:
+            groups["by_operation"][f"{span.kind}:{span.name}"].append(span.duration_ms)
+
+    summary = {}
+    for group, buckets in groups.items():
+        summary[group] = {
+            key: {
+                "count": len(values),
+                "total_ms": round(sum(values), 1),
+                "mean_ms": round(sum(values) / len(values), 1),
+                "p50_ms": round(percentile(values, 50), 1),
+                "p95_ms": round(percentile(values, 95), 1),
+                "max_ms": round(max(values), 1),
+            }
+            for key, values in sorted(buckets.items())
+        }
+    return summary
+
+
+def print_trace_summary(output_path: str) -> None:
+    summary = summarize_spans(load_spans(output_path))
+    titles = {
+        "by_stage": "Per-stage latency",
+        "by_level": "Per-level latency (all stages)",
+        "by_operation": "Kickoffs, LLM calls and steps",
+    }
+    for group, title in titles.items():
+        rows = summary[group]
+        stage_total = sum(r["total_ms"] for r in rows.values()) or 1.0
+        print(f"\n{title}")
+        print(
+            f"  {'name':<28}{'count':>7}{'total ms':>12}{'share':>8}"
+            f"{'mean':>10}{'p50':>10}{'p95':>10}{'max':>10}"
+        )
+        for key, r in rows.items():
+            print(
+                f"  {key:<28}{r['count']:>7}{r['total_ms']:>12.1f}"
+                f"{r['total_ms'] / stage_total:>8.1%}{r['mean_ms']:>10.1f}"
+                f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['max_ms']:>10.1f}"
+            )
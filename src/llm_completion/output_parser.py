@@ -0,0 +1,303 @@
+"""
+Shared parser for structured (YAML/JSON) LLM outputs.
+
+    parse_manager_output(raw)   -> ManagerCompletion
+    parse_designer_output(raw)  -> DesignerCompletionJson
+    parse_reviewer_output(raw)  -> List[DesignerCompletionJson]
+
+The payload is located in one pass (a ```lang fenced block, else the outermost
+JSON value, else the YAML from the first line starting with a model field),
+decoded with orjson / libyaml when available and validated through cached
+pydantic TypeAdapters. Tolerated LLM defects: leading/trailing prose, unclosed
+or dangling fences, trailing commas in JSON, and designer JSON nested under the
+agent name ({"creative_product_designer": {...}}).
+"""
+
+import functools
+import json
+import re
+from typing import Any, List, Optional, Tuple, Type, TypeVar
+
+import yaml
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from .designer_completion import ComponentDetail, DesignerCompletionJson
+from .manager_completion import ManagerCompletion
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _JSON_ERRORS: Tuple[Type[Exception], ...] = (orjson.JSONDecodeError, ValueError)
+except ImportError:  # pragma: no cover - orjson is optional
+    _json_loads = json.loads
+    _JSON_ERRORS = (ValueError,)
+
+# libyaml's loader is several times faster than the pure-Python one on long briefs
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+T = TypeVar("T")
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class StructuredOutputError(ValueError):
+    """An LLM output that could not be located, decoded or validated."""
+
+    def __init__(self, message: str, raw: str):
+        preview = raw.strip()[:200]
+        super().__init__(f"{message}. Raw output preview: {preview}...")
+        self.raw = raw
+
+
+@functools.lru_cache(maxsize=None)
+def _adapter(target: Any) -> TypeAdapter:
+    return TypeAdapter(target)
+
+
+@functools.lru_cache(maxsize=None)
+def _yaml_start_pattern(model: Type[BaseModel]) -> "re.Pattern[str]":
+    names = "|".join(re.escape(name) for name in model.model_fields)
+    return re.compile(rf"^(?:{names})\s*:", re.MULTILINE)
+
+
+def extract_payload(raw: str) -> Tuple[Optional[str], str]:
+    """
+    Returns (fence language or None, payload) for the first non-empty fenced block,
+    or (None, text) with a dangling closing fence removed when there is none.
+    """
+    start = raw.find("```")
+    if start == -1:
+        return None, raw
+    newline = raw.find("\n", start)
+    if newline != -1:
+        end = raw.find("```", newline)
+        body = raw[newline + 1 : end if end != -1 else len(raw)]
+        if body.strip():
+            return raw[start + 3 : newline].strip().lower() or None, body
+    # Only a closing fence (e.g. `{...}\n````): the payload precedes it
+    return None, raw[:start]
+
+
+def strip_trailing_commas(text: str) -> str:
+    """Removes commas directly before `}` / `]`, leaving string contents alone."""
+    out = []
+    in_string = escaped = False
+    length = len(text)
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == ",":
+            j = i + 1
+            while j < length and text[j] in " \t\r\n":
+                j += 1
+            if j < length and text[j] in "}]":
+                continue
+        out.append(char)
+    return "".join(out)
+
+
+def loads_json(text: str) -> Any:
+    """Decodes the outermost JSON object/array in `text` (prose around it is ignored)."""
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        raise ValueError("no JSON object or array found")
+    start = min(starts)
+    end = text.rfind(_CLOSERS[text[start]])
+    if end < start:
+        raise ValueError("unterminated JSON value")
+    payload = text[start : end + 1]
+    try:
+        return _json_loads(payload)
+    except _JSON_ERRORS:
+        return _json_loads(strip_trailing_commas(payload))
+
+
+def loads_yaml(text: str, model: Optional[Type[BaseModel]] = None) -> Any:
+    """Decodes YAML, skipping leading prose up to the first `<model field>:` line."""
+    if model is not None:
+        match = _yaml_start_pattern(model).search(text)
+        if match:
+            text = text[match.start() :]
+    return yaml.load(text, Loader=_YamlLoader)
+
+
+def decode(raw: str, prefer: str = "json", model: Optional[Type[BaseModel]] = None) -> Any:
+    """Locates and decodes the payload of `raw`; `prefer` decides unlabelled text."""
+    lang, payload = extract_payload(raw)
+    stripped = payload.lstrip()
+    if lang == "json" or (lang not in ("yaml", "yml") and stripped[:1] in ("{", "[")):
+        return loads_json(payload)
+    if lang in ("yaml", "yml") or prefer == "yaml":
+        return loads_yaml(payload, model)
+    return loads_json(payload)
+
+
+def parse_structured(
+    raw: str, target: Any, prefer: str = "json", model: Optional[Type[BaseModel]] = None
+):
+    """Decodes `raw` and validates it into `target` (a model or typing type)."""
+    try:
+        data = decode(raw, prefer=prefer, model=model)
+    except (ValueError, yaml.YAMLError) as e:
+        raise StructuredOutputError(f"Could not decode {prefer.upper()} output: {e}", raw)
+    try:
+        return _adapter(target).validate_python(_normalize(data, target))
+    except ValidationError as e:
+        raise StructuredOutputError(f"Output does not match {_name(target)}: {e}", raw)
+
+
+def _normalize(data: Any, target: Any) -> Any:
+    if target is DesignerCompletionJson:
+        return _unwrap_designer(data)
+    if target == List[DesignerCompletionJson]:
+        # {"decisions": [...]} style wrappers around the array
+        if isinstance(data, dict) and len(data) == 1:
+            (value,) = data.values()
+            if isinstance(value, list):
+                data = value
+        if isinstance(data, list):
+            return [_unwrap_designer(item) for item in data]
+    return data
+
+
+def _unwrap_designer(data: Any) -> Any:
+    """{"<agent_name>": {"is_approved": ..., "components": [...]}} -> flat designer dict."""
+    if isinstance(data, dict) and "agent_name" not in data and len(data) == 1:
+        ((agent_name, body),) = data.items()
+        if isinstance(body, dict):
+            return {"agent_name": agent_name, **body}
+    return data
+
+
+def _name(target: Any) -> str:
+    return getattr(target, "__name__", None) or str(target)
+
+
+class IncrementalJsonExtractor:
+    """
+    Scans JSON text as it streams in and calls `on_object(obj)` for every object that
+    closes at one of `paths`, before the rest of the document has arrived.
+
+    A path lists the keys/array positions from the root, "*" matching any, e.g.
+    ("components", "*") for each element of a top-level "components" array. Text
+    before the first `{`/`[` (prose, a fence) is skipped. Emitted objects are decoded
+    with loads_json and, when `target` is given, validated into it; ones that do not
+    validate are skipped (the final parse of the full output reports them).
+    """
+
+    def __init__(self, paths, on_object, target: Any = None):
+        self.paths = [tuple(p) for p in paths]
+        self.on_object = on_object
+        self.target = target
+        self.reset()
+
+    def reset(self) -> None:
+        """Starts over, e.g. when a retry re-streams the completion."""
+        self.text = ""
+        self.emitted = 0
+        self._pos = 0
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._done = False
+        # [opening char, path, start index, current key / array index, expecting a key]
+        self._stack: List[list] = []
+
+    def _matches(self, path: Tuple) -> bool:
+        for pattern in self.paths:
+            if len(pattern) == len(path) and all(
+                want == "*" or want == got for want, got in zip(pattern, path)
+            ):
+                return True
+        return False
+
+    def feed(self, chunk: str) -> None:
+        if self._done:
+            return
+        self.text += chunk
+        text = self.text
+        stack = self._stack
+        for i in range(self._pos, len(text)):
+            char = text[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    top = stack[-1] if stack else None
+                    if top is not None and top[0] == "{" and top[4]:
+                        top[3] = text[self._string_start + 1 : i]
+                continue
+            if not stack and char not in "{[":
+                continue
+            if char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char in "{[":
+                path: Tuple = ()
+                if stack:
+                    parent = stack[-1]
+                    path = parent[1] + (parent[3],)
+                stack.append([char, path, i, 0 if char == "[" else None, char == "{"])
+            elif char in "}]":
+                if not stack:
+                    continue
+                frame = stack.pop()
+                if frame[0] == "{" and self._matches(frame[1]):
+                    self._emit(text[frame[2] : i + 1])
+                if not stack:
+                    self._done = True
+                    break
+            elif char == ":" and stack[-1][0] == "{":
+                stack[-1][4] = False
+            elif char == ",":
+                top = stack[-1]
+                if top[0] == "{":
+                    top[4] = True
+                else:
+                    top[3] += 1
+        self._pos = len(text)
+
+    def _emit(self, payload: str) -> None:
+        try:
+            obj = loads_json(payload)
+            if self.target is not None:
+                obj = _adapter(self.target).validate_python(_normalize(obj, self.target))
+        except (ValueError, ValidationError):
+            return
+        self.emitted += 1
+        self.on_object(obj)
+
+
+def component_extractor(on_component) -> IncrementalJsonExtractor:
+    """Emits each ComponentDetail of a streaming designer output (flat or agent-keyed)."""
+    return IncrementalJsonExtractor(
+        [("components", "*"), ("*", "components", "*")], on_component, ComponentDetail
+    )
+
+
+def decision_extractor(on_decision) -> IncrementalJsonExtractor:
+    """Emits each DesignerCompletionJson of a streaming reviewer output array."""
+    return IncrementalJsonExtractor([("*",)], on_decision, DesignerCompletionJson)
+
+
+def parse_manager_output(raw: str) -> ManagerCompletion:
+    return parse_structured(raw, ManagerCompletion, prefer="yaml", model=ManagerCompletion)
+
+
+def parse_designer_output(raw: str) -> DesignerCompletionJson:
+    return parse_structured(raw, DesignerCompletionJson)
+
+
+def parse_reviewer_output(raw: str) -> List[DesignerCompletionJson]:
+    return parse_structured(raw, List[DesignerCompletionJson])
@@ -0,0 +1,271 @@
+import atexit
+import json
+import os
+import queue
+import threading
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from ..enums.work_status_enum import WorkStatus
+from ..generic.node import Node
+from ..llm_completion.designer_completion import DesignerCompletionJson
+from ..llm_completion.manager_completion import ManagerCompletion
+from ..llm_completion.output_parser import StructuredOutputError, parse_reviewer_output
+from .node_context import NodeContext
+
+JOURNAL_FILE = "journal.jsonl"
+
+_CLOSE = object()
+
+# Node fields needed to rebuild the root (children inherit the rest via add_child)
+ROOT_FIELDS = {
+    "id",
+    "title",
+    "description",
+    "status",
+    "created_at",
+    "depth_limit",
+    "level_titles",
+    "level_statuses",
+    "level",
+    "path",
+    "sep",
+}
+
+
+def _raw_text(output: Any) -> Optional[str]:
+    if output is None:
+        return None
+    return getattr(output, "raw", None) or str(output)
+
+
+def _dump(output: Any) -> Any:
+    if hasattr(output, "model_dump"):
+        return output.model_dump(mode="json")
+    return output
+
+
+class ResumePoint(BaseModel):
+    """Tree, queues and partial stage results rebuilt from a journal."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    root: Node
+    work_queue: Deque[Node] = Field(default_factory=deque)
+    visited_queue: Deque[Node] = Field(default_factory=deque)
+    contexts: Dict[str, NodeContext] = Field(default_factory=dict)
+
+
+class CheckpointJournal:
+    """
+    Append-only JSONL journal of stage transitions, written to <output_path>/journal.jsonl.
+
+    Each line records one node's delta for one transition:
+      - root:      the root node and its level configuration
+      - MANAGING:  parsed manager output
+      - DESIGNING: designer outputs
+      - REVIEWING: reviewer raw output
+      - WRITING:   writer raw output and the children created for the node
+      - DONE:      finished_at timestamp
+      - FAILED:    the stage error; a failed node is re-run from scratch on resume
+
+    Records are serialized on the caller's thread and handed to a daemon writer
+    thread, so the stage methods never wait on disk: the writer drains whatever
+    has queued up, writes it with one write + flush and fsyncs once per batch.
+    A crash loses at most the records not yet fsync'ed, which resume re-runs.
+    close() (also called at interpreter exit) writes out and fsyncs the rest.
+    """
+
+    def __init__(self, output_path: str):
+        self.path = os.path.join(output_path, JOURNAL_FILE)
+        self.records = 0
+        self.fsyncs = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name="journal-writer", daemon=True
+        )
+        self._thread.start()
+        # An aborted run exits without _complete_flow; keep what it journaled
+        atexit.register(self.close)
+
+    def record_root(self, root: Node) -> None:
+        self._append(
+            {"event": "root", "node": root.model_dump(mode="json", include=ROOT_FIELDS)}
+        )
+
+    def record_stage(self, ctx: NodeContext) -> None:
+        item = ctx.item
+        record: Dict[str, Any] = {
+            "event": "stage",
+            "node_id": str(item.id),
+            "status": item.status.value,
+        }
+        if item.status == WorkStatus.MANAGING:
+            record["manager_output"] = _dump(ctx.manager_output)
+        elif item.status == WorkStatus.DESIGNING:
+            record["designer_outputs"] = [_dump(o) for o in ctx.designer_outputs]
+        elif item.status == WorkStatus.REVIEWING:
+            record["reviewer_output"] = _raw_text(ctx.reviewer_output)
+        elif item.status == WorkStatus.WRITING:
+            record["writer_output"] = _raw_text(ctx.writer_output)
+            record["children"] = [
+                {
+                    "id": str(child.id),
+                    "title": child.title,
+                    "description": child.description,
+                    "status": child.status.value,
+                    "score": child.score,
+                }
+                for child in item.children
+            ]
+        elif item.status == WorkStatus.FAILED:
+            record["error"] = ctx.error
+        self._append(record)
+
+    def record_done(self, item: Node) -> None:
+        self._append(
+            {
+                "event": "stage",
+                "node_id": str(item.id),
+                "status": WorkStatus.DONE.value,
+                "finished_at": item.finished_at.isoformat() if item.finished_at else None,
+            }
+        )
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        self._queue.put((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+
+    def close(self) -> None:
+        """Writes out and fsyncs every record appended so far, then stops the writer."""
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_CLOSE)
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def _run(self) -> None:
+        with open(self.path, "ab") as f:
+            while True:
+                batch = [self._queue.get()]
+                # Group commit: everything queued meanwhile shares one fsync
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                closing = _CLOSE in batch
+                lines = [line for line in batch if line is not _CLOSE]
+                if lines:
+                    f.write(b"".join(lines))
+                    f.flush()
+                    os.fsync(f.fileno())
+                    with self._lock:
+                        self.records += len(lines)
+                        self.fsyncs += 1
+                if closing:
+                    return
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"path": self.path, "records": self.records, "fsyncs": self.fsyncs}
+
+    @staticmethod
+    def load(output_path: str) -> ResumePoint:
+        """Replays the journal into a tree, work/visited queues and per-node contexts."""
+        path = os.path.join(output_path, JOURNAL_FILE)
+        if not os.path.exists(path):
+            raise RuntimeError(f"No checkpoint journal found at {path}")
+
+        nodes: Dict[str, Node] = {}
+        contexts: Dict[str, NodeContext] = {}
+        done_order: List[Node] = []
+        root: Optional[Node] = None
+
+        with open(path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-write; everything before it is valid
+                    print(f"Ignoring unreadable journal line {line_no} in {path}")
+                    break
+
+                if record["event"] == "root":
+                    root = Node(**record["node"])
+                    nodes[str(root.id)] = root
+                    continue
+
+                node = nodes[record["node_id"]]
+                status = WorkStatus(record["status"])
+                ctx = contexts.setdefault(
+                    record["node_id"], NodeContext(item=node, resumed=True)
+                )
+
+                if status == WorkStatus.MANAGING and record.get("manager_output"):
+                    ctx.manager_output = ManagerCompletion(**record["manager_output"])
+                elif status == WorkStatus.DESIGNING:
+                    ctx.designer_outputs = [
+                        DesignerCompletionJson(**o) for o in record["designer_outputs"]
+                    ]
+                elif status == WorkStatus.REVIEWING:
+                    ctx.reviewer_output = record.get("reviewer_output")
+                    try:
+                        ctx.reviewer_decisions = parse_reviewer_output(
+                            ctx.reviewer_output or ""
+                        )
+                    except StructuredOutputError:
+                        ctx.reviewer_decisions = []
+                elif status == WorkStatus.WRITING:
+                    ctx.writer_output = record.get("writer_output")
+                    child_records = record.get("children", [])
+                    children = []
+                    # Leaves at the depth limit have no children (and add_children would refuse)
+                    if child_records:
+                        children = node.add_children(
+                            [c["title"] for c in child_records],
+                            [c.get("description") for c in child_records],
+                        )
+                    for child, child_record in zip(children, child_records):
+                        child.id = uuid.UUID(child_record["id"])
+                        child.status = WorkStatus(child_record["status"])
+                        child.score = child_record.get("score")
+                        nodes[str(child.id)] = child
+                elif status == WorkStatus.FAILED:
+                    # Retry failed nodes from the first stage
+                    contexts.pop(record["node_id"], None)
+                    node.status = node.get_status_for_level(node.level) or WorkStatus.PENDING
+                    continue
+                elif status == WorkStatus.DONE:
+                    node.mark_done()
+                    if record.get("finished_at"):
+                        node.finished_at = datetime.fromisoformat(record["finished_at"])
+                    contexts.pop(record["node_id"], None)
+                    done_order.append(node)
+                node.status = status
+
+        if root is None:
+            raise RuntimeError(f"Checkpoint journal {path} has no root record")
+
+        # Rebuild the queue in the order nodes were enqueued: the root first, then the
+        # children of each finalized node. Partially processed nodes were popped from
+        # the head, so they naturally land at the front.
+        work_queue: Deque[Node] = deque()
+        if root.status != WorkStatus.DONE:
+            work_queue.append(root)
+        for node in done_order:
+            work_queue.extend(c for c in node.children if c.status != WorkStatus.DONE)
+
+        return ResumePoint(
+            root=root,
+            work_queue=work_queue,
+            visited_queue=deque(done_order),
+            contexts=contexts,
+        )
@@ -0,0 +1,46 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+from ..generic.node import Node
+from ..enums.work_status_enum import WorkStatus
+
+# Status a node carries once the corresponding stage has completed
+STAGE_ORDER = [
+    WorkStatus.MANAGING,
+    WorkStatus.DESIGNING,
+    WorkStatus.REVIEWING,
+    WorkStatus.WRITING,
+    WorkStatus.DONE,
+]
+
+
+class NodeContext(BaseModel):
+    """
+    Per-node working set carried through the manager -> designers -> reviewer -> writer stages.
+
+    The sequential flow keeps a single context in NodeState.current_context, while the
+    parallel modes keep one context per in-flight node so results land on the right Node.
+    """
+
+    item: Node
+    manager_output: Optional[Any] = None
+    designer_outputs: List[Any] = Field(default_factory=list)
+    # Components parsed from the designers' streams as they closed, per designer crew
+    # (streaming mode), and when the first one arrived (time.perf_counter()).
+    # Only reported for now; the reviewer and children use designer_outputs.
+    streamed_components: Dict[str, List[Any]] = Field(default_factory=dict)
+    first_component_at: Optional[float] = None
+    reviewer_output: Optional[Any] = None
+    # Reviewer output parsed into per-designer decisions (see output_parser.py)
+    reviewer_decisions: List[Any] = Field(default_factory=list)
+    writer_output: Optional[Any] = None
+    # True when rebuilt from a checkpoint journal; completed stages are then skipped
+    resumed: bool = False
+    # Set when a stage failed after the kickoff policy's retries (node is then FAILED)
+    error: Optional[str] = None
+
+    def has_completed(self, stage: WorkStatus) -> bool:
+        status = self.item.status
+        if status not in STAGE_ORDER:
+            return False
+        return STAGE_ORDER.index(status) >= STAGE_ORDER.index(stage)
@@ -0,0 +1,136 @@
+import heapq
+import itertools
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic_core import core_schema
+
+from ..generic.node import Node
+
+SchedulerKey = Callable[[Node], Tuple]
+
+
+def path_key(node: Node) -> Tuple[int, ...]:
+    """Child indices from the root: sorting by it visits the tree in pre-order."""
+    return tuple(int(part) for part in node.path.split(node.sep))
+
+
+def estimate_node_tokens(node: Node) -> float:
+    """
+    Rough cost of expanding `node`: what its parent's expansion used plus its own
+    title/description, which become the manager's prompt (~4 characters per token).
+    Not rounded, so siblings with short titles still differ by their own text.
+    """
+    parent = node.parent
+    inherited = parent.prompt_tokens + parent.completion_tokens if parent else 0
+    return inherited + (len(node.title) + len(node.description or "")) / 4
+
+
+# Priority keys per policy; ties go to the node queued first
+POLICIES: Dict[str, Callable[["NodeScheduler"], SchedulerKey]] = {
+    # FIFO: the level-by-level order of the original deque
+    "bfs": lambda scheduler: lambda node: (),
+    "dfs": lambda scheduler: path_key,
+    # Highest reviewer score first (share of approved designs proposing the component)
+    "best_first": lambda scheduler: lambda node: (-(node.score or 0.0),),
+    # Lowest estimated cost first; of equally cheap nodes, the best scored
+    "cheapest": lambda scheduler: lambda node: (
+        scheduler.cost_estimator(node),
+        -(node.score or 0.0),
+    ),
+    # Shallowest node first, so every unfinished subtree gets its next level before
+    # any goes deeper; within a level, subtrees in pre-order
+    "shallowest_subtree": lambda scheduler: lambda node: (node.level, path_key(node)),
+}
+
+
+class NodeScheduler:
+    """
+    Queue of nodes awaiting expansion, ordered by a pluggable policy (the `scheduler`
+    config block): bfs | dfs | best_first | cheapest | shallowest_subtree.
+
+    Backed by a binary heap of (policy key, insertion sequence, node) entries:
+    append/popleft are O(log n) and equal keys pop in insertion order. Keeps the
+    deque API the flow modes use (append, extend, popleft, [0], len, iteration in
+    pop order), so it can stand in for NodeState.work_queue's deque.
+    """
+
+    def __init__(
+        self,
+        policy: str = "bfs",
+        nodes: Iterable[Node] = (),
+        cost_estimator: Callable[[Node], float] = estimate_node_tokens,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(
+                f"Unknown scheduler policy {policy!r}; expected one of {sorted(POLICIES)}"
+            )
+        self.policy = policy
+        self.cost_estimator = cost_estimator
+        self._key = POLICIES[policy](self)
+        self._heap: List[Tuple[Tuple, int, Node]] = []
+        self._sequence = itertools.count()
+        self.pushes = 0
+        self.max_size = 0
+        self.extend(nodes)
+
+    def append(self, node: Node) -> None:
+        heapq.heappush(self._heap, (self._key(node), next(self._sequence), node))
+        self.pushes += 1
+        self.max_size = max(self.max_size, len(self._heap))
+
+    def extend(self, nodes: Iterable[Node]) -> None:
+        for node in nodes:
+            self.append(node)
+
+    def popleft(self) -> Node:
+        if not self._heap:
+            raise IndexError("pop from an empty NodeScheduler")
+        return heapq.heappop(self._heap)[-1]
+
+    def peek(self) -> Node:
+        if not self._heap:
+            raise IndexError("peek into an empty NodeScheduler")
+        return self._heap[0][-1]
+
+    def clear(self) -> None:
+        self._heap.clear()
+
+    def __getitem__(self, index: int) -> Node:
+        if index != 0:
+            raise IndexError("NodeScheduler only supports [0] (the next node)")
+        return self.peek()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __bool__(self) -> bool:
+        return bool(self._heap)
+
+    def __iter__(self) -> Iterator[Node]:
+        """Queued nodes in the order they would be popped (sorts a copy)."""
+        return (entry[-1] for entry in sorted(self._heap, key=lambda e: e[:2]))
+
+    def __repr__(self) -> str:
+        return f"NodeScheduler(policy={self.policy!r}, size={len(self)})"
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "policy": self.policy,
+            "queued": len(self._heap),
+            "pushes": self.pushes,
+            "max_size": self.max_size,
+        }
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type: Any, handler: Any):
+        # Any iterable of nodes (e.g. a deque) becomes a BFS scheduler; dumps as a list
+        return core_schema.no_info_plain_validator_function(
+            cls._coerce,
+            serialization=core_schema.plain_serializer_function_ser_schema(list),
+        )
+
+    @classmethod
+    def _coerce(cls, value: Any) -> "NodeScheduler":
+        if isinstance(value, NodeScheduler):
+            return value
+        return cls("bfs", value)
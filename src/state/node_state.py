@@ -4,6 +4,8 @@ from pydantic import Field
 
 from ..generic.base_schema import BaseSchema
 from ..generic.node import Node
+from .node_context import NodeContext
+from .node_scheduler import NodeScheduler
 
 
 class NodeState(BaseSchema):
@@ -12,18 +14,38 @@ class NodeState(BaseSchema):
     project_vision: str = ""
 
     # Initialization Config
+    config_path: str = "src/resources/flow_config.yaml"
     save_folder: str = ""
     project_name: str = ""
     version: str = ""
     overwrite: bool = False
     output_path: str = ""
     crew_llm_types: Dict[str, str] = Field(default_factory=dict)
+    # Number of frontier nodes expanded concurrently (1 = sequential event-driven flow)
+    max_concurrency: int = 1
+    # Size of the thread pool that runs blocking crew kickoffs off the event loop
+    kickoff_threads: int = 8
+    # Cross-node stage pipelining (manager/designers/reviewer/writer overlap across nodes)
+    pipeline_enabled: bool = False
+    pipeline_queue_size: int = 2
+    stage_metrics: Dict[str, Dict[str, float]] = Field(default_factory=dict)
+    # Tree shape: depth and number of children per node (seeded for reproducible runs)
+    depth_limit: int = 4
+    branching_seed: Optional[int] = None
+    min_children: int = 0
+    max_children: int = 2
+    # Order in which queued nodes are expanded (see node_scheduler.py)
+    scheduler_policy: str = "bfs"
+    # Output folder of an interrupted run to resume from its checkpoint journal
+    resume_from: str = ""
+    resume_contexts: Dict[str, NodeContext] = Field(default_factory=dict)
 
     # Queue-Based Workflow State using Node
-    # Using Node directly.
-    work_queue: Deque[Node] = Field(default_factory=deque)
+    # Nodes awaiting expansion, popped in scheduler_policy order
+    work_queue: NodeScheduler = Field(default_factory=NodeScheduler)
     visited_queue: Deque[Node] = Field(default_factory=deque)
     current_item: Optional[Node] = None
+    current_context: Optional[NodeContext] = None
     manager_output: Optional[Any] = None
     designer_outputs: List[Any] = Field(default_factory=list)
 
@@ -0,0 +1,135 @@
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from ..generic.node import Node
+from .checkpoint_journal import _dump, _raw_text
+from .node_context import NodeContext
+
+PAYLOAD_FILE = "node_payloads.jsonl"
+
+# Light Node fields a stub keeps in memory (everything but the text and the tree links)
+STUB_FIELDS = (
+    "id",
+    "title",
+    "status",
+    "created_at",
+    "finished_at",
+    "depth_limit",
+    "level",
+    "path",
+    "sep",
+    "prompt_tokens",
+    "completion_tokens",
+    "llm_cost",
+    "score",
+)
+
+
+def node_stub(node: Node) -> Node:
+    """
+    Compact stand-in for a finished node: identity, position, status, timings and
+    token usage only. No description, no parent/children links and no level maps,
+    so it keeps neither text nor the rest of the tree alive.
+    """
+    return Node.model_construct(
+        **{field: getattr(node, field) for field in STUB_FIELDS},
+        description=None,
+        parent=None,
+        children=[],
+        level_titles=None,
+        level_statuses=None,
+        level_titles_map={},
+        level_statuses_map={},
+    )
+
+
+def node_payload(node: Node, ctx: Optional[NodeContext] = None) -> Dict[str, Any]:
+    """A finished node's heavy data: its text, children and stage outputs."""
+    payload: Dict[str, Any] = {
+        "node_id": str(node.id),
+        "path": node.path,
+        "level": node.level,
+        "title": node.title,
+        "description": node.description,
+        "status": node.status.value,
+        "children": [
+            {"id": str(child.id), "path": child.path, "title": child.title}
+            for child in node.children
+        ],
+    }
+    if ctx is not None:
+        payload["manager_output"] = _dump(ctx.manager_output)
+        payload["designer_outputs"] = [_dump(o) for o in ctx.designer_outputs]
+        payload["reviewer_output"] = _raw_text(ctx.reviewer_output)
+        payload["writer_output"] = _raw_text(ctx.writer_output)
+        payload["error"] = ctx.error
+    return payload
+
+
+class PayloadStore:
+    """
+    Append-only JSONL spill file of finished nodes' payloads, at
+    <output_path>/node_payloads.jsonl, with an in-memory {node id: (offset, length)}
+    index for random access. An existing file (a resumed run) is re-indexed on open;
+    a later line for the same node replaces the earlier one.
+    """
+
+    def __init__(self, output_path: str):
+        self.path = os.path.join(output_path, PAYLOAD_FILE)
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self.bytes_written = 0
+        if os.path.exists(self.path):
+            self._load_index()
+        self._file = open(self.path, "ab")
+
+    def _load_index(self) -> None:
+        offset = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    node_id = json.loads(line)["node_id"]
+                except (json.JSONDecodeError, KeyError):
+                    # A torn final line from a crash mid-write
+                    break
+                self._index[node_id] = (offset, len(line))
+                offset += len(line)
+
+    def put(self, payload: Dict[str, Any]) -> None:
+        line = (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(line)
+            # Flushed (not fsync'ed) so get() sees it; the journal is the durable record
+            self._file.flush()
+            self._index[payload["node_id"]] = (offset, len(line))
+            self.bytes_written += len(line)
+
+    def get(self, node_id: Any) -> Optional[Dict[str, Any]]:
+        entry = self._index.get(str(node_id))
+        if entry is None:
+            return None
+        offset, length = entry
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Stored payloads in the order they were spilled."""
+        for node_id, _ in sorted(self._index.items(), key=lambda item: item[1][0]):
+            yield self.get(node_id)
+
+    def __contains__(self, node_id: Any) -> bool:
+        return str(node_id) in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": self.path, "nodes": len(self), "bytes_written": self.bytes_written}
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
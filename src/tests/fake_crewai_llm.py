@@ -2,16 +2,73 @@ import os
 # Set dummy key BEFORE importing crewai to suppress the error
 os.environ["OPENAI_API_KEY"] = "fake-key-for-testing"
 
+import random
+import threading
+import time
 from crewai import Agent, Task, Crew, BaseLLM
-from typing import Any, Dict, List, Optional, Union
+from crewai.llms.base_llm import llm_call_context
+from typing import Any, ClassVar, Dict, List, Optional, Union
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return max(1, len(text) // 4)
+
 
 class MockLLM(BaseLLM):
-   
-    def __init__(self, responses: List[str]):
+    # Process-wide totals across all MockLLM instances (read by the flow benchmark)
+    total_calls: ClassVar[int] = 0
+    total_prompt_tokens: ClassVar[int] = 0
+    total_completion_tokens: ClassVar[int] = 0
+    _totals_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self,
+        responses: List[str],
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        distribution: str = "uniform",
+        completion_tokens: Optional[int] = None,
+        seed: Optional[int] = None,
+        stream_chunk_chars: int = 0,
+    ):
         super().__init__(model="mock", temperature=0)
         self.responses = responses
         self.call_count = 0
-    
+        # Seconds each call blocks for, to simulate an LLM round trip:
+        #   constant: always `latency`
+        #   uniform:  latency +/- latency_jitter
+        #   normal:   gauss(latency, latency_jitter), clipped at 0
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.distribution = distribution
+        # Completion tokens reported per call (default: estimated from the response)
+        self.completion_tokens = completion_tokens
+        self.rng = random.Random(seed)
+        # > 0: the response is emitted as LLMStreamChunkEvents of this many characters,
+        # spread over the latency like tokens arriving from a streaming endpoint
+        self.stream_chunk_chars = stream_chunk_chars
+
+    @classmethod
+    def reset_totals(cls) -> None:
+        with cls._totals_lock:
+            cls.total_calls = 0
+            cls.total_prompt_tokens = 0
+            cls.total_completion_tokens = 0
+
+    def sample_latency(self) -> float:
+        if self.distribution == "normal":
+            return max(0.0, self.rng.gauss(self.latency, self.latency_jitter))
+        if self.distribution == "uniform" and self.latency_jitter:
+            return max(
+                0.0,
+                self.rng.uniform(
+                    self.latency - self.latency_jitter,
+                    self.latency + self.latency_jitter,
+                ),
+            )
+        return self.latency
+
     def call(
         self,
         messages: Union[str, List[Dict[str, str]]],
@@ -20,10 +77,44 @@ class MockLLM(BaseLLM):
         available_functions: Optional[Dict[str, Any]] = None,
         **kwargs
     ) -> str:
+        delay = self.sample_latency()
         response = self.responses[self.call_count % len(self.responses)]
         self.call_count += 1
+        if self.stream_chunk_chars > 0:
+            self._stream(response, delay)
+        elif delay:
+            time.sleep(delay)
+
+        if isinstance(messages, str):
+            prompt_text = messages
+        else:
+            prompt_text = "".join(str(m.get("content", "")) for m in messages)
+        prompt_tokens = estimate_tokens(prompt_text)
+        completion_tokens = self.completion_tokens or estimate_tokens(response)
+        with MockLLM._totals_lock:
+            MockLLM.total_calls += 1
+            MockLLM.total_prompt_tokens += prompt_tokens
+            MockLLM.total_completion_tokens += completion_tokens
+        if hasattr(self, "_track_token_usage_internal"):
+            self._track_token_usage_internal(
+                {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                }
+            )
         return response
     
+    def _stream(self, response: str, delay: float) -> None:
+        size = self.stream_chunk_chars
+        chunks = [response[i : i + size] for i in range(0, len(response), size)] or [""]
+        pause = delay / len(chunks)
+        with llm_call_context():
+            for chunk in chunks:
+                if pause:
+                    time.sleep(pause)
+                self._emit_stream_chunk_event(chunk=chunk)
+
     def supports_function_calling(self) -> bool:
         return False
 
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import sys
+import os
+from collections import deque
+
+# Adjust path to include src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+import src.flows.bfs_node_flow as flow_mod
+from src.flows.artifact_writer import ARTIFACTS_DIR, ArtifactPolicy, ArtifactWriter
+from src.state.node_context import NodeContext
+from src.tests.test_parallel_frontier import (
+    FakeCrew,
+    FakeDesignerCrew,
+    FakeManagerCrew,
+    _build_flow,
+    _build_root,
+)
+
+
+def _read_shard(writer: ArtifactWriter, level: int):
+    with open(writer.shard_path(level), encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_writer_shards_per_level_and_fsyncs_only_at_checkpoints(tmp_path):
+    writer = ArtifactWriter(
+        ArtifactPolicy(flush_interval_seconds=60, fsync_every_nodes=2),
+        str(tmp_path),
+    )
+    root = _build_root()
+    zones = root.add_children(["Zone A", "Zone B"])
+    root.mark_done()
+
+    writer.submit(root, NodeContext(item=root, writer_output="written"))
+    writer.submit(zones[0])  # second node: checkpoint
+    writer.submit(zones[1])
+    writer.close()
+
+    assert [r["title"] for r in _read_shard(writer, 0)] == ["Root"]
+    level_1 = _read_shard(writer, 1)
+    assert [r["title"] for r in level_1] == ["Zone A", "Zone B"]
+    assert level_1[0]["parent_id"] == str(root.id)
+
+    record = _read_shard(writer, 0)[0]
+    assert record["writer_output"] == "written"
+    assert [c["title"] for c in record["children"]] == ["Zone A", "Zone B"]
+    assert record["finished_at"] is not None
+
+    stats = writer.stats()
+    assert stats["records"] == 3
+    # One checkpoint after two nodes plus the final one on close
+    assert stats["fsyncs"] == 2
+    assert stats["shards"] == 2
+
+
+def test_submit_does_not_write_before_the_flush_interval(tmp_path):
+    writer = ArtifactWriter(
+        ArtifactPolicy(flush_interval_seconds=60, fsync_every_nodes=0),
+        str(tmp_path),
+    )
+    writer.submit(_build_root())
+
+    assert not os.path.exists(writer.shard_path(0))
+    writer.close()
+    assert len(_read_shard(writer, 0)) == 1
+
+
+def test_flow_streams_every_finished_node(monkeypatch, tmp_path):
+    monkeypatch.setattr(flow_mod, "ManagerCrew", FakeManagerCrew)
+    monkeypatch.setattr(flow_mod, "DesignerCrew", FakeDesignerCrew)
+    monkeypatch.setattr(flow_mod, "ReviewerCrew", FakeCrew)
+    monkeypatch.setattr(flow_mod, "WriterCrew", FakeCrew)
+    monkeypatch.setattr(flow_mod.random, "randint", lambda a, b: 2)
+
+    flow = _build_flow(deque([_build_root()]))
+    flow._artifacts = ArtifactWriter(ArtifactPolicy(), str(tmp_path))
+    asyncio.run(flow.run_frontier())
+
+    shards = sorted(os.listdir(tmp_path / ARTIFACTS_DIR))
+    assert shards == ["level_0.jsonl", "level_1.jsonl", "level_2.jsonl"]
+    counts = [len(_read_shard(flow._artifacts, level)) for level in range(3)]
+    assert counts == [1, 2, 4]
+    manager = _read_shard(flow._artifacts, 0)[0]["manager_output"]
+    assert manager["project_brief"] == "Brief"
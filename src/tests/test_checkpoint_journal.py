@@ -0,0 +1,139 @@
+import asyncio
+import sys
+import os
+
+# Adjust path to include src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+import src.flows.bfs_node_flow as flow_mod
+from src.flows.expansion_policy import ExpansionPolicy
+from src.enums.work_status_enum import WorkStatus
+from src.generic.node import Node
+from src.llm_completion.designer_completion import DesignerCompletionJson
+from src.llm_completion.manager_completion import ManagerCompletion
+from src.state.checkpoint_journal import CheckpointJournal
+from src.state.node_context import NodeContext
+from src.tests.test_parallel_frontier import (
+    FakeCrew,
+    FakeDesignerCrew,
+    FakeManagerCrew,
+)
+
+MANAGER_OUTPUT = ManagerCompletion(
+    project_brief="Brief",
+    designer_instructions="Instructions",
+    designer_expected_outputs="Outputs",
+)
+
+
+def _write_partial_run(output_path: str) -> Node:
+    """Journals a run that finished the root and crashed after managing its first child."""
+    journal = CheckpointJournal(output_path)
+    root = Node(
+        title="Root",
+        depth_limit=2,
+        level_titles=["Vision", "Zone", "Feature"],
+        status=WorkStatus.INITIALIZING,
+    )
+    journal.record_root(root)
+
+    ctx = NodeContext(item=root, manager_output=MANAGER_OUTPUT)
+    root.status = WorkStatus.MANAGING
+    journal.record_stage(ctx)
+    ctx.designer_outputs = [
+        DesignerCompletionJson(agent_name="balanced_product_designer", components=[])
+    ]
+    root.status = WorkStatus.DESIGNING
+    journal.record_stage(ctx)
+    root.status = WorkStatus.REVIEWING
+    journal.record_stage(ctx)
+    root.add_child(title="Zone A")
+    root.add_child(title="Zone B")
+    root.status = WorkStatus.WRITING
+    journal.record_stage(ctx)
+    root.mark_done()
+    journal.record_done(root)
+
+    child_ctx = NodeContext(item=root.children[0], manager_output=MANAGER_OUTPUT)
+    root.children[0].status = WorkStatus.MANAGING
+    journal.record_stage(child_ctx)
+    journal.close()
+    return root
+
+
+def test_load_rebuilds_tree_queue_and_partial_context(tmp_path):
+    original = _write_partial_run(str(tmp_path))
+
+    resume = CheckpointJournal.load(str(tmp_path))
+
+    assert resume.root.id == original.id
+    assert [n.title for n in resume.visited_queue] == ["Root"]
+    assert [n.title for n in resume.work_queue] == ["Zone A", "Zone B"]
+    assert [c.id for c in resume.root.children] == [c.id for c in original.children]
+    assert resume.root.children[1].path == "0->1"
+
+    ctx = resume.contexts[str(original.children[0].id)]
+    assert ctx.resumed
+    assert ctx.manager_output == MANAGER_OUTPUT
+    assert ctx.has_completed(WorkStatus.MANAGING)
+    assert not ctx.has_completed(WorkStatus.DESIGNING)
+
+
+def test_load_ignores_torn_last_line(tmp_path):
+    _write_partial_run(str(tmp_path))
+    with open(os.path.join(str(tmp_path), "journal.jsonl"), "a") as f:
+        f.write('{"event": "stage", "node_id": ')
+
+    resume = CheckpointJournal.load(str(tmp_path))
+    assert len(resume.work_queue) == 2
+
+
+def test_resumed_flow_skips_completed_stages(tmp_path, monkeypatch):
+    manager_calls = []
+
+    class CountingManagerCrew(FakeManagerCrew):
+        def kickoff(self, inputs=None):
+            manager_calls.append(inputs)
+            return super().kickoff(inputs)
+
+    monkeypatch.setattr(flow_mod, "ManagerCrew", CountingManagerCrew)
+    monkeypatch.setattr(flow_mod, "DesignerCrew", FakeDesignerCrew)
+    monkeypatch.setattr(flow_mod, "ReviewerCrew", FakeCrew)
+    monkeypatch.setattr(flow_mod, "WriterCrew", FakeCrew)
+    monkeypatch.setattr(flow_mod.random, "randint", lambda a, b: 0)
+
+    _write_partial_run(str(tmp_path))
+    resume = CheckpointJournal.load(str(tmp_path))
+
+    flow = flow_mod.BFSNodeFlow()
+    # Tree shape from the patched randint, not from the reviewer
+    flow._expansion_policy = ExpansionPolicy(mode="random")
+    flow.state.max_concurrency = 2
+    flow.state.work_queue = resume.work_queue
+    flow.state.visited_queue = resume.visited_queue
+    flow.state.resume_contexts = resume.contexts
+    asyncio.run(flow.run_frontier())
+
+    # Only Zone B needed a manager call; Zone A's was restored from the journal
+    assert len(manager_calls) == 1
+    assert [n.title for n in flow.state.visited_queue] == ["Root", "Zone A", "Zone B"]
+
+
+def test_appends_are_written_in_order_with_batched_fsyncs(tmp_path):
+    journal = CheckpointJournal(str(tmp_path))
+    root = Node(title="Root", depth_limit=2, level_titles=["Vision", "Zone", "Feature"])
+    journal.record_root(root)
+    for _ in range(200):
+        journal.record_done(root)
+    journal.close()
+
+    stats = journal.stats()
+    assert stats["records"] == 201
+    assert 1 <= stats["fsyncs"] <= 201
+    with open(journal.path, encoding="utf-8") as f:
+        lines = f.readlines()
+    assert len(lines) == 201
+    assert '"event": "root"' in lines[0]
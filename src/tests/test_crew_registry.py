@@ -0,0 +1,84 @@
+import sys
+import os
+
+import pytest
+
+# Adjust path to include src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from src.crews.writer_crew.crew import WriterCrew
+from src.enums.llm_name_enum import LLMName
+from src.generic.crew_registry import (
+    CrewRegistry,
+    can_copy_llm,
+    configure_crew_registry,
+    load_crew_yaml,
+)
+from src.generic.llm_utils import configure_fake_llm_server
+
+
+@pytest.fixture
+def registry():
+    configure_fake_llm_server({"enabled": True, "url": "http://127.0.0.1:8765"})
+    yield configure_crew_registry({"enabled": True})
+    configure_crew_registry({})
+    configure_fake_llm_server({})
+
+
+def _provider(crew):
+    """The crewai LLM under the wrappers of the crew's first agent."""
+    llm = crew.agents[0].llm
+    while hasattr(llm, "inner"):
+        llm = llm.inner
+    return llm
+
+
+def test_nodes_share_http_clients_but_not_usage(registry):
+    first = _provider(WriterCrew(llm_name=LLMName.GPT4).crew())
+    second = _provider(WriterCrew(llm_name=LLMName.GPT4).crew())
+
+    assert first is not second
+    # Private crewai attributes; fails when an upgrade renames them
+    assert can_copy_llm(first)
+    assert first._client is second._client
+    assert first._async_client is second._async_client
+
+    first._track_token_usage_internal(
+        {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+    )
+    assert first.get_token_usage_summary().total_tokens == 15
+    assert second.get_token_usage_summary().total_tokens == 0
+    assert registry.stats()["provider_builds"] == 1
+
+
+def test_crew_yaml_parsed_once_and_copied(registry, tmp_path):
+    path = tmp_path / "agents.yaml"
+    path.write_text("writer:\n  role: Writer\n", encoding="utf-8")
+
+    config = load_crew_yaml(path)
+    config["writer"]["role"] = "mutated by CrewBase"
+    assert load_crew_yaml(path) == {"writer": {"role": "Writer"}}
+    assert registry.stats()["yaml_parses"] == 1
+
+    # A changed file is parsed again
+    path.write_text("writer:\n  role: Editor\n", encoding="utf-8")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+    assert load_crew_yaml(path) == {"writer": {"role": "Editor"}}
+
+
+def test_providers_without_usage_counters_are_built_per_node():
+    built = []
+
+    class Provider:
+        def __init__(self):
+            built.append(self)
+
+    registry = CrewRegistry()
+    first = registry.provider_llm("key", Provider)
+    second = registry.provider_llm("key", Provider)
+
+    assert first is not second and built == [first, second]
+    assert (registry.stats()["provider_builds"], registry.stats()["provider_reuses"]) == (2, 0)
@@ -0,0 +1,78 @@
+import sys
+import os
+
+# Adjust path to include src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from src.flows.expansion_policy import ExpansionLedger, ExpansionPolicy, name_tokens
+from src.llm_completion.designer_completion import DesignerCompletionJson
+
+
+def _design(agent_name, names, is_approved=False):
+    return DesignerCompletionJson(
+        agent_name=agent_name,
+        is_approved=is_approved,
+        components=[{"name": n, "description": f"{n} description"} for n in names],
+    )
+
+
+DESIGNS = [
+    _design("creative", ["Dream Journal", "Mood Ring"]),
+    _design("balanced", ["Activity Tracker", "Sleep Monitor", "User Profiles"]),
+    _design("conservative", ["User Profile Management", "Activity Tracking System", "Audit Log"]),
+]
+DECISIONS = [
+    _design("creative", ["Dream Journal"], is_approved=False),
+    _design("balanced", [], is_approved=True),
+    _design("conservative", [], is_approved=True),
+]
+
+
+def test_children_from_approved_deduplicated_and_capped():
+    assert name_tokens("Activity Tracking System") == name_tokens("Activity Tracker")
+
+    policy = ExpansionPolicy(max_children=3, max_children_per_level={2: 1})
+    plan = policy.plan(DESIGNS, DECISIONS, child_level=1)
+
+    # Components proposed by both approved designs come first
+    assert [c.title for c in plan.children] == [
+        "Activity Tracker",
+        "User Profiles",
+        "Sleep Monitor",
+    ]
+    assert plan.children[0].support == 2
+    assert (plan.proposed, plan.disapproved, plan.duplicates, plan.capped) == (8, 2, 2, 1)
+    assert plan.pruned == 5
+
+    assert len(policy.plan(DESIGNS, DECISIONS, child_level=2).children) == 1
+
+    ledger = ExpansionLedger()
+    ledger.record(1, plan, len(plan.children))
+    assert ledger.report()["total"]["pruned"] == 5
+    assert ledger.report()["by_level"]["1"]["created"] == 3
+
+
+def test_unreviewed_designs():
+    approve_all = ExpansionPolicy(max_children=10).plan(DESIGNS, [], child_level=1)
+    assert [c.title for c in approve_all.children][-1] == "Audit Log"
+    assert approve_all.disapproved == 0
+
+    none = ExpansionPolicy(when_unreviewed="none").plan(DESIGNS, [], child_level=1)
+    assert none.children == [] and none.unreviewed == 8 and none.pruned == 8
+
+
+def test_designs_the_reviewer_left_out():
+    decisions = DECISIONS[:2]
+    approve_all = ExpansionPolicy(max_children=10).plan(DESIGNS, decisions, child_level=1)
+    assert "Audit Log" in [c.title for c in approve_all.children]
+    assert (approve_all.proposed, approve_all.unreviewed) == (8, 0)
+
+    none = ExpansionPolicy(max_children=10, when_unreviewed="none").plan(
+        DESIGNS, decisions, child_level=1
+    )
+    assert [c.title for c in none.children] == ["Activity Tracker", "Sleep Monitor", "User Profiles"]
+    assert (none.proposed, none.disapproved, none.unreviewed) == (8, 2, 3)
+    assert none.pruned == 5
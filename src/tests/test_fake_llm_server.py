@@ -0,0 +1,98 @@
+import json
+import sys
+import os
+import urllib.error
+import urllib.request
+
+import pytest
+
+# Adjust path to include src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from src.benchmarks.fake_llm_server import (
+    FakeLLMServer,
+    FakeServerProfile,
+    strip_code_fence,
+)
+from src.generic.llm_utils import (
+    LLMName,
+    configure_fake_llm_server,
+    get_llm,
+    writer_crew_response,
+)
+from src.generic.rate_limiter import configure_rate_limits
+
+
+def _post(url, body):
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return response.status, json.loads(response.read())
+
+
+@pytest.fixture
+def fake_server_config():
+    yield
+    configure_fake_llm_server({})
+    configure_rate_limits({})
+
+
+def test_serves_crew_response_with_usage():
+    with FakeLLMServer(FakeServerProfile(completion_tokens=7)) as server:
+        status, body = _post(
+            f"{server.url}/crews/writer_crew/chat/completions?api-version=2024-10-21",
+            {"messages": [{"role": "user", "content": "x" * 400}]},
+        )
+        assert status == 200
+        assert body["choices"][0]["message"]["content"] == writer_crew_response
+        assert body["usage"] == {
+            "prompt_tokens": 100,
+            "completion_tokens": 7,
+            "total_tokens": 107,
+        }
+        assert server.stats()["per_crew"] == {"writer_crew": 1}
+
+
+def test_structured_output_requests_get_bare_json():
+    assert strip_code_fence('```json\n{"a": 1}\n```\n') == '{"a": 1}'
+    assert strip_code_fence('{"a": 1}\n```') == '{"a": 1}'
+    assert strip_code_fence("plain") == "plain"
+
+
+def test_throttle_and_error_rates():
+    profile = FakeServerProfile(throttle_rate=0.3, error_rate=0.2, seed=3)
+    with FakeLLMServer(profile) as server:
+        statuses = []
+        for _ in range(200):
+            try:
+                statuses.append(_post(f"{server.url}/v1/chat/completions", {})[0])
+            except urllib.error.HTTPError as e:
+                statuses.append(e.code)
+                if e.code == 429:
+                    assert e.headers["Retry-After"] == "1"
+        stats = server.stats()
+
+    assert stats["requests"] == 200
+    assert statuses.count(429) == stats["throttled"]
+    assert statuses.count(500) == stats["errors"]
+    assert statuses.count(200) == stats["ok"]
+    assert 30 < stats["throttled"] < 90
+    assert 15 < stats["errors"] < 65
+
+
+def test_get_llm_talks_to_fake_server(fake_server_config):
+    with FakeLLMServer(FakeServerProfile(completion_tokens=11)) as server:
+        configure_fake_llm_server({"enabled": True, "url": server.url})
+        configure_rate_limits({"enabled": True, "default": {"initial_concurrency": 2}})
+
+        llm = get_llm(LLMName.GPT5, "writer_crew")
+        assert llm.call("Write the section.") == writer_crew_response
+        assert llm.get_token_usage_summary().completion_tokens == 11
+        assert server.stats()["per_crew"] == {"writer_crew": 1}
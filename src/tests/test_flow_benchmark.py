@@ -0,0 +1,67 @@
+import asyncio
+import sys
+import os
+from collections import deque
+
+# Adjust path to include src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+import src.flows.bfs_node_flow as flow_mod
+from src.benchmarks.flow_benchmark import percentile
+from src.tests.fake_crewai_llm import MockLLM
+from src.tests.test_parallel_frontier import (
+    FakeCrew,
+    FakeDesignerCrew,
+    FakeManagerCrew,
+    _build_root,
+)
+
+
+def _run_seeded_tree(monkeypatch, seed: int, concurrency: int):
+    monkeypatch.setattr(flow_mod, "ManagerCrew", FakeManagerCrew)
+    monkeypatch.setattr(flow_mod, "DesignerCrew", FakeDesignerCrew)
+    monkeypatch.setattr(flow_mod, "ReviewerCrew", FakeCrew)
+    monkeypatch.setattr(flow_mod, "WriterCrew", FakeCrew)
+
+    flow = flow_mod.BFSNodeFlow()
+    flow.state.max_concurrency = concurrency
+    flow.state.branching_seed = seed
+    flow.state.min_children = 1
+    flow.state.max_children = 3
+    flow.state.work_queue = deque([_build_root()])
+    asyncio.run(flow.run_frontier())
+    return sorted(n.path for n in flow.state.visited_queue)
+
+
+def test_seeded_branching_is_reproducible_across_concurrency(monkeypatch):
+    sequential = _run_seeded_tree(monkeypatch, seed=7, concurrency=1)
+    parallel = _run_seeded_tree(monkeypatch, seed=7, concurrency=4)
+
+    assert sequential == parallel
+    # min_children=1, so every non-leaf node has at least one child
+    assert len(sequential) >= 3
+
+
+def test_mock_llm_latency_and_token_totals():
+    MockLLM.reset_totals()
+    llm = MockLLM(responses=["x" * 40], latency=0.01, distribution="constant")
+
+    assert llm.sample_latency() == 0.01
+    assert llm.call("y" * 80) == "x" * 40
+    assert MockLLM.total_calls == 1
+    assert MockLLM.total_prompt_tokens == 20
+    assert MockLLM.total_completion_tokens == 10
+
+    jittered = MockLLM(responses=["x"], latency=0.05, latency_jitter=0.02, seed=1)
+    assert all(0.03 <= jittered.sample_latency() <= 0.07 for _ in range(20))
+
+
+def test_percentile_nearest_rank():
+    samples = [float(i) for i in range(1, 101)]
+    assert percentile(samples, 50) == 50.0
+    assert percentile(samples, 99) == 99.0
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([], 50) == 0.0
@@ -0,0 +1,65 @@
+import asyncio
+import sys
+import os
+from collections import deque
+
+# Adjust path to include src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+import src.flows.bfs_node_flow as flow_mod
+from src.enums.work_status_enum import WorkStatus
+from src.flows.iterative_driver import IterativeDriver
+from src.tests.test_parallel_frontier import (
+    FakeCrew,
+    FakeDesignerCrew,
+    FakeManagerCrew,
+    _build_flow,
+    _build_root,
+)
+
+
+def _patch_crews(monkeypatch):
+    monkeypatch.setattr(flow_mod, "ManagerCrew", FakeManagerCrew)
+    monkeypatch.setattr(flow_mod, "DesignerCrew", FakeDesignerCrew)
+    monkeypatch.setattr(flow_mod, "ReviewerCrew", FakeCrew)
+    monkeypatch.setattr(flow_mod, "WriterCrew", FakeCrew)
+    monkeypatch.setattr(flow_mod.random, "randint", lambda a, b: 2)
+
+
+def test_iterative_driver_expands_whole_tree_in_queue_order(monkeypatch):
+    _patch_crews(monkeypatch)
+    flow = _build_flow(deque([_build_root()]))
+
+    driver = IterativeDriver(flow, concurrency=1)
+    asyncio.run(driver.drive())
+
+    visited = list(flow.state.visited_queue)
+    assert [n.path for n in visited] == [
+        "0",
+        "0->0",
+        "0->1",
+        "0->0->0",
+        "0->0->1",
+        "0->1->0",
+        "0->1->1",
+    ]
+    assert all(n.status == WorkStatus.DONE for n in visited)
+    assert driver.nodes_processed == 7
+    # No node ever goes through the shared event-cycle slots
+    assert flow.state.current_item is None
+    assert flow.state.current_context is None
+
+
+def test_iterative_driver_workers_cover_the_same_tree(monkeypatch):
+    _patch_crews(monkeypatch)
+    flow = _build_flow(deque([_build_root()]))
+
+    asyncio.run(IterativeDriver(flow, concurrency=4).drive())
+
+    paths = sorted(n.path for n in flow.state.visited_queue)
+    assert len(paths) == 7
+    assert paths[0] == "0"
+    assert not flow.state.work_queue
@@ -0,0 +1,196 @@
+import asyncio
+import sys
+import os
+import time
+from collections import deque
+from types import SimpleNamespace
+
+import pytest
+
+# Adjust path to include src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+import src.flows.bfs_node_flow as flow_mod
+from src.flows.expansion_policy import ExpansionPolicy
+from src.enums.work_status_enum import WorkStatus
+from src.flows.kickoff_policy import (
+    KickoffFailed,
+    KickoffPolicy,
+    LatencyTracker,
+    is_transient_error,
+    run_with_policy,
+)
+from src.flows.run_budget import BudgetController, RunBudget
+from src.generic.token_usage import UsageLedger
+from src.state.checkpoint_journal import CheckpointJournal
+from src.tests.test_parallel_frontier import (
+    FakeCrew,
+    FakeDesignerCrew,
+    FakeManagerCrew,
+    _build_root,
+)
+from src.tests.test_token_usage import MeteredCrew
+
+FAST = dict(base_delay_seconds=0.001, max_delay_seconds=0.01)
+
+
+def test_retries_with_backoff_until_success():
+    calls = []
+
+    async def attempt(number, hedge):
+        calls.append(number)
+        if number < 3:
+            raise ConnectionError("reset")
+        return "ok"
+
+    result = asyncio.run(
+        run_with_policy(attempt, KickoffPolicy(max_attempts=3, **FAST), LatencyTracker(), "crew")
+    )
+    assert result == "ok"
+    assert calls == [1, 2, 3]
+
+
+def test_timeouts_exhaust_attempts():
+    async def attempt(number, hedge):
+        await asyncio.sleep(1)
+
+    policy = KickoffPolicy(max_attempts=2, timeout_seconds=0.05, **FAST)
+    with pytest.raises(KickoffFailed) as info:
+        asyncio.run(run_with_policy(attempt, policy, LatencyTracker(), "writer_crew"))
+    assert info.value.attempts == 2
+    assert isinstance(info.value.last_error, TimeoutError)
+
+
+def test_deterministic_errors_are_not_retried():
+    calls = []
+
+    async def attempt(number, hedge):
+        calls.append(number)
+        raise ValueError("could not parse output")
+
+    with pytest.raises(KickoffFailed) as info:
+        asyncio.run(
+            run_with_policy(attempt, KickoffPolicy(max_attempts=3, **FAST), LatencyTracker(), "crew")
+        )
+    assert calls == [1]
+    assert info.value.attempts == 1
+
+
+def test_transient_error_classification():
+    class APIError(Exception):
+        def __init__(self, status_code):
+            super().__init__(f"status {status_code}")
+            self.status_code = status_code
+
+    assert is_transient_error(TimeoutError())
+    assert is_transient_error(ConnectionError("reset"))
+    assert is_transient_error(APIError(429))
+    assert is_transient_error(APIError(503))
+    assert not is_transient_error(APIError(400))
+    assert not is_transient_error(ValueError("bad config"))
+
+
+def test_backoff_is_jittered_and_capped():
+    policy = KickoffPolicy(base_delay_seconds=1.0, max_delay_seconds=4.0)
+    assert all(0.5 <= policy.backoff_delay(1) <= 1.0 for _ in range(20))
+    assert all(2.0 <= policy.backoff_delay(10) <= 4.0 for _ in range(20))
+
+
+def test_hedge_fires_after_tail_threshold_and_first_result_wins():
+    policy = KickoffPolicy(
+        hedge_enabled=True, hedge_min_samples=3, hedge_min_delay_seconds=0.01
+    )
+    tracker = LatencyTracker()
+    for _ in range(3):
+        tracker.record("reviewer_crew", 0.02)
+    started = []
+
+    async def attempt(number, hedge):
+        started.append(hedge)
+        await asyncio.sleep(0.01 if hedge else 2.0)
+        return "hedge" if hedge else "primary"
+
+    began = time.perf_counter()
+    result = asyncio.run(run_with_policy(attempt, policy, tracker, "reviewer_crew"))
+    assert result == "hedge"
+    assert started == [False, True]
+    assert time.perf_counter() - began < 1.0
+
+
+class BrokenWriterCrew(FakeCrew):
+    def kickoff(self, inputs=None):
+        if "Zone 1" in inputs["content"]:
+            raise ConnectionError("writer backend down")
+        return SimpleNamespace(raw="ok")
+
+
+def test_failed_node_is_isolated_and_retried_on_resume(tmp_path, monkeypatch):
+    monkeypatch.setattr(flow_mod, "ManagerCrew", FakeManagerCrew)
+    monkeypatch.setattr(flow_mod, "DesignerCrew", FakeDesignerCrew)
+    monkeypatch.setattr(flow_mod, "ReviewerCrew", FakeCrew)
+    monkeypatch.setattr(flow_mod, "WriterCrew", BrokenWriterCrew)
+    monkeypatch.setattr(flow_mod.random, "randint", lambda a, b: 2)
+
+    root = _build_root()
+    flow = flow_mod.BFSNodeFlow()
+    # Tree shape from the patched randint, not from the reviewer
+    flow._expansion_policy = ExpansionPolicy(mode="random")
+    flow._kickoff_policy = KickoffPolicy(max_attempts=2, **FAST)
+    flow._journal = CheckpointJournal(str(tmp_path))
+    flow._journal.record_root(root)
+    flow.state.max_concurrency = 2
+    flow.state.work_queue = deque([root])
+    asyncio.run(flow.run_frontier())
+
+    by_title = {n.title: n for n in flow.state.visited_queue}
+    failed = [n for n in by_title.values() if n.status == WorkStatus.FAILED]
+    assert [n.title for n in failed] == ["Zone 1 of Root..."]
+    assert failed[0].children == []
+    # The sibling zone still expanded into features
+    assert len(by_title) == 1 + 2 + 2
+
+    flow._journal.close()
+    resume = CheckpointJournal.load(str(tmp_path))
+    assert [n.title for n in resume.work_queue] == ["Zone 1 of Root..."]
+    assert resume.work_queue[0].status != WorkStatus.FAILED
+    assert str(resume.work_queue[0].id) not in resume.contexts
+
+
+class SlowFirstWriterCrew(MeteredCrew):
+    started = 0
+
+    def kickoff(self, inputs=None):
+        SlowFirstWriterCrew.started += 1
+        if SlowFirstWriterCrew.started == 1:
+            time.sleep(0.2)
+        return super().kickoff(inputs)
+
+
+def test_abandoned_attempt_usage_is_still_charged(monkeypatch):
+    monkeypatch.setattr(flow_mod, "WriterCrew", SlowFirstWriterCrew)
+    SlowFirstWriterCrew.started = 0
+
+    flow = flow_mod.BFSNodeFlow()
+    flow._usage = UsageLedger()
+    flow._budget = BudgetController(RunBudget())
+    flow._kickoff_policy = KickoffPolicy(max_attempts=2, timeout_seconds=0.05, **FAST)
+    item = _build_root()
+
+    async def run():
+        await flow._kickoff(
+            lambda: SlowFirstWriterCrew().crew(),
+            {"content": "x"},
+            crew_name="writer_crew",
+            item=item,
+        )
+        # Let the timed-out first attempt finish on its pool thread
+        await asyncio.sleep(0.3)
+
+    asyncio.run(run())
+
+    assert SlowFirstWriterCrew.started == 2
+    assert flow._budget.llm_calls == 2
+    assert item.prompt_tokens == 200
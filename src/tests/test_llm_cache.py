@@ -0,0 +1,71 @@
+import sys
+import os
+
+# Adjust path to include src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from src.generic import llm_cache
+from src.generic.llm_cache import CachingLLM, LLMResponseCache
+from src.tests.fake_crewai_llm import MockLLM
+
+
+def test_key_ignores_cosmetic_whitespace_but_not_temperature():
+    base = LLMResponseCache.make_key("gpt4", "dep", 0.2, "  Plan the vision ")
+    same = LLMResponseCache.make_key(
+        "gpt4", "dep", 0.2, [{"role": "user", "content": "Plan the vision"}]
+    )
+    hotter = LLMResponseCache.make_key("gpt4", "dep", 0.8, "Plan the vision")
+    assert base == same
+    assert base != hotter
+
+
+def test_caching_llm_serves_repeats_from_disk(tmp_path):
+    cache = LLMResponseCache(str(tmp_path))
+    inner = MockLLM(responses=["first", "second"])
+    llm = CachingLLM(inner, cache, deployment="dep")
+
+    assert llm.call("hello") == "first"
+    assert llm.call("hello") == "first"
+    assert inner.call_count == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+    # A fresh cache over the same directory sees the stored entry
+    reopened = LLMResponseCache(str(tmp_path))
+    assert CachingLLM(MockLLM(responses=["other"]), reopened, "dep").call("hello") == "first"
+
+
+def test_lru_eviction_keeps_recently_used_entries(tmp_path):
+    cache = LLMResponseCache(str(tmp_path), max_bytes=300)
+    cache.put("a" * 64, "x" * 100)
+    cache.put("b" * 64, "y" * 100)
+    assert cache.get("a" * 64) == "x" * 100  # refresh "a"
+    cache.put("c" * 64, "z" * 100)
+
+    assert cache.get("b" * 64) is None
+    assert cache.get("a" * 64) == "x" * 100
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size_bytes"] <= 300
+
+
+def test_get_reads_the_file_without_holding_the_lock(tmp_path, monkeypatch):
+    cache = LLMResponseCache(str(tmp_path))
+    cache.put("k", "stored")
+    lock_held = []
+    real_load = llm_cache.json.load
+
+    def load(f):
+        lock_held.append(cache._lock.locked())
+        return real_load(f)
+
+    monkeypatch.setattr(llm_cache.json, "load", load)
+    assert cache.get("k") == "stored"
+    assert lock_held == [False]
+
+    # A file removed behind the cache's back is forgotten and counted as a miss
+    os.remove(cache._path("k"))
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
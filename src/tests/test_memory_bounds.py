@@ -0,0 +1,186 @@
+import asyncio
+import json
+import sys
+import os
+from collections import deque
+from types import SimpleNamespace
+
+# Adjust path to include src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from crewai.project.utils import memoize
+
+import src.flows.bfs_node_flow as flow_mod
+from src.enums.work_status_enum import WorkStatus
+from src.flows import memory_bounds
+from src.flows.memory_bounds import (
+    MEMORY_FILE,
+    MemoryBounds,
+    MemoryPolicy,
+    missing_runtime_internals,
+)
+from src.state.node_context import NodeContext
+from src.state.payload_store import PAYLOAD_FILE, PayloadStore, node_stub
+from src.tests.test_parallel_frontier import (
+    FakeCrew,
+    FakeDesignerCrew,
+    FakeManagerCrew,
+    _build_flow,
+    _build_root,
+)
+
+
+def test_payload_store_random_access_and_reindex(tmp_path):
+    store = PayloadStore(str(tmp_path))
+    store.put({"node_id": "a", "title": "Zone A"})
+    store.put({"node_id": "b", "title": "Zone B"})
+    store.put({"node_id": "a", "title": "Zone A (retried)"})
+
+    assert store.get("b")["title"] == "Zone B"
+    assert store.get("a")["title"] == "Zone A (retried)"
+    assert store.get("missing") is None
+    store.close()
+
+    reopened = PayloadStore(str(tmp_path))
+    assert len(reopened) == 2
+    assert [p["title"] for p in reopened] == ["Zone B", "Zone A (retried)"]
+    reopened.close()
+
+
+def test_node_stub_keeps_identity_not_text():
+    root = _build_root()
+    zone = root.add_child(title="Zone", description="A long description")
+    zone.prompt_tokens = 12
+    zone.mark_done()
+
+    stub = node_stub(zone)
+
+    assert (stub.id, stub.path, stub.level, stub.title) == (
+        zone.id,
+        zone.path,
+        zone.level,
+        zone.title,
+    )
+    assert stub.status == WorkStatus.DONE
+    assert stub.prompt_tokens == 12
+    assert stub.description is None
+    assert stub.parent is None and stub.children == []
+
+
+def test_release_spills_and_strips(tmp_path):
+    bounds = MemoryBounds(MemoryPolicy(bounded=True), str(tmp_path))
+    root = _build_root()
+    root.description = "Vision text"
+    children = root.add_children(["Zone A", "Zone B"])
+    ctx = NodeContext(item=root, manager_output="brief", writer_output="written")
+
+    stub = bounds.release(root, ctx)
+
+    payload = bounds.payloads.get(root.id)
+    assert payload["description"] == "Vision text"
+    assert [c["title"] for c in payload["children"]] == ["Zone A", "Zone B"]
+    assert payload["manager_output"] == "brief"
+    assert payload["writer_output"] == "written"
+    # The live node keeps only what its queued children read through `parent`
+    assert root.description is None and root.children == []
+    assert children[0].parent is root
+    assert ctx.manager_output is None and ctx.writer_output is None
+    assert stub.title == "Root" and stub is not root
+    bounds.stop()
+
+
+def test_unbounded_policy_keeps_nodes(tmp_path):
+    bounds = MemoryBounds(MemoryPolicy(), str(tmp_path))
+    root = _build_root()
+
+    assert bounds.release(root) is root
+    assert bounds.payloads is None
+    assert not os.path.exists(tmp_path / PAYLOAD_FILE)
+
+
+def test_tracemalloc_peaks_by_level(tmp_path):
+    bounds = MemoryBounds(MemoryPolicy(tracemalloc=True), str(tmp_path))
+    bounds.start(flow_mod.BFSNodeFlow())
+    blob = [bytearray(1 << 20)]
+    bounds.sample(1)
+    del blob
+    bounds.sample(1)
+    bounds.sample(2)
+    bounds.stop()
+
+    report = bounds.report()
+    assert report["by_level"]["1"]["nodes"] == 2
+    assert report["by_level"]["1"]["peak_bytes"] >= 1 << 20
+    assert report["peak_bytes"] >= report["by_level"]["2"]["peak_bytes"]
+
+
+def test_bounded_frontier_run_keeps_stubs(monkeypatch, tmp_path):
+    monkeypatch.setattr(flow_mod, "ManagerCrew", FakeManagerCrew)
+    monkeypatch.setattr(flow_mod, "DesignerCrew", FakeDesignerCrew)
+    monkeypatch.setattr(flow_mod, "ReviewerCrew", FakeCrew)
+    monkeypatch.setattr(flow_mod, "WriterCrew", FakeCrew)
+    monkeypatch.setattr(flow_mod.random, "randint", lambda a, b: 2)
+
+    flow = _build_flow(deque([_build_root()]))
+    flow.state.output_path = str(tmp_path)
+    flow._memory = MemoryBounds(
+        MemoryPolicy(bounded=True, method_history=2), str(tmp_path)
+    )
+    flow._memory.start(flow)
+
+    asyncio.run(flow.run_frontier())
+
+    visited = list(flow.state.visited_queue)
+    assert len(visited) == 7
+    assert all(n.children == [] and n.parent is None for n in visited)
+    assert all(n.status == WorkStatus.DONE for n in visited)
+    assert flow._method_outputs.maxlen == 2
+
+    payloads = [json.loads(line) for line in open(tmp_path / PAYLOAD_FILE)]
+    assert [p["path"] for p in payloads] == [n.path for n in visited]
+    assert [len(p["children"]) for p in payloads[:3]] == [2, 2, 2]
+    report = json.load(open(tmp_path / MEMORY_FILE))
+    assert report["nodes_stubbed"] == 7
+
+
+def test_crewai_internals_trimmed_by_bounded_mode_exist():
+    # Private crewai attributes; fails when a crewai upgrade renames or removes them
+    assert missing_runtime_internals(flow_mod.BFSNodeFlow()) == []
+
+
+def test_missing_internals_are_skipped(monkeypatch, tmp_path):
+    monkeypatch.setattr(memory_bounds.crew_project_utils, "cache", SimpleNamespace())
+    bounds = MemoryBounds(MemoryPolicy(bounded=True), str(tmp_path))
+
+    stub = bounds.release(_build_root())
+
+    assert stub.title == "Root"
+    assert bounds.report()["memoized_dropped"] == 0
+    bounds.stop()
+
+
+def test_release_crew_evicts_only_that_crews_memoized_results(tmp_path):
+    class Builder:
+        @memoize
+        def agent(self):
+            return object()
+
+        @memoize
+        def crew(self):
+            return SimpleNamespace(agent=self.agent())
+
+    bounds = MemoryBounds(MemoryPolicy(bounded=True), str(tmp_path))
+    finished, building = Builder(), Builder()
+    crew = finished.crew()
+    agent = building.agent()
+
+    bounds.release_crew(crew)
+
+    # A crew still being built keeps its memoized agent
+    assert building.agent() is agent
+    assert finished.crew() is not crew
+    assert bounds.report()["memoized_dropped"] == 2
+    bounds.stop()
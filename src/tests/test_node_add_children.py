@@ -0,0 +1,78 @@
+import sys
+import os
+
+import pytest
+
+# Adjust path to include src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from src.enums.work_status_enum import WorkStatus
+from src.generic.node import Node
+
+
+def _root() -> Node:
+    return Node(
+        title="Root",
+        depth_limit=2,
+        level_titles=["Vision", "Zone", "Feature"],
+        level_statuses={0: WorkStatus.INITIALIZING, 1: WorkStatus.PENDING},
+        status=WorkStatus.INITIALIZING,
+    )
+
+
+def test_add_children_matches_add_child():
+    single, bulk = _root(), _root()
+    single.add_child(title="Zone A", description="a")
+    single.add_child()
+    single.add_child(title="Zone C")
+    bulk.add_children(["Zone A", None, "Zone C"], ["a", None, None])
+
+    for expected, actual in zip(single.children, bulk.children):
+        assert actual.title == expected.title
+        assert actual.description == expected.description
+        assert actual.path == expected.path
+        assert actual.level == expected.level
+        assert actual.status == expected.status
+        assert actual.parent is bulk
+        assert actual.get_title_for_level(2) == "Feature"
+    assert len({c.id for c in bulk.children}) == 3
+
+
+def test_add_children_appends_after_existing_children():
+    root = _root()
+    root.add_child(title="Zone A")
+    zones = root.add_children(["Zone B", "Zone C"])
+
+    assert [z.path for z in zones] == ["0->1", "0->2"]
+    assert [f.path for f in zones[1].add_children(["F1", "F2"])] == [
+        "0->2->0",
+        "0->2->1",
+    ]
+
+
+def test_add_children_validates_depth_and_lengths():
+    root = _root()
+    feature = root.add_children(["Zone"])[0].add_children(["Feature"])[0]
+
+    with pytest.raises(ValueError):
+        feature.add_children(["Too deep"])
+    with pytest.raises(ValueError):
+        root.add_children(["Zone"], ["one", "two"])
+
+
+def test_children_share_the_root_level_config():
+    root = _root()
+    zone = root.add_child(title="Zone")
+    feature = zone.add_children(["Feature"])[0]
+
+    for node in (zone, feature):
+        assert node.level_titles_map is root.level_titles_map
+        assert node.level_statuses_map is root.level_statuses_map
+        assert node.level_titles is root.level_titles
+    assert feature.__pydantic_fields_set__ is zone.__pydantic_fields_set__
+    feature.mark_done()
+    assert zone.finished_at is None
+    assert zone.status == WorkStatus.PENDING
@@ -0,0 +1,82 @@
+import sys
+import os
+from collections import deque
+
+import pytest
+
+# Adjust path to include src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from src.enums.work_status_enum import WorkStatus
+from src.generic.node import Node
+from src.state.node_scheduler import NodeScheduler
+from src.state.node_state import NodeState
+
+
+def _tree():
+    """Root with zones A (score 0.5) and B (score 1.0), and two features under A."""
+    root = Node(
+        title="Root",
+        depth_limit=2,
+        level_titles=["Vision", "Zone", "Feature"],
+        status=WorkStatus.INITIALIZING,
+    )
+    zone_a, zone_b = root.add_children(["A", "B"], ["long description " * 20, None])
+    zone_a.score, zone_b.score = 0.5, 1.0
+    features = zone_a.add_children(["A1", "A2"])
+    return root, [zone_a, zone_b, *features]
+
+
+def _order(policy, nodes):
+    scheduler = NodeScheduler(policy, nodes)
+    return [scheduler.popleft().title for _ in range(len(nodes))]
+
+
+def test_policies_order_the_frontier():
+    _, nodes = _tree()
+
+    assert _order("bfs", nodes) == ["A", "B", "A1", "A2"]
+    assert _order("dfs", nodes) == ["A", "A1", "A2", "B"]
+    # Equal scores (the unscored features) keep their queue order
+    assert _order("best_first", nodes) == ["B", "A", "A1", "A2"]
+    assert _order("cheapest", nodes) == ["B", "A1", "A2", "A"]
+    assert _order("shallowest_subtree", nodes) == ["A", "B", "A1", "A2"]
+
+    with pytest.raises(ValueError, match="Unknown scheduler policy"):
+        NodeScheduler("lifo")
+
+
+def test_each_policy_pops_in_its_own_order_not_queue_order():
+    root, (zone_a, zone_b, a1, a2) = _tree()
+    (b1,) = zone_b.add_children(["B1"])
+    zone_a.prompt_tokens = 100
+    a2.score = 0.8
+    # Queued out of tree order, so only bfs pops in queue order
+    queued = [b1, zone_a, a1, zone_b, a2]
+
+    assert _order("bfs", queued) == ["B1", "A", "A1", "B", "A2"]
+    assert _order("dfs", queued) == ["A", "A1", "A2", "B", "B1"]
+    assert _order("best_first", queued) == ["B", "A2", "A", "B1", "A1"]
+    # B's children inherit less than A's; A1/A2 cost the same, A2 scores higher
+    assert _order("cheapest", queued) == ["B", "B1", "A", "A2", "A1"]
+    assert _order("shallowest_subtree", queued) == ["A", "B", "A1", "A2", "B1"]
+
+
+def test_deque_api_and_state_coercion():
+    root, nodes = _tree()
+    scheduler = NodeScheduler("dfs", [root])
+    scheduler.extend(nodes)
+
+    assert len(scheduler) == 5 and scheduler[0] is root
+    assert [n.title for n in scheduler] == ["Root", "A", "A1", "A2", "B"]
+    assert scheduler.popleft() is root
+    assert scheduler.stats()["max_size"] == 5
+
+    # A deque (older callers, checkpoint resume) becomes a FIFO scheduler
+    state = NodeState(work_queue=deque(nodes))
+    assert isinstance(state.work_queue, NodeScheduler)
+    assert state.work_queue.policy == "bfs"
+    assert [n["title"] for n in state.model_dump()["work_queue"]] == ["A", "B", "A1", "A2"]
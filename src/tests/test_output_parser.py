@@ -0,0 +1,86 @@
+import sys
+import os
+
+import pytest
+
+# Adjust path to include src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from src.generic import llm_utils
+from src.llm_completion.output_parser import (
+    StructuredOutputError,
+    component_extractor,
+    decision_extractor,
+    extract_payload,
+    parse_designer_output,
+    parse_manager_output,
+    parse_reviewer_output,
+    strip_trailing_commas,
+)
+
+
+def test_parses_recorded_fixtures():
+    manager = parse_manager_output(llm_utils.manager_crew_response)
+    assert manager.project_brief.startswith("The fitness system")
+
+    # Closing fence only, and the agent-name-keyed variant
+    balanced = parse_designer_output(llm_utils.designer_crew_balanced_pydantic)
+    assert balanced.agent_name == "balanced_product_designer"
+    nested = parse_designer_output(llm_utils.designer_crew_conservative_json)
+    assert nested.agent_name == "conservative_product_designer"
+    assert nested.is_approved is True
+
+    decisions = parse_reviewer_output(llm_utils.reviewer_crew_response)
+    assert [d.is_approved for d in decisions] == [False, True, True]
+
+
+def test_tolerates_prose_fences_and_trailing_commas():
+    raw = (
+        "Sure, here is the design:\n```json\n"
+        '{"agent_name": "a", "components": [{"name": "n", "description": "x, ]",},],}\n'
+        "```\nLet me know if you need more."
+    )
+    design = parse_designer_output(raw)
+    assert design.components[0].description == "x, ]"
+
+    manager = parse_manager_output(
+        "Here is the plan.\nproject_brief: Brief\n"
+        "designer_instructions: Do it\ndesigner_expected_outputs: Components\n"
+    )
+    assert manager.designer_instructions == "Do it"
+
+    assert extract_payload("```yaml\na: 1\n") == ("yaml", "a: 1\n")
+    assert strip_trailing_commas('{"a": "b,}", "c": [1,2,],}') == '{"a": "b,}", "c": [1,2]}'
+
+
+def test_errors_carry_a_preview():
+    with pytest.raises(StructuredOutputError, match="Raw output preview: no json"):
+        parse_designer_output("no json here")
+    with pytest.raises(StructuredOutputError, match="DesignerCompletionJson"):
+        parse_designer_output('{"agent_name": "a"}')
+
+
+def test_incremental_extractor_emits_components_as_they_close():
+    raw = llm_utils.designer_crew_conservative_json
+    components = []
+    extractor = component_extractor(components.append)
+    closed_at = []
+    for i in range(0, len(raw), 16):
+        extractor.feed(raw[i : i + 16])
+        closed_at.append(len(components))
+
+    expected = parse_designer_output(raw).components
+    assert [c.name for c in components] == [c.name for c in expected]
+    # The first component was available long before the last chunk
+    assert closed_at.index(1) < len(closed_at) // 2
+
+    decisions = []
+    extractor = decision_extractor(decisions.append)
+    extractor.feed('Review:\n[{"agent_name": "a", "is_approved": true, "components": []},')
+    assert [d.agent_name for d in decisions] == ["a"]
+    extractor.reset()
+    extractor.feed('[{"agent_name": "b, \\"}", "is_approved": false, "components": []}]')
+    assert [d.agent_name for d in decisions] == ["a", 'b, "}']
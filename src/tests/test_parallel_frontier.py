@@ -0,0 +1,171 @@
+import asyncio
+import json
+import sys
+import os
+from collections import deque
+from types import SimpleNamespace
+
+# Adjust path to include src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+import src.flows.bfs_node_flow as flow_mod
+from src.flows.expansion_policy import ExpansionPolicy
+from src.enums.work_status_enum import WorkStatus
+from src.generic.node import Node
+
+MANAGER_RAW = """
+project_brief: Brief
+designer_instructions: Instructions
+designer_expected_outputs: Outputs
+"""
+
+DESIGNER_RAW = json.dumps(
+    {
+        "agent_name": "balanced_product_designer",
+        "components": [{"name": "Core", "description": "Core component"}],
+    }
+)
+
+
+class FakeManagerCrew:
+    def __init__(self, llm_name=None):
+        pass
+
+    def crew(self):
+        return self
+
+    def kickoff(self, inputs=None):
+        return SimpleNamespace(raw=MANAGER_RAW)
+
+
+class FakeDesignerCrew:
+    def __init__(self, **kwargs):
+        pass
+
+    def crew(self):
+        return self
+
+    def kickoff(self, inputs=None):
+        return SimpleNamespace(
+            tasks_output=[SimpleNamespace(pydantic=None, raw=DESIGNER_RAW)]
+        )
+
+
+class FakeCrew:
+    def __init__(self, llm_name=None):
+        pass
+
+    def crew(self):
+        return self
+
+    def kickoff(self, inputs=None):
+        return SimpleNamespace(raw="ok")
+
+
+def _build_root() -> Node:
+    return Node(
+        title="Root",
+        depth_limit=2,
+        level_titles=["Vision", "Zone", "Feature"],
+        status=WorkStatus.INITIALIZING,
+    )
+
+
+def _build_flow(work_queue) -> flow_mod.BFSNodeFlow:
+    flow = flow_mod.BFSNodeFlow()
+    # Tree shape from the patched randint, not from the reviewer
+    flow._expansion_policy = ExpansionPolicy(mode="random")
+    flow.state.max_concurrency = 4
+    flow.state.work_queue = work_queue
+    return flow
+
+
+def test_parallel_frontier_enqueues_children_in_order(monkeypatch):
+    monkeypatch.setattr(flow_mod, "ManagerCrew", FakeManagerCrew)
+    monkeypatch.setattr(flow_mod, "DesignerCrew", FakeDesignerCrew)
+    monkeypatch.setattr(flow_mod, "ReviewerCrew", FakeCrew)
+    monkeypatch.setattr(flow_mod, "WriterCrew", FakeCrew)
+    monkeypatch.setattr(flow_mod.random, "randint", lambda a, b: 2)
+
+    root = _build_root()
+    flow = _build_flow(deque([root]))
+
+    asyncio.run(flow.run_frontier())
+
+    visited = list(flow.state.visited_queue)
+    # 1 root + 2 zones + 4 features
+    assert len(visited) == 7
+    assert [n.path for n in visited] == [
+        "0",
+        "0->0",
+        "0->1",
+        "0->0->0",
+        "0->0->1",
+        "0->1->0",
+        "0->1->1",
+    ]
+    assert all(n.status == WorkStatus.DONE for n in visited)
+    assert not flow.state.work_queue
+
+
+def test_take_frontier_stops_at_level_boundary():
+    root = _build_root()
+    zone = root.add_child(title="Zone")
+    feature = zone.add_child(title="Feature")
+    flow = _build_flow(deque([root, zone, feature]))
+
+    batch = flow._take_frontier(4)
+
+    assert batch == [root]
+    assert list(flow.state.work_queue) == [zone, feature]
+
+
+class EmptyDesignerCrew(FakeDesignerCrew):
+    def kickoff(self, inputs=None):
+        return SimpleNamespace(tasks_output=[])
+
+
+def test_missing_stage_inputs_fail_only_that_node(monkeypatch):
+    monkeypatch.setattr(flow_mod, "ManagerCrew", FakeManagerCrew)
+    monkeypatch.setattr(flow_mod, "DesignerCrew", EmptyDesignerCrew)
+    monkeypatch.setattr(flow_mod, "ReviewerCrew", FakeCrew)
+    monkeypatch.setattr(flow_mod, "WriterCrew", FakeCrew)
+
+    root = _build_root()
+    zones = root.add_children(["Zone A", "Zone B"])
+    flow = _build_flow(deque(zones))
+
+    asyncio.run(flow.run_frontier())
+
+    visited = list(flow.state.visited_queue)
+    assert [n.title for n in visited] == ["Zone A", "Zone B"]
+    assert all(n.status == WorkStatus.FAILED for n in visited)
+
+
+
+def test_sub_nodes_are_managed_from_their_own_title_and_description(monkeypatch):
+    visions = []
+
+    class RecordingManagerCrew(FakeManagerCrew):
+        def kickoff(self, inputs=None):
+            visions.append(inputs["vision"])
+            return super().kickoff(inputs)
+
+    monkeypatch.setattr(flow_mod, "ManagerCrew", RecordingManagerCrew)
+    monkeypatch.setattr(flow_mod, "DesignerCrew", FakeDesignerCrew)
+    monkeypatch.setattr(flow_mod, "ReviewerCrew", FakeCrew)
+    monkeypatch.setattr(flow_mod, "WriterCrew", FakeCrew)
+    monkeypatch.setattr(flow_mod.random, "randint", lambda a, b: 0)
+
+    root = _build_root()
+    # A zone of another tree, so expanding root doesn't enqueue it a second time
+    zone = _build_root().add_child(title="Zone A", description="Kitchen devices")
+    zone.status = WorkStatus.PENDING
+    flow = _build_flow(deque([root, zone]))
+    flow.state.project_vision = "Smart home vision"
+    asyncio.run(flow.run_frontier())
+
+    assert sorted(visions) == ["Smart home vision", "Zone A\nKitchen devices"]
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import sys
+import os
+from collections import deque
+
+# Adjust path to include src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+import src.flows.bfs_node_flow as flow_mod
+from src.enums.work_status_enum import WorkStatus
+from src.flows.artifact_writer import ArtifactPolicy, ArtifactWriter
+from src.flows.plan_index import PlanIndex, export_run, prefix_range
+from src.llm_completion.designer_completion import DesignerCompletionJson
+from src.state.node_context import NodeContext
+from src.tests.test_parallel_frontier import (
+    DESIGNER_RAW,
+    FakeCrew,
+    FakeDesignerCrew,
+    FakeManagerCrew,
+    _build_flow,
+    _build_root,
+)
+
+
+def _run_flow(monkeypatch, tmp_path, artifacts: bool = False):
+    monkeypatch.setattr(flow_mod, "ManagerCrew", FakeManagerCrew)
+    monkeypatch.setattr(flow_mod, "DesignerCrew", FakeDesignerCrew)
+    monkeypatch.setattr(flow_mod, "ReviewerCrew", FakeCrew)
+    monkeypatch.setattr(flow_mod, "WriterCrew", FakeCrew)
+    monkeypatch.setattr(flow_mod.random, "randint", lambda a, b: 2)
+
+    flow = _build_flow(deque([_build_root()]))
+    flow._plan_index = PlanIndex(str(tmp_path / "plan.sqlite"))
+    if artifacts:
+        flow._artifacts = ArtifactWriter(ArtifactPolicy(), str(tmp_path))
+    asyncio.run(flow.run_frontier())
+    return flow
+
+
+def test_prefix_range_bounds_the_subtree():
+    low, high = prefix_range("0->1")
+    inside = ["0->1->0", "0->1->9->3"]
+    outside = ["0->1", "0->10", "0->2", "0->1-"]
+    assert all(low <= p < high for p in inside)
+    assert not any(low <= p < high for p in outside)
+
+
+def test_flow_upserts_nodes_and_components(monkeypatch, tmp_path):
+    flow = _run_flow(monkeypatch, tmp_path)
+    index = flow._plan_index
+
+    assert index.stats()["nodes_upserted"] >= 7
+    features = index.descendants("0->1", level=2)
+    assert [n["path"] for n in features] == ["0->1->0", "0->1->1"]
+    assert all(n["status"] == WorkStatus.DONE.value for n in features)
+    assert len(index.by_status(WorkStatus.DONE)) == 7
+
+    zone = index.descendants("0", level=1)[0]
+    assert zone["parent_id"] is not None
+    components = index.components(zone["parent_id"])
+    # Three designer crews, one component each
+    assert [c["name"] for c in components] == ["Core"] * 3
+
+
+def test_failed_review_finds_disapproved_and_failed_nodes(tmp_path):
+    index = PlanIndex(str(tmp_path / "plan.sqlite"))
+    root = _build_root()
+    zones = root.add_children(["Rejected", "Broken", "Fine"])
+    design = DesignerCompletionJson.model_validate_json(DESIGNER_RAW)
+
+    rejected = NodeContext(item=zones[0], designer_outputs=[design])
+    rejected.reviewer_decisions = [design.model_copy(update={"is_approved": False})]
+    zones[1].status = WorkStatus.FAILED
+    broken = NodeContext(item=zones[1], error="Reviewer: timed out")
+    fine = NodeContext(item=zones[2], designer_outputs=[design])
+    fine.reviewer_decisions = [design.model_copy(update={"is_approved": True})]
+    for ctx in (rejected, broken, fine):
+        index.submit(ctx.item, ctx)
+    index.close()
+
+    assert [n["title"] for n in index.failed_review()] == ["Rejected", "Broken"]
+    assert [c["approved"] for c in index.components(zones[0].id)] == [0]
+
+
+def test_export_run_rebuilds_index_from_artifacts(monkeypatch, tmp_path):
+    flow = _run_flow(monkeypatch, tmp_path, artifacts=True)
+
+    exported = export_run(str(tmp_path), str(tmp_path / "exported.sqlite"))
+
+    live = flow._plan_index
+    assert [n["path"] for n in exported.descendants("0")] == [
+        n["path"] for n in live.descendants("0")
+    ]
+    with open(flow._artifacts.shard_path(0), encoding="utf-8") as f:
+        root_id = json.loads(f.readline())["node_id"]
+    assert len(exported.components(root_id)) == 3
@@ -0,0 +1,161 @@
+import json
+import sys
+import os
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from crewai import BaseLLM
+
+# Adjust path to include src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from src.generic.rate_limiter import (
+    DeploymentController,
+    RateLimitedLLM,
+    TokenBucket,
+    is_throttle_error,
+)
+
+
+class StandInEndpoint(BaseHTTPRequestHandler):
+    """Chat-completions stand-in: the first `throttle_first` requests get a 429."""
+
+    throttle_first = 0
+    lock = threading.Lock()
+    seen = 0
+    active = 0
+    max_active = 0
+
+    def do_POST(self):
+        cls = type(self)
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with cls.lock:
+            cls.seen += 1
+            throttled = cls.seen <= cls.throttle_first
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+        try:
+            if throttled:
+                self.send_response(429)
+                self.send_header("Retry-After", "0")
+                self.end_headers()
+                return
+            body = json.dumps({"choices": [{"message": {"content": "ok"}}]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+class HttpLLM(BaseLLM):
+    def __init__(self, url: str):
+        super().__init__(model="stand-in", temperature=0)
+        self.url = url
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        request = urllib.request.Request(
+            self.url, data=json.dumps({"messages": messages}).encode(), method="POST"
+        )
+        with urllib.request.urlopen(request) as response:
+            return json.load(response)["choices"][0]["message"]["content"]
+
+
+@pytest.fixture
+def endpoint():
+    StandInEndpoint.seen = StandInEndpoint.active = StandInEndpoint.max_active = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInEndpoint)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/chat/completions"
+    server.shutdown()
+
+
+def test_token_bucket_wait_time():
+    bucket = TokenBucket(per_minute=60)
+    t0 = bucket._updated
+    bucket.take(60, now=t0)
+    assert bucket.wait_time(1, now=t0) == pytest.approx(1.0)
+    assert bucket.wait_time(1, now=t0 + 1.0) == 0.0
+    # A request bigger than the bucket only waits for a full bucket
+    assert bucket.wait_time(600, now=t0 + 30.0) == pytest.approx(30.0)
+
+
+def test_aimd_halves_once_per_burst_and_grows_additively():
+    controller = DeploymentController("gpt", initial_concurrency=8, cooldown_seconds=60)
+    for _ in range(3):
+        controller.acquire(10)
+    for _ in range(3):
+        controller.release(10, None, throttled=True)
+    assert controller.limit == 4.0
+    assert controller.throttles == 3
+
+    for _ in range(4):
+        controller.acquire(10)
+        controller.release(10, 10)
+    assert controller.limit == pytest.approx(5.0, abs=0.1)
+
+
+def test_stand_in_429s_shrink_concurrency_and_retries_are_readmitted(endpoint):
+    StandInEndpoint.throttle_first = 4
+    controller = DeploymentController(
+        "stand-in",
+        requests_per_minute=6000,
+        initial_concurrency=8,
+        cooldown_seconds=0,
+        expected_completion_tokens=10,
+    )
+    llm = RateLimitedLLM(HttpLLM(endpoint), controller)
+    results = []
+
+    def worker():
+        for _ in range(3):
+            # crewai's BaseLLM retry re-enters RateLimitedLLM.call for each attempt
+            results.append(llm.call("hello"))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = controller.stats()
+    assert results == ["ok"] * 24
+    assert stats["throttles"] == 4
+    assert stats["successes"] == 24
+    assert StandInEndpoint.seen == 28
+    assert stats["in_flight"] == 0
+    # Halved on the 429s, then regrowing by ~1 per `limit` successes
+    assert stats["concurrency_limit"] < 8
+    assert StandInEndpoint.max_active <= 8
+
+
+def test_is_throttle_error_shapes():
+    class RateLimitError(Exception):
+        pass
+
+    class StatusError(Exception):
+        def __init__(self, status_code):
+            super().__init__(f"HTTP {status_code}")
+            self.status_code = status_code
+
+    assert is_throttle_error(RateLimitError("slow down"))
+    assert is_throttle_error(StatusError(429))
+    wrapped = ValueError("Azure call failed")
+    wrapped.__cause__ = StatusError(429)
+    assert is_throttle_error(wrapped)
+    assert not is_throttle_error(ValueError("bad request"))
+    # Only status codes and types count, not a 429 quoted in the message
+    assert not is_throttle_error(StatusError(400))
+    assert not is_throttle_error(Exception("Error code: 429 - Too Many Requests"))
+    assert not is_throttle_error(ValueError("order #4291 exceeds the rate limit"))
@@ -0,0 +1,95 @@
+import sys
+import os
+import json
+
+# Adjust path to include src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from src.flows.run_budget import BudgetController, RunBudget
+from src.generic.token_usage import TokenUsage
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_unlimited_budget_never_cuts():
+    controller = BudgetController(RunBudget())
+    assert not controller.budget.limited
+    controller.charge(TokenUsage(requests=1000, prompt_tokens=10**6))
+    assert controller.phase() == "normal"
+    assert controller.children_allowed(1, 3) == 3
+    assert controller.designer_variants() == ["creative", "balanced", "conservative"]
+
+
+def test_phases_follow_the_tightest_budget():
+    controller = BudgetController(RunBudget(max_llm_calls=10, max_tokens=1000))
+    controller.charge(TokenUsage(requests=2, prompt_tokens=600))
+    # 80% of calls left but only 40% of tokens
+    assert controller.phase() == "reduced"
+    assert controller.children_allowed(1, 3) == 2
+    assert controller.designer_variants() == ["balanced", "conservative"]
+
+    controller.charge(TokenUsage(requests=1, prompt_tokens=250))
+    assert controller.phase() == "minimal"
+    assert controller.children_allowed(1, 3) == 1
+    assert controller.designer_variants() == ["balanced"]
+
+    controller.charge(TokenUsage(requests=1, completion_tokens=200))
+    assert controller.exhausted()
+    assert controller.children_allowed(1, 3) == 0
+    assert [phase for _, phase in controller.transitions] == ["reduced", "minimal", "exhausted"]
+    assert controller.children_cut == 1 + 2 + 3
+    assert controller.designers_skipped == 1 + 2
+
+
+def test_kickoffs_count_as_calls_without_usage():
+    controller = BudgetController(RunBudget(max_llm_calls=2))
+    controller.charge(TokenUsage(kickoffs=1))
+    controller.charge(TokenUsage(kickoffs=1))
+    assert controller.exhausted()
+
+
+def test_deadline_uses_the_clock():
+    clock = FakeClock()
+    controller = BudgetController(RunBudget(deadline_seconds=10), clock=clock)
+    assert controller.phase() == "normal"
+    clock.now = 6
+    assert controller.phase() == "reduced"
+    clock.now = 9
+    assert controller.phase() == "minimal"
+    clock.now = 10
+    assert controller.exhausted()
+
+
+def test_nodes_per_level_cap_reserves_children():
+    controller = BudgetController(RunBudget(max_nodes_per_level={2: 3}))
+    assert controller.budget.limited
+    assert controller.children_allowed(2, 2) == 2
+    assert controller.children_allowed(2, 2) == 1
+    assert controller.children_allowed(2, 2) == 0
+    assert controller.children_allowed(3, 2) == 2
+    assert controller.report()["nodes_per_level"] == {"2": 3, "3": 2}
+
+
+def test_report_is_written(tmp_path):
+    controller = BudgetController(RunBudget(max_llm_calls=1))
+    controller.charge(TokenUsage(requests=1))
+    controller.exhausted()
+
+    class Queued:
+        id, path, level, title = "n1", "0.1", 1, "Sleep Monitor"
+
+    controller.record_unexpanded(Queued())
+    path = controller.write(str(tmp_path))
+    report = json.load(open(path))
+    assert report["phase"] == "exhausted"
+    assert report["consumed"]["llm_calls"] == 1
+    assert report["nodes_unexpanded"][0]["title"] == "Sleep Monitor"
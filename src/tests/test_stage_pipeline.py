@@ -0,0 +1,62 @@
+import asyncio
+import sys
+import os
+from collections import deque
+
+# Adjust path to include src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from src.flows.pipeline import StagePipeline
+
+
+def test_pipeline_overlaps_stages_and_preserves_order():
+    trace = []
+
+    def stage(name, delay):
+        async def run(item):
+            trace.append((name, item["id"], "start"))
+            await asyncio.sleep(delay)
+            item["stages"].append(name)
+            trace.append((name, item["id"], "end"))
+
+        return run
+
+    completed = []
+    source = deque([1, 2, 3])
+
+    def on_complete(item):
+        completed.append(item["id"])
+        # First item expands into two children, like run_writer does
+        if item["id"] == 1:
+            source.extend([4, 5])
+
+    pipeline = StagePipeline(
+        stages=[("manager", stage("manager", 0.01)), ("writer", stage("writer", 0.02))],
+        queue_size=1,
+    )
+    asyncio.run(
+        pipeline.run(
+            source,
+            make_item=lambda node_id: {"id": node_id, "stages": []},
+            on_complete=on_complete,
+        )
+    )
+
+    assert completed == [1, 2, 3, 4, 5]
+    # Item 2 entered the manager stage before item 1 left the writer stage
+    assert trace.index(("manager", 2, "start")) < trace.index(("writer", 1, "end"))
+    assert pipeline.metrics["manager"].processed == 5
+    assert pipeline.metrics["writer"].processed == 5
+    assert pipeline.bottleneck() == "writer"
+
+    summary = pipeline.summary()
+    assert 0 < summary["writer"]["occupancy"] <= 1
+
+
+def test_pipeline_with_empty_source_finishes():
+    pipeline = StagePipeline(stages=[("only", lambda item: asyncio.sleep(0))])
+    metrics = asyncio.run(pipeline.run(deque(), lambda x: x, lambda x: None))
+    assert metrics["only"].processed == 0
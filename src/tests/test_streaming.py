@@ -0,0 +1,34 @@
+import sys
+import os
+
+# Adjust path to include src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from src.generic import llm_utils
+from src.generic.streaming import StreamConsumer, stream_into
+from src.llm_completion.output_parser import component_extractor
+from src.tests.fake_crewai_llm import MockLLM
+
+
+def test_chunks_of_calls_in_context_reach_the_sink():
+    llm = MockLLM(
+        responses=[llm_utils.designer_crew_creative_pydantic], stream_chunk_chars=32
+    )
+    components = []
+    consumer = StreamConsumer(component_extractor(components.append))
+
+    with stream_into(consumer):
+        response = llm.call("design")
+        llm.call("design again")
+    assert consumer.chunks > 2 * (len(response) // 32)
+    # The second call restarted the extractor: each component twice, never garbled
+    names = [c.name for c in components]
+    assert names[: len(names) // 2] == names[len(names) // 2 :]
+    assert names[0] == "User Profile Management"
+
+    # Outside the context nothing is routed
+    llm.call("design")
+    assert len(components) == len(names)
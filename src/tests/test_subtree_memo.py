@@ -0,0 +1,122 @@
+import asyncio
+import sys
+import os
+from collections import deque
+
+# Adjust path to include src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+import src.flows.bfs_node_flow as flow_mod
+from src.enums.work_status_enum import WorkStatus
+from src.flows.subtree_memo import SubtreeMemo, prompts_digest
+from src.tests.test_parallel_frontier import (
+    FakeCrew,
+    FakeDesignerCrew,
+    FakeManagerCrew,
+    _build_flow,
+    _build_root,
+)
+
+
+class CountingManagerCrew(FakeManagerCrew):
+    kickoffs = 0
+
+    def kickoff(self, inputs=None):
+        CountingManagerCrew.kickoffs += 1
+        return super().kickoff(inputs)
+
+
+def _run(monkeypatch, memo_path: str, vision: str, settings=None):
+    monkeypatch.setattr(flow_mod, "ManagerCrew", CountingManagerCrew)
+    monkeypatch.setattr(flow_mod, "DesignerCrew", FakeDesignerCrew)
+    monkeypatch.setattr(flow_mod, "ReviewerCrew", FakeCrew)
+    monkeypatch.setattr(flow_mod, "WriterCrew", FakeCrew)
+    monkeypatch.setattr(flow_mod.random, "randint", lambda a, b: 2)
+    CountingManagerCrew.kickoffs = 0
+
+    flow = _build_flow(deque([_build_root()]))
+    flow.state.project_vision = vision
+    flow._subtree_memo = SubtreeMemo(memo_path, settings=settings or {})
+    asyncio.run(flow.run_frontier())
+    flow._subtree_memo.close()
+    return flow
+
+
+def test_unchanged_run_is_grafted_without_llm_calls(monkeypatch, tmp_path):
+    memo_path = str(tmp_path / "subtree_memo.jsonl")
+    first = _run(monkeypatch, memo_path, "vision v1")
+    assert CountingManagerCrew.kickoffs == 7
+    assert first._subtree_memo.stats()["stored"] == 7
+
+    second = _run(monkeypatch, memo_path, "vision v1")
+
+    assert CountingManagerCrew.kickoffs == 0
+    assert second._subtree_memo.stats()["hits"] == 7
+    assert sorted(n.path for n in second.state.visited_queue) == sorted(
+        n.path for n in first.state.visited_queue
+    )
+    assert all(n.status == WorkStatus.DONE for n in second.state.visited_queue)
+    # Keys and lineages are evicted once no queued node needs them
+    stats = second._subtree_memo.stats()
+    assert (stats["cached_keys"], stats["cached_lineages"]) == (0, 0)
+
+
+def test_changed_vision_recomputes_only_the_root(monkeypatch, tmp_path):
+    memo_path = str(tmp_path / "subtree_memo.jsonl")
+    _run(monkeypatch, memo_path, "vision v1")
+
+    flow = _run(monkeypatch, memo_path, "vision v2")
+
+    # The root proposes the same zones again, whose subtrees are grafted
+    assert CountingManagerCrew.kickoffs == 1
+    stats = flow._subtree_memo.stats()
+    assert (stats["hits"], stats["misses"]) == (6, 1)
+    assert len(flow.state.visited_queue) == 7
+
+
+def test_changed_settings_miss(monkeypatch, tmp_path):
+    memo_path = str(tmp_path / "subtree_memo.jsonl")
+    _run(monkeypatch, memo_path, "vision v1")
+
+    _run(monkeypatch, memo_path, "vision v1", settings={"llm_type": {"manager_crew": "gpt5"}})
+
+    assert CountingManagerCrew.kickoffs == 7
+
+
+def test_keys_cover_ancestor_context(tmp_path):
+    memo = SubtreeMemo(str(tmp_path / "memo.jsonl"), settings={})
+    root_a, root_b = _build_root(), _build_root()
+    root_b.title = "Other Root"
+    zone_a = root_a.add_child(title="Zone")
+    zone_b = root_b.add_child(title="Zone")
+
+    assert memo.key_for(zone_a, "v") != memo.key_for(zone_b, "v")
+    # Only the root's key depends on the vision
+    assert memo.key_for(root_a, "v") != memo.key_for(_build_root(), "w")
+    assert len(prompts_digest()) == 64
+    memo.close()
+
+
+def test_resumed_nodes_are_keyed_before_release(tmp_path):
+    def tree():
+        root = _build_root()
+        root.description = "Root text"
+        zone = root.add_child(title="Zone", description="Zone text")
+        feature = zone.add_child(title="Feature")
+        return root, zone, feature
+
+    fresh = SubtreeMemo(str(tmp_path / "fresh.jsonl"), settings={})
+    expected = fresh.key_for(tree()[2], "v")
+
+    memo = SubtreeMemo(str(tmp_path / "memo.jsonl"), settings={})
+    root, zone, feature = tree()
+    memo.resumed([root, zone])
+    # What bounded memory mode's release strips from finished nodes
+    root.description = zone.description = None
+
+    assert memo.key_for(feature, "v") == expected
+    fresh.close()
+    memo.close()
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import sys
+import os
+from collections import deque
+from types import SimpleNamespace
+
+# Adjust path to include src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+import src.flows.bfs_node_flow as flow_mod
+from src.generic.token_usage import TokenUsage, UsageLedger, usage_from_result
+from src.tests.test_parallel_frontier import (
+    FakeDesignerCrew,
+    FakeManagerCrew,
+    _build_root,
+)
+
+USAGE = SimpleNamespace(prompt_tokens=100, completion_tokens=20, successful_requests=1)
+
+
+class MeteredCrew:
+    def __init__(self, llm_name=None):
+        pass
+
+    def crew(self):
+        return self
+
+    def kickoff(self, inputs=None):
+        return SimpleNamespace(raw="ok", token_usage=USAGE)
+
+
+def test_ledger_aggregates_by_crew_and_level_with_prices():
+    ledger = UsageLedger(prices={"gpt5": {"prompt": 1.0, "completion": 10.0}})
+    ledger.record("writer_crew", "gpt5", 1, TokenUsage(prompt_tokens=1000, completion_tokens=100, kickoffs=1))
+    ledger.record("writer_crew", "mock", 2, TokenUsage(prompt_tokens=500, kickoffs=1))
+    ledger.record("reviewer_crew", "gpt5", 1, TokenUsage(prompt_tokens=0, completion_tokens=1000, kickoffs=1))
+
+    report = ledger.report()
+    assert report["total"]["total_tokens"] == 2600
+    assert report["total"]["cost"] == round((1000 * 1.0 + 100 * 10.0 + 1000 * 10.0) / 1e6, 6)
+    assert report["by_crew"]["writer_crew"]["prompt_tokens_per_kickoff"] == 750.0
+    assert report["by_level"]["1"]["kickoffs"] == 2
+    assert report["by_level"]["2"]["cost"] == 0.0
+
+
+def test_usage_from_result_without_token_usage():
+    usage = usage_from_result(SimpleNamespace(raw="ok"))
+    assert usage.total_tokens == 0
+    assert usage.kickoffs == 1
+
+
+def test_flow_charges_kickoffs_to_nodes_and_writes_report(tmp_path, monkeypatch):
+    monkeypatch.setattr(flow_mod, "ManagerCrew", FakeManagerCrew)
+    monkeypatch.setattr(flow_mod, "DesignerCrew", FakeDesignerCrew)
+    monkeypatch.setattr(flow_mod, "ReviewerCrew", MeteredCrew)
+    monkeypatch.setattr(flow_mod, "WriterCrew", MeteredCrew)
+    monkeypatch.setattr(flow_mod.random, "randint", lambda a, b: 1)
+
+    flow = flow_mod.BFSNodeFlow()
+    flow._usage = UsageLedger()
+    flow.state.output_path = str(tmp_path)
+    flow.state.max_concurrency = 2
+    flow.state.work_queue = deque([_build_root()])
+    # run_frontier completes the flow, which writes the report
+    asyncio.run(flow.run_frontier())
+
+    # reviewer + writer per node are metered; manager/designer fakes report nothing
+    for node in flow.state.visited_queue:
+        assert (node.prompt_tokens, node.completion_tokens) == (200, 40)
+
+    with open(os.path.join(str(tmp_path), "token_usage.json")) as f:
+        report = json.load(f)
+    assert report["total"]["prompt_tokens"] == 600
+    assert report["by_crew"]["reviewer_crew"]["kickoffs"] == 3
+    assert report["by_crew"]["manager_crew"]["total_tokens"] == 0
+    assert set(report["by_level"]) == {"0", "1", "2"}
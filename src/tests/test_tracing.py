@@ -0,0 +1,107 @@
+import asyncio
+import sys
+import os
+from collections import deque
+
+import pytest
+
+# Adjust path to include src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+import src.flows.bfs_node_flow as flow_mod
+from src.flows.expansion_policy import ExpansionPolicy
+from src.generic import tracing
+from src.generic.tracing import (
+    configure_tracing,
+    load_spans,
+    summarize_spans,
+    trace_span,
+    with_tracing,
+)
+from src.tests.fake_crewai_llm import MockLLM
+from src.tests.test_parallel_frontier import (
+    FakeCrew,
+    FakeDesignerCrew,
+    FakeManagerCrew,
+    _build_root,
+)
+
+
+@pytest.fixture
+def tracer(tmp_path):
+    active = configure_tracing(str(tmp_path), {"enabled": True})
+    yield active
+    configure_tracing(str(tmp_path), {"enabled": False})
+
+
+def test_spans_nest_and_inherit_node_attributes(tracer, tmp_path):
+    llm = with_tracing(MockLLM(responses=["ok"]), "writer_crew")
+    with trace_span("writer", kind="stage", node_id="n1", path="0->1", level=1):
+        with trace_span("kickoff", kind="kickoff", crew="writer_crew", model="mock"):
+            assert llm.call("hello") == "ok"
+    with pytest.raises(ValueError):
+        with trace_span("parse", kind="parse"):
+            raise ValueError("bad yaml")
+
+    spans = {s.name: s for s in load_spans(str(tmp_path))}
+    assert spans["llm_call"].parent_id == spans["kickoff"].span_id
+    assert spans["kickoff"].parent_id == spans["writer"].span_id
+    assert spans["llm_call"].attributes == {
+        "node_id": "n1",
+        "path": "0->1",
+        "level": 1,
+        "crew": "writer_crew",
+        "model": "mock",
+    }
+    assert spans["parse"].status == "error"
+    assert spans["parse"].parent_id is None
+
+
+def test_flow_run_records_stage_spans_per_level(tracer, tmp_path, monkeypatch):
+    monkeypatch.setattr(flow_mod, "ManagerCrew", FakeManagerCrew)
+    monkeypatch.setattr(flow_mod, "DesignerCrew", FakeDesignerCrew)
+    monkeypatch.setattr(flow_mod, "ReviewerCrew", FakeCrew)
+    monkeypatch.setattr(flow_mod, "WriterCrew", FakeCrew)
+    monkeypatch.setattr(flow_mod.random, "randint", lambda a, b: 2)
+
+    flow = flow_mod.BFSNodeFlow()
+    # Tree shape from the patched randint, not from the reviewer
+    flow._expansion_policy = ExpansionPolicy(mode="random")
+    flow.state.max_concurrency = 4
+    flow.state.work_queue = deque([_build_root()])
+    asyncio.run(flow.run_frontier())
+
+    summary = summarize_spans(load_spans(str(tmp_path)))
+    # 1 root + 2 zones + 4 features, each through four stages
+    assert {k: v["count"] for k, v in summary["by_stage"].items()} == {
+        "designers": 7,
+        "manager": 7,
+        "reviewer": 7,
+        "writer": 7,
+    }
+    assert [summary["by_level"][f"level {i}"]["count"] for i in range(3)] == [4, 8, 16]
+    assert summary["by_operation"]["kickoff:designer_crew_balanced"]["count"] == 7
+    assert summary["by_operation"]["children:create_children"]["count"] == 3
+
+
+def test_trace_span_is_noop_when_disabled(tmp_path):
+    configure_tracing(str(tmp_path), {"enabled": False})
+    assert tracing.get_tracer() is None
+    with trace_span("manager", kind="stage") as span:
+        assert span is None
+    llm = MockLLM(responses=["ok"])
+    assert with_tracing(llm, "writer_crew") is llm
+
+
+def test_spans_after_close_are_dropped(tracer, tmp_path):
+    with trace_span("writer", kind="stage"):
+        pass
+    tracer.close()
+    # e.g. an abandoned kickoff's thread finishing after the flow completed
+    with trace_span("kickoff", kind="kickoff"):
+        pass
+
+    assert [s.name for s in load_spans(str(tmp_path))] == ["writer"]